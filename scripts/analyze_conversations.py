@@ -14,6 +14,10 @@ from typing import List, Dict, Tuple
 from openai import OpenAI
 from dotenv import load_dotenv
 
+from src import config
+from src.scraper.message_central_db import MessageCentralDB
+from src.scraper.storage import open_message_database
+
 load_dotenv()
 
 # Initialize OpenAI client
@@ -108,19 +112,6 @@ def clean_messages(messages: List[Dict]) -> List[Dict]:
 # STAGE 1: HEURISTIC FILTER
 # ============================================================================
 
-def load_conversation(chat_file: Path) -> List[Dict]:
-    """Load messages from a chat file."""
-    messages = []
-    with open(chat_file, 'r', encoding='utf-8') as f:
-        for line in f:
-            try:
-                msg = json.loads(line)
-                messages.append(msg)
-            except json.JSONDecodeError:
-                continue
-    return messages
-
-
 def heuristic_filter(messages: List[Dict]) -> bool:
     """
     Stage 1: Fast heuristic filter on CLEANED messages.
@@ -156,27 +147,33 @@ def heuristic_filter(messages: List[Dict]) -> bool:
     return True
 
 
-def run_stage1(data_dir: Path, max_candidates: int = 500) -> List[Tuple[Path, List[Dict]]]:
+def run_stage1(data_dir: Path, max_candidates: int = 500) -> List[Tuple[str, List[Dict]]]:
     """
     Stage 1: Run heuristic filter on all conversations.
-    Returns list of (file_path, messages) tuples.
+    Returns list of (source, messages) tuples; source is the chat file name
+    for per-chat files, otherwise the backend and chat id.
     """
     messages_dir = data_dir / 'messages'
-    chat_files = list(messages_dir.glob('chat_*.jsonl'))
+    message_db = open_message_database(str(messages_dir))
+    total = len(message_db.list_chat_ids())
+
+    def source_of(chat_id: int) -> str:
+        if isinstance(message_db, MessageCentralDB):
+            return message_db.get_chat_file_path(chat_id).name
+        return f"{config.MESSAGE_STORAGE_BACKEND} chat {chat_id}"
 
     print(f"🔍 Stage 1: Heuristic Filter")
-    print(f"   Total conversations: {len(chat_files)}")
+    print(f"   Total conversations: {total}")
 
     candidates = []
 
-    for i, chat_file in enumerate(chat_files):
+    # Sequential pass over the configured message store
+    for i, (chat_id, messages) in enumerate(message_db.iter_chats()):
         if i % 500 == 0:
-            print(f"   Processed: {i}/{len(chat_files)}...")
-
-        messages = load_conversation(chat_file)
+            print(f"   Processed: {i}/{total}...")
 
         if heuristic_filter(messages):
-            candidates.append((chat_file, messages))
+            candidates.append((source_of(chat_id), messages))
 
             if len(candidates) >= max_candidates:
                 break
@@ -265,7 +262,7 @@ def llm_score_conversation(conversation_text: str) -> Tuple[float, str]:
         return 0.0, "Error in scoring"
 
 
-def run_stage2(candidates: List[Tuple[Path, List[Dict]]], top_n: int = 10) -> List[Dict]:
+def run_stage2(candidates: List[Tuple[str, List[Dict]]], top_n: int = 10) -> List[Dict]:
     """
     Stage 2: Score candidates with LLM and return top N.
     """
@@ -274,7 +271,7 @@ def run_stage2(candidates: List[Tuple[Path, List[Dict]]], top_n: int = 10) -> Li
 
     results = []
 
-    for i, (chat_file, messages) in enumerate(candidates):
+    for i, (source, messages) in enumerate(candidates):
         if i % 50 == 0:
             print(f"   Scored: {i}/{len(candidates)}...")
 
@@ -292,7 +289,7 @@ def run_stage2(candidates: List[Tuple[Path, List[Dict]]], top_n: int = 10) -> Li
         raw_count = len([m for m in messages if m.get('message')])
 
         results.append({
-            'file': chat_file.name,
+            'source': source,
             'score': score,
             'reasoning': reasoning,
             'conversation': conversation_text,
@@ -351,7 +348,7 @@ def main():
     print("="*80)
 
     for i, result in enumerate(top_10, 1):
-        print(f"\n[{i}] Score: {result['score']}/10 | {result['file']}")
+        print(f"\n[{i}] Score: {result['score']}/10 | {result['source']}")
         print(f"Messages: {result['raw_count']} raw → {result['clean_count']} cleaned")
         print(f"Reasoning: {result['reasoning']}")
         print("-" * 80)
@@ -376,7 +373,7 @@ def main():
         f.write("="*80 + "\n\n")
 
         for i, result in enumerate(top_10, 1):
-            f.write(f"[{i}] Score: {result['score']}/10 | {result['file']}\n")
+            f.write(f"[{i}] Score: {result['score']}/10 | {result['source']}\n")
             f.write(f"Messages: {result['raw_count']} raw → {result['clean_count']} cleaned\n")
             f.write(f"Reasoning: {result['reasoning']}\n")
             f.write("-"*80 + "\n")
@@ -8,6 +8,8 @@ from datetime import datetime
 from collections import Counter
 from typing import List, Dict, Any
 
+from src.scraper.storage import open_message_database
+
 # Source paths
 DATA_DIR = Path("data")
 CHAT_LIST_FILE = DATA_DIR / "chat_list_master.jsonl"
@@ -42,7 +44,7 @@ def load_chat_list() -> List[Dict[str, Any]]:
 
 def get_scraped_message_files() -> set:
     """Get all scraped message file IDs."""
-    return set(f.stem.replace('chat_', '') for f in MESSAGES_DIR.glob('chat_*.jsonl'))
+    return set(str(chat_id) for chat_id in open_message_database(str(MESSAGES_DIR)).list_chat_ids())
 
 
 def analyze_message_stats(messages_dir: Path) -> Dict[str, Any]:
@@ -55,22 +57,20 @@ def analyze_message_stats(messages_dir: Path) -> Dict[str, Any]:
         'messages_with_content': 0
     }
 
-    for msg_file in messages_dir.glob('chat_*.jsonl'):
+    # Sequential pass over the configured message store
+    for _, messages in open_message_database(str(messages_dir)).iter_chats():
         message_count = 0
         chars_in_chat = 0
 
-        with open(msg_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():
-                    message_count += 1
-                    stats['total_messages'] += 1
-
-                    msg = json.loads(line)
-                    if msg.get('message'):
-                        msg_len = len(msg['message'])
-                        chars_in_chat += msg_len
-                        stats['total_chars'] += msg_len
-                        stats['messages_with_content'] += 1
+        for msg in messages:
+            message_count += 1
+            stats['total_messages'] += 1
+
+            if msg.get('message'):
+                msg_len = len(msg['message'])
+                chars_in_chat += msg_len
+                stats['total_chars'] += msg_len
+                stats['messages_with_content'] += 1
 
         stats['total_conversations'] += 1
         stats['messages_per_chat'].append(message_count)
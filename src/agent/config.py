@@ -2,6 +2,7 @@
 
 import os
 from pathlib import Path
+from typing import Optional
 from pydantic import BaseModel
 
 
@@ -19,6 +20,13 @@ class AgentConfig(BaseModel):
     # Data directories
     knowledge_dir: Path = Path("data/knowledge")
 
+    # Knowledge retrieval settings
+    embedding_backend: str = "auto"  # "openai", "local" (offline n-gram TF-IDF), or "auto"
+    embedding_model: str = "text-embedding-3-small"
+    ann_min_faqs: int = 2000  # FAQ count from which approximate (IVF) search is used
+    ann_nprobe: int = 8       # IVF lists scanned per query: higher = better recall, slower
+    similarity_threshold: Optional[float] = None  # None: the embedding backend's default
+
     # Behavior settings
     max_conversation_turns: int = 50
 
@@ -33,4 +41,9 @@ class AgentConfig(BaseModel):
             temperature=float(os.getenv("AGENT_TEMPERATURE", "0.7")),
             prompt_path=base_dir / "data" / "prompts" / "base_prompt.txt",
             knowledge_dir=base_dir / "data" / "knowledge",
+            embedding_backend=os.getenv("EMBEDDING_BACKEND", "auto"),
+            embedding_model=os.getenv("EMBEDDING_MODEL", "text-embedding-3-small"),
+            ann_min_faqs=int(os.getenv("ANN_MIN_FAQS", "2000")),
+            ann_nprobe=int(os.getenv("ANN_NPROBE", "8")),
+            similarity_threshold=float(os.environ["SIMILARITY_THRESHOLD"]) if os.getenv("SIMILARITY_THRESHOLD") else None,
         )
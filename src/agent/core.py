@@ -15,7 +15,7 @@ from langgraph.graph.state import CompiledStateGraph
 from loguru import logger
 
 from .config import AgentConfig
-from src.knowledge import KnowledgeRetriever
+from src.knowledge import KnowledgeRetriever, make_embedder
 
 # Load environment
 load_dotenv()
@@ -88,7 +88,12 @@ class SoomgoAgent:
 
         # Initialize knowledge retriever
         logger.info("Initializing knowledge retriever...")
-        self.retriever = KnowledgeRetriever(data_dir=str(self.config.knowledge_dir))
+        self.retriever = KnowledgeRetriever(
+            data_dir=str(self.config.knowledge_dir),
+            embedder=make_embedder(self.config.embedding_backend, self.config.embedding_model),
+            ann_min_size=self.config.ann_min_faqs,
+            ann_nprobe=self.config.ann_nprobe
+        )
 
         self.graph = self._build_graph()
 
@@ -263,8 +268,8 @@ class SoomgoAgent:
             logger.debug(f"Enhanced query with context: '{latest_message}' -> '{query}'")
 
         try:
-            # Retrieve knowledge (lower threshold for better recall)
-            retrieved = self.retriever.retrieve(query, top_k=3, threshold=0.4)
+            # Retrieve knowledge (threshold tuned per embedding backend unless configured)
+            retrieved = self.retriever.retrieve(query, top_k=3, threshold=self.config.similarity_threshold)
 
             # Format knowledge
             if retrieved.get("structured") or retrieved.get("faqs"):
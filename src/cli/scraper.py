@@ -3,13 +3,37 @@
 import asyncio
 import argparse
 from src.scraper.auth import get_authenticated_browser
-from src.scraper.chat_list_scraper import scrape_chat_list
+from src.scraper.chat_list_scraper import scrape_chat_list, fetch_chat_list_direct
 from src.scraper.chat_message_scraper import scrape_chat_messages
+from src.scraper.direct_api import DirectApiClient
 from src.training import optimize_prompt, OptimizationConfig
+from src.scraper.central_db import CentralChatDatabase
+from src.scraper.message_central_db import MessageCentralDB
 
 
-async def scrape_chats(dry_run: bool = False, limit: int = 50, date_filter: str = "all"):
+async def scrape_chats(
+    dry_run: bool = False,
+    limit: int = 50,
+    date_filter: str = "all",
+    direct: bool = False,
+    rate: float = None,
+    resume: str = None,
+    incremental: bool = False
+):
     """Scrape chat list."""
+    if direct:
+        async with DirectApiClient(rate=rate) as client:
+            run_dir = await fetch_chat_list_direct(
+                client,
+                dry_run=dry_run,
+                dry_run_limit=limit,
+                date_filter=date_filter,
+                incremental=incremental,
+                resume_run_id=resume
+            )
+        print(f"\nChat list fetch completed! Results: {run_dir}")
+        return
+
     browser, context = await get_authenticated_browser()
 
     try:
@@ -17,7 +41,9 @@ async def scrape_chats(dry_run: bool = False, limit: int = 50, date_filter: str
             context,
             dry_run=dry_run,
             dry_run_limit=limit,
-            date_filter=date_filter
+            date_filter=date_filter,
+            incremental=incremental,
+            resume_run_id=resume
         )
         print(f"\nChat list scraping completed! Results: {run_dir}")
 
@@ -32,21 +58,42 @@ async def scrape_messages(
     dry_run: bool = False,
     dry_run_limit: int = 3,
     workers: int = 1,
-    skip_existing: bool = False
+    skip_existing: bool = False,
+    incremental: bool = False,
+    changed_only: bool = False,
+    longest_first: bool = False,
+    direct: bool = False,
+    rate: float = None,
+    resume: str = None,
+    adaptive: bool = False,
+    min_workers: int = 1
 ):
     """Scrape chat messages."""
+    options = dict(
+        date_filter=date_filter,
+        chat_limit=limit,
+        dry_run=dry_run,
+        dry_run_limit=dry_run_limit,
+        workers=workers,
+        skip_existing=skip_existing,
+        incremental=incremental,
+        changed_only=changed_only,
+        longest_first=longest_first,
+        resume_run_id=resume,
+        adaptive=adaptive,
+        min_workers=min_workers
+    )
+
+    if direct:
+        async with DirectApiClient(rate=rate) as client:
+            run_dir = await scrape_chat_messages(None, client=client, **options)
+        print(f"\nMessage fetch completed! Results: {run_dir}")
+        return
+
     browser, context = await get_authenticated_browser()
 
     try:
-        run_dir = await scrape_chat_messages(
-            context,
-            date_filter=date_filter,
-            chat_limit=limit,
-            dry_run=dry_run,
-            dry_run_limit=dry_run_limit,
-            workers=workers,
-            skip_existing=skip_existing
-        )
+        run_dir = await scrape_chat_messages(context, **options)
         print(f"\nMessage scraping completed! Results: {run_dir}")
 
     finally:
@@ -54,6 +101,131 @@ async def scrape_messages(
         await browser.close()
 
 
+def manage_db(action: str, sqlite_path: str = None):
+    """Import/export between the JSONL layout and the SQLite/segment backends."""
+    from src import config
+    from src.scraper.sqlite_store import (
+        SQLiteChatDatabase,
+        SQLiteMessageDB,
+        import_from_jsonl,
+        export_to_jsonl
+    )
+
+    db_path = sqlite_path or str(config.CHAT_DB_FILE)
+    sqlite_chat_db = SQLiteChatDatabase(db_path)
+    sqlite_message_db = SQLiteMessageDB(db_path)
+
+    if action == "import":
+        counts = import_from_jsonl(CentralChatDatabase(), MessageCentralDB(), sqlite_chat_db, sqlite_message_db)
+        print(f"\nImported {counts['chats']} chats and {counts['messages']} messages into {db_path}")
+    elif action == "pack":
+        from src.scraper.segment_store import SegmentMessageDB
+        segment_db = SegmentMessageDB()
+        packed = segment_db.import_from_files(MessageCentralDB())
+        print(f"\nPacked {packed} chats into segments at {segment_db.messages_dir}")
+    elif action == "manifest":
+        from src.scraper.storage import open_message_database
+        rebuilt = open_message_database(sqlite_path=db_path).rebuild_manifest()
+        print(f"\nRebuilt message manifest for {rebuilt} chats")
+    elif action == "export":
+        counts = export_to_jsonl(sqlite_chat_db, sqlite_message_db, CentralChatDatabase(), MessageCentralDB())
+        print(f"\nExported {counts['chats']} chats and {counts['messages']} messages from {db_path}")
+    else:
+        print(f"\nChats: {sqlite_chat_db.get_stats()}")
+        print(f"Messages: {sqlite_message_db.get_stats()}")
+
+
+def replay_runs(
+    runs_dir: str = "data/runs",
+    run_paths: list = None,
+    db_path: str = None,
+    benchmark: bool = False,
+    quality: bool = False,
+    pack: bool = False
+):
+    """Replay saved chat list API responses without a browser."""
+    import json
+    from pathlib import Path
+    from src.scraper.replay import find_replayable_runs, replay_chat_list_runs
+    from src.scraper.response_archive import pack_run_responses
+    from src.scraper.storage import open_chat_database, open_chat_database_file
+
+    run_dirs = [Path(path) for path in run_paths] if run_paths else find_replayable_runs(runs_dir)
+    if not run_dirs:
+        print(f"\nNo chat list runs with saved API responses in {runs_dir}")
+        return
+
+    if pack:
+        for run_dir in run_dirs:
+            packed = pack_run_responses(run_dir)
+            if packed:
+                print(f"Packed {packed} responses of {run_dir.name}")
+        return
+
+    # An explicit --db-path is the target file, never the configured live database
+    chat_db = open_chat_database_file(db_path) if db_path else open_chat_database()
+    result = replay_chat_list_runs(
+        run_dirs,
+        chat_db,
+        write=not benchmark,
+        start_empty=benchmark,
+        write_quality_reports=quality
+    )
+    print(json.dumps({key: value for key, value in result.items() if key != "runs"}, indent=2))
+
+
+def serve_mock(port: int = 8765, chats: int = 200, seed: int = 0, latency_ms: float = 0, error_rate: float = 0.0, recorded: bool = False):
+    """Serve a synthetic or recorded corpus from the local mock Soomgo server."""
+    import time
+    from src.scraper.mock_server import MockSoomgoServer, generate_corpus, load_recorded_corpus
+    from src.scraper.storage import open_chat_database, open_message_database
+
+    if recorded:
+        corpus = load_recorded_corpus(open_chat_database(), open_message_database(), limit=chats)
+    else:
+        corpus = generate_corpus(chats, seed=seed)
+
+    with MockSoomgoServer(corpus, port=port, latency_ms=latency_ms, error_rate=error_rate, seed=seed) as server:
+        print(f"\nServing {len(corpus.chats)} chats / {corpus.message_count} messages on {server.base_url}")
+        print(f"Use: SOOMGO_BASE_URL={server.base_url} SOOMGO_API_URL={server.base_url} python -m src.cli.scraper ...")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print(f"\nServed {server.request_count} API requests ({server.error_count} injected errors)")
+
+
+def benchmark_scrapers(
+    chats: int = 50,
+    workers: list = None,
+    modes: list = None,
+    rate: float = None,
+    latency_ms: float = 50,
+    error_rate: float = 0.0,
+    seed: int = 0,
+    output: str = None
+):
+    """Time the scrapers against the local mock server."""
+    import json
+    from src.scraper.benchmark import run_scraper_benchmark
+
+    result = asyncio.run(run_scraper_benchmark(
+        chat_count=chats,
+        worker_counts=workers or [1, 2, 3],
+        modes=modes or ["direct"],
+        rate=rate,
+        latency_ms=latency_ms,
+        error_rate=error_rate,
+        seed=seed
+    ))
+    print(json.dumps(result, indent=2))
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"\nSaved benchmark results to {output}")
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(description="VF-Data: Soomgo Chat Scraper")
@@ -64,6 +236,10 @@ def main():
     chat_parser.add_argument("--dry-run", action="store_true", help="Dry run mode")
     chat_parser.add_argument("--limit", type=int, default=50, help="Limit for dry run")
     chat_parser.add_argument("--filter", choices=["all", "30days"], default="all", help="Date filter (all or 30days)")
+    chat_parser.add_argument("--direct", action="store_true", help="Fetch over the API with the saved session instead of a browser")
+    chat_parser.add_argument("--rate", type=float, help="Direct mode request rate per second (default: DIRECT_API_RATE)")
+    chat_parser.add_argument("--resume", metavar="RUN_ID", help="Continue an interrupted run from its checkpointed cursor")
+    chat_parser.add_argument("--incremental", action="store_true", help="Stop at the first page of chats unchanged in the central database")
 
     # Message scraper
     msg_parser = subparsers.add_parser("messages", help="Scrape chat messages")
@@ -73,6 +249,47 @@ def main():
     msg_parser.add_argument("--dry-run-limit", type=int, default=3, help="Number of chats in dry run")
     msg_parser.add_argument("--workers", type=int, default=1, help="Number of concurrent workers (1-3)")
     msg_parser.add_argument("--skip-existing", action="store_true", help="Skip chats that already have message files")
+    msg_parser.add_argument("--incremental", action="store_true", help="Only fetch messages newer than those already stored")
+    msg_parser.add_argument("--changed-only", action="store_true", help="Skip chats unchanged since their last scrape (changed first, then new)")
+    msg_parser.add_argument("--direct", action="store_true", help="Fetch over the API with the saved session instead of browser pages")
+    msg_parser.add_argument("--rate", type=float, help="Direct mode request rate per second (default: DIRECT_API_RATE)")
+    msg_parser.add_argument("--resume", metavar="RUN_ID", help="Continue an interrupted run: scrape only its unfinished chats")
+    msg_parser.add_argument("--adaptive", action="store_true", help="Vary active workers (--min-workers..--workers) and delays from API latency and errors")
+    msg_parser.add_argument("--min-workers", type=int, default=1, help="Lower bound of active workers in adaptive mode")
+    msg_parser.add_argument("--longest-first", action="store_true", help="Scrape chats with the most messages first (better worker balance)")
+
+    # Storage backend bridge
+    db_parser = subparsers.add_parser("db", help="Import/export between JSONL files and the SQLite/segment backends")
+    db_parser.add_argument("action", choices=["import", "export", "pack", "manifest", "stats"], help="import: JSONL -> SQLite, export: SQLite -> JSONL, pack: JSONL -> message segments, manifest: rebuild message counts/stats manifest")
+    db_parser.add_argument("--sqlite-path", help="SQLite database file (default: CHAT_DB_FILE or db/chats.db)")
+
+    # Offline replay of saved chat list responses
+    replay_parser = subparsers.add_parser("replay", help="Re-ingest saved chat list API responses without a browser")
+    replay_parser.add_argument("runs", nargs="*", help="Run directories to replay (default: all chat list runs, oldest first)")
+    replay_parser.add_argument("--runs-dir", default="data/runs", help="Directory holding run directories")
+    replay_parser.add_argument("--db-path", help="Chat database file to merge into, e.g. a fresh file to rebuild (.db: SQLite, otherwise JSONL; overrides STORAGE_BACKEND)")
+    replay_parser.add_argument("--benchmark", action="store_true", help="Merge in memory from an empty state and report timings only")
+    replay_parser.add_argument("--quality", action="store_true", help="Recompute each run's data_quality_report.json")
+    replay_parser.add_argument("--pack", action="store_true", help="Only convert per-file api_responses/ of older runs into compressed archives")
+
+    # Local mock server and benchmark
+    mock_parser = subparsers.add_parser("mock-server", help="Serve a synthetic corpus like the Soomgo API and chat pages")
+    mock_parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    mock_parser.add_argument("--chats", type=int, default=200, help="Number of chats (with --recorded: newest N stored chats)")
+    mock_parser.add_argument("--seed", type=int, default=0, help="Corpus and error injection seed")
+    mock_parser.add_argument("--latency-ms", type=float, default=0, help="Delay added to every API response")
+    mock_parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of API requests answered with 503")
+    mock_parser.add_argument("--recorded", action="store_true", help="Serve stored chats and messages instead of a synthetic corpus")
+
+    bench_parser = subparsers.add_parser("benchmark", help="Time chat list and message scraping against the mock server")
+    bench_parser.add_argument("--chats", type=int, default=50, help="Number of chats in the synthetic corpus")
+    bench_parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 3], help="Message worker counts to measure")
+    bench_parser.add_argument("--mode", choices=["direct", "browser"], nargs="+", default=["direct"], help="Fetch modes to measure")
+    bench_parser.add_argument("--rate", type=float, help="Direct mode requests per second (0: unlimited, default: DIRECT_API_RATE)")
+    bench_parser.add_argument("--latency-ms", type=float, default=50, help="Mock API latency per request")
+    bench_parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of mock API requests failing with 503")
+    bench_parser.add_argument("--seed", type=int, default=0, help="Corpus seed")
+    bench_parser.add_argument("--output", help="Also write the results to this JSON file")
 
     # DSPy prompt optimizer
     opt_parser = subparsers.add_parser("optimize-prompt", help="Optimize prompt using DSPy")
@@ -90,7 +307,15 @@ def main():
     args = parser.parse_args()
 
     if args.command == "chats":
-        asyncio.run(scrape_chats(dry_run=args.dry_run, limit=args.limit, date_filter=args.filter))
+        asyncio.run(scrape_chats(
+            dry_run=args.dry_run,
+            limit=args.limit,
+            date_filter=args.filter,
+            direct=args.direct,
+            rate=args.rate,
+            resume=args.resume,
+            incremental=args.incremental
+        ))
     elif args.command == "messages":
         asyncio.run(scrape_messages(
             date_filter=args.filter,
@@ -98,8 +323,47 @@ def main():
             dry_run=args.dry_run,
             dry_run_limit=args.dry_run_limit,
             workers=args.workers,
-            skip_existing=args.skip_existing
+            skip_existing=args.skip_existing,
+            incremental=args.incremental,
+            changed_only=args.changed_only,
+            longest_first=args.longest_first,
+            direct=args.direct,
+            rate=args.rate,
+            resume=args.resume,
+            adaptive=args.adaptive,
+            min_workers=args.min_workers
         ))
+    elif args.command == "replay":
+        replay_runs(
+            runs_dir=args.runs_dir,
+            run_paths=args.runs,
+            db_path=args.db_path,
+            benchmark=args.benchmark,
+            quality=args.quality,
+            pack=args.pack
+        )
+    elif args.command == "mock-server":
+        serve_mock(
+            port=args.port,
+            chats=args.chats,
+            seed=args.seed,
+            latency_ms=args.latency_ms,
+            error_rate=args.error_rate,
+            recorded=args.recorded
+        )
+    elif args.command == "benchmark":
+        benchmark_scrapers(
+            chats=args.chats,
+            workers=args.workers,
+            modes=args.mode,
+            rate=args.rate,
+            latency_ms=args.latency_ms,
+            error_rate=args.error_rate,
+            seed=args.seed,
+            output=args.output
+        )
+    elif args.command == "db":
+        manage_db(args.action, sqlite_path=args.sqlite_path)
     elif args.command == "optimize-prompt":
         config = OptimizationConfig(
             model=args.model,
@@ -13,8 +13,7 @@ from textual.widgets import Footer, Header, Label, ListItem, ListView, Static, I
 from textual.screen import Screen
 from rich.text import Text
 
-from src.scraper.central_db import CentralChatDatabase
-from src.scraper.message_central_db import MessageCentralDB
+from src.scraper.storage import open_chat_database, open_message_database
 from src.simulation.runner import SimulationRunner
 from src.cli.config_manager import is_configured, set_api_key, load_config
 
@@ -702,7 +701,7 @@ class SimulationResultScreen(Screen):
         container.mount(Label(""))
 
         # Load original messages
-        message_db = MessageCentralDB(str(self.env.messages_dir))
+        message_db = open_message_database(str(self.env.messages_dir), sqlite_path=str(self.env.chat_db))
         messages_dict = message_db.load_chat_messages(self.chat_id)
         original_messages = sorted(messages_dict.values(), key=lambda m: m.id)
 
@@ -792,17 +791,28 @@ class ChatDetailScreen(Screen):
         self.env = env
 
     def compose(self) -> ComposeResult:
-        yield Static(f"Chat #{self.chat_id}", id="header")
+        yield Static(self._header_text(), id="header")
         yield VerticalScroll(id="messages-container")
         yield Static("s: simulations  |  Esc/b: back  |  q: quit", id="footer")
 
+    def _header_text(self) -> str:
+        """Build header from the chat's master list record (indexed lookup)."""
+        db = open_chat_database(
+            str(self.env.data_dir / "chat_list_master.jsonl"),
+            sqlite_path=str(self.env.chat_db)
+        )
+        chat = db.get(self.chat_id)
+        if not chat:
+            return f"Chat #{self.chat_id}"
+        return f"Chat #{self.chat_id} | {chat.user.name} | {chat.service.title}"
+
     def on_mount(self) -> None:
         """Load and display messages."""
         self.load_messages()
 
     def load_messages(self) -> None:
         """Load messages from file."""
-        message_db = MessageCentralDB(str(self.messages_dir))
+        message_db = open_message_database(str(self.messages_dir), sqlite_path=str(self.env.chat_db))
         messages = message_db.load_chat_messages(self.chat_id)
 
         container = self.query_one("#messages-container")
@@ -865,7 +875,7 @@ class ChatListScreen(Screen):
     def load_chats(self) -> None:
         """Load all chats from database."""
         db_path = self.env.data_dir / "chat_list_master.jsonl"
-        db = CentralChatDatabase(str(db_path))
+        db = open_chat_database(str(db_path), sqlite_path=str(self.env.chat_db))
         chats = db.load()
 
         list_view = self.query_one("#chat-list", ListView)
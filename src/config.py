@@ -26,6 +26,26 @@ HEADLESS = os.getenv("HEADLESS", "false").lower() == "true"
 # Session file path
 SESSION_FILE = SESSION_DIR / "soomgo_session.json"
 
+# Soomgo endpoints (override to point the scrapers at a local stand-in server)
+SOOMGO_BASE_URL = os.getenv("SOOMGO_BASE_URL", "https://soomgo.com").rstrip("/")
+SOOMGO_API_URL = os.getenv("SOOMGO_API_URL", "https://api.soomgo.com").rstrip("/")
+
+# Direct API fetch mode: request rate limit (requests/second) and burst size
+DIRECT_API_RATE = float(os.getenv("DIRECT_API_RATE", "2.0"))
+DIRECT_API_BURST = int(os.getenv("DIRECT_API_BURST", "2"))
+
+# Adaptive message concurrency (messages --adaptive): API page latency above
+# which the controller backs off, and bounds of the delay between chats
+ADAPTIVE_LATENCY_TARGET = float(os.getenv("ADAPTIVE_LATENCY_TARGET", "5.0"))
+ADAPTIVE_MIN_DELAY = float(os.getenv("ADAPTIVE_MIN_DELAY", "3.0"))
+ADAPTIVE_MAX_DELAY = float(os.getenv("ADAPTIVE_MAX_DELAY", "30.0"))
+
+# Storage backend for chats/messages: "jsonl" (default) or "sqlite"
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "jsonl").lower()
+# Messages may also use "segments" (packed segment files under data/messages/segments)
+MESSAGE_STORAGE_BACKEND = os.getenv("MESSAGE_STORAGE_BACKEND", STORAGE_BACKEND).lower()
+CHAT_DB_FILE = Path(os.getenv("CHAT_DB_FILE", PROJECT_ROOT / "db" / "chats.db"))
+
 
 def validate_config():
     """Validate that required configuration is present."""
@@ -1,5 +1,14 @@
 """Knowledge retrieval system for Soomgo agent."""
 
+from .embedders import Embedder, HashedNgramEmbedder, OpenAIEmbedder, make_embedder
+from .embedding_cache import EmbeddingCache
 from .retriever import KnowledgeRetriever
 
-__all__ = ["KnowledgeRetriever"]
+__all__ = [
+    "Embedder",
+    "EmbeddingCache",
+    "HashedNgramEmbedder",
+    "KnowledgeRetriever",
+    "OpenAIEmbedder",
+    "make_embedder",
+]
@@ -0,0 +1,182 @@
+"""Inverted-file (IVF) approximate nearest-neighbour index over unit vectors.
+
+The corpus is partitioned with spherical k-means into ~sqrt(N) lists. A query
+is scored against the centroids first, and only the rows of the `nprobe`
+closest lists are scored exactly, so a search touches about
+(n_lists + nprobe * N / n_lists) rows instead of N. `nprobe` is the
+recall/latency knob: probing every list is exact search.
+
+Build artifacts (centroids and the list layout) are saved as one .npz next to
+the embedding cache, tagged with a fingerprint of the matrix they index, and
+rebuilt whenever the corpus changes.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+
+def matrix_fingerprint(matrix: np.ndarray) -> str:
+    """Content hash of an embedding matrix (shape and values)."""
+    digest = hashlib.sha256(str(matrix.shape).encode())
+    digest.update(np.ascontiguousarray(matrix, dtype=np.float32).tobytes())
+    return digest.hexdigest()
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k highest scores, best first (argpartition + small sort)."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.zeros(0, dtype=np.int64)
+    candidates = np.argpartition(scores, -k)[-k:]
+    return candidates[np.argsort(scores[candidates])[::-1]]
+
+
+class IVFIndex:
+    """IVF index over the rows of an L2-normalized matrix."""
+
+    def __init__(self, matrix: np.ndarray, nprobe: int = 8):
+        """Attach an (unbuilt) index to a matrix.
+
+        Args:
+            matrix: L2-normalized vectors, one row per document
+            nprobe: Lists scanned per query (higher: better recall, slower)
+        """
+        self.matrix = matrix
+        self.nprobe = nprobe
+        self.fingerprint = matrix_fingerprint(matrix)
+        self.centroids = np.zeros((0, matrix.shape[1] if matrix.ndim == 2 else 0), dtype=np.float32)
+        # Row ids grouped by list; list i owns order[offsets[i]:offsets[i + 1]]
+        self.order = np.zeros(0, dtype=np.int64)
+        self.offsets = np.zeros(1, dtype=np.int64)
+
+    @property
+    def n_lists(self) -> int:
+        return len(self.centroids)
+
+    def build(self, n_lists: Optional[int] = None, iterations: int = 20, sample_per_list: int = 64, seed: int = 0) -> "IVFIndex":
+        """Partition the matrix with spherical k-means.
+
+        Args:
+            n_lists: Number of lists (default: sqrt of the row count)
+            iterations: Maximum k-means iterations
+            sample_per_list: Training rows per list (k-means runs on a sample)
+            seed: Random seed for sampling and initialization
+
+        Returns:
+            The built index
+        """
+        rows = len(self.matrix)
+        n_lists = max(1, min(rows, n_lists or int(round(np.sqrt(rows)))))
+        rng = np.random.default_rng(seed)
+
+        sample_size = min(rows, n_lists * sample_per_list)
+        sample = self.matrix[rng.choice(rows, sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+
+        assignment = None
+        for _ in range(iterations):
+            similarities = sample @ centroids.T
+            new_assignment = similarities.argmax(axis=1)
+            if assignment is not None and np.array_equal(new_assignment, assignment):
+                break
+            assignment = new_assignment
+
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            counts = np.bincount(assignment, minlength=n_lists)
+            # Re-seed empty lists with the worst-served sample rows
+            empty = np.flatnonzero(counts == 0)
+            if len(empty):
+                worst = np.argsort(similarities.max(axis=1))[:len(empty)]
+                sums[empty] = sample[worst]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.where(norms == 0, 1, norms)
+
+        self.centroids = centroids.astype(np.float32)
+        self._assign()
+        return self
+
+    def _assign(self) -> None:
+        """Put every row in the list of its closest centroid."""
+        lists = (self.matrix @ self.centroids.T).argmax(axis=1)
+        self.order = np.argsort(lists, kind="stable")
+        counts = np.bincount(lists, minlength=self.n_lists)
+        self.offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+    def search(self, query: np.ndarray, k: int, nprobe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Approximate top-k rows by dot product with a unit query.
+
+        Args:
+            query: L2-normalized query vector
+            k: Number of results
+            nprobe: Lists to scan (default: the index's nprobe)
+
+        Returns:
+            (row ids, scores), best first
+        """
+        nprobe = min(self.n_lists, nprobe or self.nprobe)
+        probed = top_k(self.centroids @ query, nprobe)
+        candidates = np.concatenate([self.order[self.offsets[i]:self.offsets[i + 1]] for i in probed])
+
+        # Too few rows in the probed lists: fall back to scanning everything
+        if len(candidates) < k:
+            candidates = np.arange(len(self.matrix))
+
+        scores = self.matrix[candidates] @ query
+        best = top_k(scores, k)
+        return candidates[best], scores[best]
+
+    def save(self, path: Path) -> None:
+        """Persist the build artifacts atomically."""
+        path = Path(path)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, "wb") as f:
+                np.savez(f, centroids=self.centroids, order=self.order, offsets=self.offsets,
+                         fingerprint=np.array(self.fingerprint))
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not save ANN index {path}: {e}")
+
+    @classmethod
+    def load(cls, path: Path, matrix: np.ndarray, nprobe: int = 8) -> Optional["IVFIndex"]:
+        """Load saved artifacts if they were built for this exact matrix.
+
+        Args:
+            path: Saved index (.npz)
+            matrix: Matrix the index must describe
+            nprobe: Lists scanned per query
+
+        Returns:
+            Index, or None if missing, unreadable or built for another matrix
+        """
+        if not Path(path).exists():
+            return None
+        index = cls(matrix, nprobe)
+        try:
+            with np.load(path) as saved:
+                if str(saved["fingerprint"]) != index.fingerprint:
+                    return None
+                index.centroids = saved["centroids"]
+                index.order = saved["order"]
+                index.offsets = saved["offsets"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable ANN index {path}: {e}")
+            return None
+        return index
+
+    @classmethod
+    def load_or_build(cls, path: Path, matrix: np.ndarray, nprobe: int = 8) -> "IVFIndex":
+        """Load the saved index for this matrix, or build and save a new one."""
+        index = cls.load(path, matrix, nprobe)
+        if index is None:
+            logger.info(f"Building ANN index over {len(matrix)} vectors...")
+            index = cls(matrix, nprobe).build()
+            index.save(path)
+        return index
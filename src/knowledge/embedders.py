@@ -0,0 +1,149 @@
+"""Pluggable text embedders for knowledge retrieval.
+
+- OpenAIEmbedder: OpenAI embeddings API (needs OPENAI_API_KEY, one network
+  call per batch)
+- HashedNgramEmbedder: local hashed character n-gram TF-IDF vectors computed
+  with NumPy. Character n-grams match Korean well without a tokenizer (조사
+  and 어미 only change the tail of a word), need no network and embed a
+  query in well under a millisecond.
+
+make_embedder() builds one from the `embedding_backend` setting of AgentConfig.
+"""
+
+import os
+import re
+import zlib
+from abc import ABC, abstractmethod
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+BACKENDS = ("openai", "local", "auto")
+
+_NON_WORD = re.compile(r"[^\w\s]")
+
+
+class Embedder(ABC):
+    """Interface of an embedding backend."""
+
+    # Identifies the vector space (used as the on-disk cache key)
+    name: str = "embedder"
+    # Whether vectors are worth persisting in the embedding cache
+    cacheable: bool = True
+    # Minimum cosine similarity for a relevant FAQ; score distributions
+    # differ per vector space, so each backend sets its own
+    default_threshold: float = 0.4
+
+    def fit(self, corpus: List[str]) -> None:
+        """Learn corpus statistics before embedding (no-op by default).
+
+        Args:
+            corpus: Documents that will be searched
+        """
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Array of shape [len(texts), dim]
+        """
+
+
+class OpenAIEmbedder(Embedder):
+    """Embeddings from the OpenAI API."""
+
+    def __init__(self, model: str = "text-embedding-3-small"):
+        """Create the API client.
+
+        Args:
+            model: OpenAI embedding model
+        """
+        from openai import OpenAI
+
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY not found in environment")
+        self.client = OpenAI(api_key=api_key)
+        self.model = model
+        self.name = model
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        response = self.client.embeddings.create(input=texts, model=self.model)
+        return np.array([item.embedding for item in response.data])
+
+
+class HashedNgramEmbedder(Embedder):
+    """Local TF-IDF over hashed character n-grams."""
+
+    cacheable = False
+    # Paraphrased questions typically score 0.3-0.7, unrelated small talk < 0.15
+    default_threshold = 0.2
+
+    def __init__(self, dim: int = 4096, ngram_range: Tuple[int, int] = (1, 3)):
+        """Configure the vector space.
+
+        Args:
+            dim: Number of hash buckets (vector dimension)
+            ngram_range: Smallest and largest n-gram length
+        """
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.idf = np.ones(dim, dtype=np.float32)
+        self.name = f"hashed-ngram-{ngram_range[0]}-{ngram_range[1]}-{dim}"
+
+    def _buckets(self, text: str) -> np.ndarray:
+        """Hash bucket of every character n-gram of the text's words."""
+        words = _NON_WORD.sub(" ", text.lower()).split()
+        buckets = []
+        low, high = self.ngram_range
+        for word in words:
+            padded = f" {word} "
+            for n in range(low, high + 1):
+                for start in range(len(padded) - n + 1):
+                    gram = padded[start:start + n]
+                    if gram.strip():
+                        buckets.append(zlib.crc32(gram.encode("utf-8")) % self.dim)
+        return np.array(buckets, dtype=np.int64)
+
+    def _term_frequencies(self, text: str) -> np.ndarray:
+        """Sublinear term frequencies (1 + log tf) per bucket."""
+        counts = np.bincount(self._buckets(text), minlength=self.dim).astype(np.float32)
+        nonzero = counts > 0
+        counts[nonzero] = 1 + np.log(counts[nonzero])
+        return counts
+
+    def fit(self, corpus: List[str]) -> None:
+        """Smoothed IDF of each bucket over the corpus."""
+        document_frequency = np.zeros(self.dim, dtype=np.float32)
+        for text in corpus:
+            document_frequency[np.unique(self._buckets(text))] += 1
+        self.idf = (np.log((1 + len(corpus)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.stack([self._term_frequencies(text) * self.idf for text in texts]) if texts else np.zeros((0, self.dim), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
+
+
+def make_embedder(backend: str = "auto", model: Optional[str] = None) -> Embedder:
+    """Build an embedder from its backend name.
+
+    Args:
+        backend: "openai", "local", or "auto" (OpenAI when OPENAI_API_KEY is
+            set, local otherwise)
+        model: OpenAI embedding model (ignored by the local backend)
+
+    Returns:
+        Embedder instance
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{backend}' (expected one of {', '.join(BACKENDS)})")
+    if backend == "auto":
+        backend = "openai" if os.getenv("OPENAI_API_KEY") else "local"
+    if backend == "local":
+        return HashedNgramEmbedder()
+    return OpenAIEmbedder(model or "text-embedding-3-small")
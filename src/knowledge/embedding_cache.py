@@ -0,0 +1,236 @@
+"""Persistent, content-addressed store of text embeddings.
+
+Embeddings are keyed by (model, sha256 of the text). Each model's cache is:
+
+- `<model>.json`: metadata with the model, dimension, the row keys in order
+  and the name of the matrix file holding those rows
+- `<model>.<token>.npy`: float32 matrix, one row per key, memory-mapped on load
+
+Only texts whose key is missing are sent to the embedding function, so an
+unchanged knowledge base loads without any API call. Every write creates a
+new matrix file and then atomically replaces the metadata that points to it,
+so keys and rows always come from the same writer, even with several
+processes (REPL and TUI) sharing the cache. Rewrites keep only the texts
+being requested, so rows of edited or removed questions don't accumulate.
+
+Query embeddings, which change every turn, live in a bounded in-memory
+QueryEmbeddingCache instead.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+# Unreferenced matrix files younger than this may belong to a writer that has
+# not committed its metadata yet
+STALE_MATRIX_SECONDS = 60
+
+
+def text_key(text: str) -> str:
+    """Content hash used as the cache key of a text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """On-disk embedding cache for one embedding model."""
+
+    def __init__(self, cache_dir: Path, model: str):
+        """Open the cache of `model` in `cache_dir` (created on first write).
+
+        Args:
+            cache_dir: Directory holding the cache files
+            model: Embedding model name
+        """
+        self.cache_dir = Path(cache_dir)
+        self.model = model
+        self.slug = re.sub(r"[^A-Za-z0-9._-]", "_", model)
+        self.meta_path = self.cache_dir / f"{self.slug}.json"
+
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        # Matrix file of the loaded version (None until loaded or written)
+        self.matrix_name: Optional[str] = None
+        self.rows: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def _load(self) -> None:
+        """Memory-map the matrix the metadata points to, if it matches."""
+        if not self.meta_path.exists():
+            return
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            matrix = np.load(self.cache_dir / meta["matrix"], mmap_mode="r")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable embedding cache {self.meta_path}: {e}")
+            return
+
+        keys = meta.get("keys", [])
+        if meta.get("model") != self.model or matrix.ndim != 2 or matrix.shape[0] != len(keys):
+            logger.warning(f"Ignoring inconsistent embedding cache {self.meta_path}")
+            return
+
+        self.matrix = matrix
+        self.matrix_name = meta["matrix"]
+        self.rows = {key: row for row, key in enumerate(keys)}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def get_many(self, texts: List[str], embed: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """Embeddings of `texts`, computing and storing only the missing ones.
+
+        When anything is missing the cache is rewritten with exactly the rows
+        of `texts`, dropping rows no longer requested. If the new embeddings
+        have a different dimension than the cached ones, the whole cache is
+        discarded and every text is embedded again.
+
+        Args:
+            texts: Texts to embed
+            embed: Function embedding a list of texts into a [n, dim] array
+
+        Returns:
+            float32 array of shape [len(texts), dim], in the order of `texts`
+        """
+        keys = [text_key(text) for text in texts]
+        unique_keys = list(dict.fromkeys(keys))
+        text_by_key = dict(zip(keys, texts))
+
+        def embed_keys(keys_to_embed: List[str]) -> Dict[str, np.ndarray]:
+            rows = np.asarray(embed([text_by_key[key] for key in keys_to_embed]), dtype=np.float32)
+            return dict(zip(keys_to_embed, rows))
+
+        missing = [key for key in unique_keys if key not in self.rows]
+        if missing:
+            new_rows = embed_keys(missing)
+            dim = len(new_rows[missing[0]])
+            if self.rows and self.matrix.shape[1] != dim:
+                logger.warning(
+                    f"Embedding dimension changed for {self.model} "
+                    f"({self.matrix.shape[1]} -> {dim}), discarding cached embeddings"
+                )
+                self.rows = {}
+                stale = [key for key in unique_keys if key not in new_rows]
+                if stale:
+                    new_rows.update(embed_keys(stale))
+                missing += stale
+            self._rewrite(unique_keys, new_rows)
+
+        self.misses += len(missing)
+        self.hits += len(keys) - len(missing)
+
+        if not keys:
+            return np.zeros((0, self.matrix.shape[1]), dtype=np.float32)
+        return np.asarray(self.matrix[[self.rows[key] for key in keys]], dtype=np.float32)
+
+    def _rewrite(self, keys: List[str], new_rows: Dict[str, np.ndarray]) -> None:
+        """Persist the rows of `keys` (cached or new) as a new cache version."""
+        dim = len(next(iter(new_rows.values())))
+        matrix = np.stack([
+            new_rows[key] if key in new_rows else np.asarray(self.matrix[self.rows[key]], dtype=np.float32)
+            for key in keys
+        ]).astype(np.float32)
+
+        matrix_name = f"{self.slug}.{uuid.uuid4().hex[:12]}.npy"
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            np.save(self.cache_dir / matrix_name, matrix)
+
+            # Committing the metadata switches keys and rows together
+            temp_meta = self.meta_path.with_name(f"{self.meta_path.name}.{matrix_name}.tmp")
+            with open(temp_meta, "w", encoding="utf-8") as f:
+                json.dump({"model": self.model, "dim": dim, "matrix": matrix_name, "keys": keys}, f)
+            os.replace(temp_meta, self.meta_path)
+            self._remove_stale_matrices(matrix_name)
+        except OSError as e:
+            logger.warning(f"Could not persist embedding cache {self.meta_path}: {e}")
+
+        self.matrix = matrix
+        self.matrix_name = matrix_name
+        self.rows = {key: row for row, key in enumerate(keys)}
+
+    def _remove_stale_matrices(self, current: str) -> None:
+        """Delete matrix files of superseded cache versions.
+
+        The version this instance replaced goes right away; other unreferenced
+        files only once they are old enough not to belong to a concurrent
+        writer that is about to commit.
+        """
+        cutoff = time.time() - STALE_MATRIX_SECONDS
+        for path in self.cache_dir.glob(f"{self.slug}.*.npy"):
+            if path.name == current:
+                continue
+            try:
+                if path.name == self.matrix_name or path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
+
+
+class QueryEmbeddingCache:
+    """Bounded in-memory LRU cache of query embeddings with a TTL.
+
+    Short turns ("얼마인가요?", "네 감사합니다") repeat constantly across
+    conversations; a hit skips the embeddings API round-trip entirely.
+    """
+
+    def __init__(self, max_size: int = 512, ttl_seconds: float = 3600.0):
+        """Create an empty cache.
+
+        Args:
+            max_size: Maximum number of cached queries (least recently used evicted)
+            ttl_seconds: Seconds an entry stays valid (0: no expiry)
+        """
+        self.max_size = max(1, max_size)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Cache key of a query: whitespace-collapsed text."""
+        return " ".join(query.split())
+
+    def get(self, query: str, embed: Callable[[str], np.ndarray]) -> np.ndarray:
+        """Embedding of `query`, from the cache or computed with `embed`.
+
+        Args:
+            query: Query text
+            embed: Function embedding a single text
+
+        Returns:
+            Cached or freshly computed embedding
+        """
+        key = self.normalize(query)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and (not self.ttl_seconds or now - entry[0] < self.ttl_seconds):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        embedding = embed(key)
+        with self._lock:
+            self._entries[key] = (now, embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return embedding
+
+    def __len__(self) -> int:
+        return len(self._entries)
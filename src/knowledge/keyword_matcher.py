@@ -0,0 +1,90 @@
+"""Aho–Corasick multi-keyword matcher for structured knowledge lookup.
+
+All service and policy keywords are compiled once into a single automaton
+(a trie with failure links). Finding which entries a query mentions then
+takes one pass over the query, however many entries and keywords the
+knowledge base has.
+"""
+
+from typing import Dict, Hashable, Iterable, List, Set
+
+
+class KeywordAutomaton:
+    """Maps keyword occurrences in a text back to the entries owning them."""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Set[Hashable]] = [set()]
+        # Entries with an empty keyword match every text ("" in text is True)
+        self._always: Set[Hashable] = set()
+        self._built = True
+
+    def add(self, keyword: str, entry: Hashable) -> None:
+        """Register a keyword for an entry.
+
+        Args:
+            keyword: Substring to look for (matched as-is)
+            entry: Value reported when the keyword occurs
+        """
+        if not keyword:
+            self._always.add(entry)
+            return
+
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(set())
+            state = next_state
+        self._output[state].add(entry)
+        self._built = False
+
+    def add_all(self, keywords: Iterable[str], entry: Hashable) -> None:
+        """Register several keywords for the same entry."""
+        for keyword in keywords:
+            self.add(keyword, entry)
+
+    def build(self) -> "KeywordAutomaton":
+        """Compute failure links breadth-first (called automatically by find)."""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                # Keywords ending at the fallback state also end here
+                self._output[next_state] |= self._output[self._fail[next_state]]
+        self._built = True
+        return self
+
+    def find(self, text: str) -> Set[Hashable]:
+        """Entries with at least one keyword occurring in the text.
+
+        Args:
+            text: Text to scan
+
+        Returns:
+            Set of matched entries
+        """
+        if not self._built:
+            self.build()
+
+        matches = set(self._always)
+        state = 0
+        for char in text:
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            if self._output[state]:
+                matches |= self._output[state]
+        return matches
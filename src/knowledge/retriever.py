@@ -1,12 +1,15 @@
 """Hybrid knowledge retrieval system combining structured data with semantic search."""
 
 import json
-import os
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import numpy as np
-from openai import OpenAI
+
+from .ann_index import IVFIndex, top_k as top_k_indices
+from .embedders import Embedder, OpenAIEmbedder
+from .embedding_cache import EmbeddingCache, QueryEmbeddingCache
+from .keyword_matcher import KeywordAutomaton
 
 
 class KnowledgeRetriever:
@@ -14,42 +17,71 @@ class KnowledgeRetriever:
 
     Combines:
     1. Structured lookup (exact info like pricing, policies)
-    2. Semantic search (FAQ questions using OpenAI embeddings)
+    2. Semantic search (FAQ questions using a pluggable embedder: OpenAI
+       embeddings, or local hashed n-gram TF-IDF for offline use)
     """
 
     def __init__(
         self,
         data_dir: str = "data/knowledge",
         embedding_model: str = "text-embedding-3-small",
+        cache_dir: Optional[str] = None,
+        query_cache_size: int = 512,
+        query_cache_ttl: float = 3600.0,
+        embedder: Optional[Embedder] = None,
+        ann_min_size: int = 2000,
+        ann_nprobe: int = 8,
     ):
         """Initialize retriever.
 
         Args:
             data_dir: Directory containing knowledge files
-            embedding_model: OpenAI embedding model to use
+            embedding_model: OpenAI embedding model to use (when no embedder is given)
+            cache_dir: FAQ embedding cache directory (default: data_dir/embeddings)
+            query_cache_size: Query embeddings kept in memory (LRU)
+            query_cache_ttl: Seconds a cached query embedding stays valid (0: forever)
+            embedder: Embedding backend (default: OpenAIEmbedder(embedding_model))
+            ann_min_size: FAQ count from which an IVF index replaces exact search
+            ann_nprobe: IVF lists scanned per query (recall/latency knob)
         """
         self.data_dir = Path(data_dir)
-        self.embedding_model = embedding_model
-
-        # Initialize OpenAI client
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment")
-        self.client = OpenAI(api_key=api_key)
+        self.embedder = embedder or OpenAIEmbedder(embedding_model)
+        self.embedding_model = self.embedder.name
+        self.embedding_cache = EmbeddingCache(
+            Path(cache_dir) if cache_dir else self.data_dir / "embeddings",
+            self.embedder.name
+        )
+        self.query_cache = QueryEmbeddingCache(query_cache_size, query_cache_ttl)
 
         # Load structured data
         self.services = self._load_json("structured/services.json")
         self.policies = self._load_json("structured/policies.json")
+        self._build_keyword_matcher()
 
         # Load semantic FAQ
         faq_data = self._load_json("semantic/faq.json")
         self.faqs = faq_data["faqs"]
         self.faq_questions = [faq["question"] for faq in self.faqs]
-
-        # Pre-compute FAQ embeddings
-        print(f"Computing embeddings for {len(self.faqs)} FAQs using OpenAI...")
-        self.faq_embeddings = self._compute_embeddings(self.faq_questions)
-        print("✓ Knowledge base loaded!")
+        self.embedder.fit(self.faq_questions)
+
+        # FAQ embeddings: only new or changed questions go to the API
+        # Stored L2-normalized so cosine similarity is a single dot product
+        if self.embedder.cacheable:
+            embeddings = self.embedding_cache.get_many(self.faq_questions, self._compute_embeddings)
+            if self.embedding_cache.misses:
+                print(f"Computed embeddings for {self.embedding_cache.misses} new FAQs using {self.embedder.name}")
+        else:
+            embeddings = self._compute_embeddings(self.faq_questions)
+        self.faq_embeddings = self._normalize(np.asarray(embeddings, dtype=np.float32))
+
+        # Large corpora: approximate search over an IVF index (small ones stay exact)
+        self.ann_index = None
+        if ann_min_size and len(self.faqs) >= ann_min_size:
+            self.ann_index = IVFIndex.load_or_build(
+                self.embedding_cache.meta_path.with_suffix(".ivf.npz"), self.faq_embeddings, ann_nprobe
+            )
+        print(f"✓ Knowledge base loaded! ({len(self.faqs)} FAQs, {self.embedder.name}"
+              f"{f', IVF {self.ann_index.n_lists} lists' if self.ann_index else ''})")
 
     def _load_json(self, relative_path: str) -> Dict:
         """Load JSON file from data directory."""
@@ -58,7 +90,7 @@ class KnowledgeRetriever:
             return json.load(f)
 
     def _compute_embeddings(self, texts: List[str]) -> np.ndarray:
-        """Compute embeddings for a list of texts using OpenAI API.
+        """Compute embeddings for a list of texts with the configured embedder.
 
         Args:
             texts: List of texts to embed
@@ -66,12 +98,13 @@ class KnowledgeRetriever:
         Returns:
             NumPy array of embeddings (shape: [len(texts), embedding_dim])
         """
-        response = self.client.embeddings.create(
-            input=texts,
-            model=self.embedding_model
-        )
-        embeddings = [item.embedding for item in response.data]
-        return np.array(embeddings)
+        return self.embedder.embed(texts)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalize vectors along the last axis (zero vectors stay zero)."""
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.where(norms == 0, 1, norms)
 
     def _get_embedding(self, text: str) -> np.ndarray:
         """Get embedding for a single text.
@@ -82,24 +115,21 @@ class KnowledgeRetriever:
         Returns:
             NumPy array of embedding
         """
-        response = self.client.embeddings.create(
-            input=[text],
-            model=self.embedding_model
-        )
-        return np.array(response.data[0].embedding)
+        return self.embedder.embed([text])[0]
 
     def retrieve(
         self,
         query: str,
         top_k: int = 3,
-        threshold: float = 0.5
+        threshold: Optional[float] = None
     ) -> Dict[str, Any]:
         """Retrieve relevant knowledge for a query.
 
         Args:
             query: User's question or message
             top_k: Number of similar FAQs to retrieve
-            threshold: Minimum similarity score (0-1)
+            threshold: Minimum similarity score (0-1); defaults to the
+                embedder's default_threshold
 
         Returns:
             Dictionary with retrieved knowledge:
@@ -119,29 +149,33 @@ class KnowledgeRetriever:
             result["structured"] = structured
 
         # 2. Semantic FAQ search
+        if threshold is None:
+            threshold = self.embedder.default_threshold
         similar_faqs = self._semantic_search(query, top_k, threshold)
         if similar_faqs:
             result["faqs"] = similar_faqs
 
         return result
 
+    def _build_keyword_matcher(self) -> None:
+        """Compile every service and policy keyword into one automaton."""
+        # Entries in lookup order: services first, then policies
+        self.structured_entries = [
+            (name, data)
+            for source in (self.services, self.policies)
+            for name, data in source.items()
+        ]
+        self.keyword_matcher = KeywordAutomaton()
+        for position, (_, data) in enumerate(self.structured_entries):
+            self.keyword_matcher.add_all(data.get("keywords", []), position)
+        self.keyword_matcher.build()
+
     def _structured_lookup(self, query: str) -> Dict[str, Any]:
-        """Look up structured information based on keywords."""
-        query_lower = query.lower()
+        """Look up structured information based on keywords (one pass over the query)."""
         result = {}
-
-        # Service lookup
-        for service_name, service_data in self.services.items():
-            keywords = service_data.get("keywords", [])
-            if any(kw in query_lower for kw in keywords):
-                result[service_name] = service_data
-
-        # Policy lookup
-        for policy_name, policy_data in self.policies.items():
-            keywords = policy_data.get("keywords", [])
-            if any(kw in query_lower for kw in keywords):
-                result[policy_name] = policy_data
-
+        for position in sorted(self.keyword_matcher.find(query.lower())):
+            name, data = self.structured_entries[position]
+            result[name] = data
         return result
 
     def _semantic_search(
@@ -150,21 +184,26 @@ class KnowledgeRetriever:
         top_k: int,
         threshold: float
     ) -> List[Dict]:
-        """Search for similar FAQs using semantic similarity with OpenAI embeddings."""
-        # Get query embedding
-        query_embedding = self._get_embedding(query)
+        """Search for similar FAQs by cosine similarity of their embeddings."""
+        if not len(self.faqs) or top_k <= 0:
+            return []
 
-        # Compute cosine similarity
-        similarities = np.dot(self.faq_embeddings, query_embedding) / (
-            np.linalg.norm(self.faq_embeddings, axis=1) * np.linalg.norm(query_embedding)
+        # Query embedding (repeated queries skip the API), normalized like the FAQ matrix
+        query_embedding = self.query_cache.get(
+            query, lambda text: self._normalize(self._get_embedding(text).astype(np.float32))
         )
 
-        # Get top-k results above threshold
-        top_indices = np.argsort(similarities)[::-1][:top_k]
+        # Cosine similarity: both sides are unit vectors
+        if self.ann_index is not None:
+            top_indices, scores = self.ann_index.search(query_embedding, top_k)
+        else:
+            similarities = self.faq_embeddings @ query_embedding
+            top_indices = top_k_indices(similarities, top_k)
+            scores = similarities[top_indices]
 
         results = []
-        for idx in top_indices:
-            score = float(similarities[idx])
+        for idx, score in zip(top_indices, scores):
+            score = float(score)
             if score >= threshold:
                 faq = self.faqs[idx].copy()
                 faq["similarity_score"] = score
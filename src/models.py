@@ -228,6 +228,7 @@ class ChatListScrapingRunMetadata(ScrapingRunMetadata):
     rate_limit_hits: int = 0  # Times we hit rate limiting
     backoff_events: int = 0  # Times we applied exponential backoff
     viewport_changes: int = 0  # Times we changed viewport size
+    resumes: int = 0  # Times the run was resumed from its checkpoint
 
 
 class ChatScrapingStatus(BaseModel):
@@ -239,6 +240,9 @@ class ChatScrapingStatus(BaseModel):
     scroll_iterations: int = 0
     error: Optional[str] = None
     duration_seconds: float = 0.0
+    reached_stored: bool = False  # Incremental mode stopped at already-stored messages
+    worker_id: Optional[int] = None  # Worker that processed the chat
+    phase_seconds: Dict[str, float] = Field(default_factory=dict)  # Wall time per phase (navigation, scroll_wait, persist, ...)
 
 
 class MessageScrapingRunMetadata(ScrapingRunMetadata):
@@ -248,6 +252,12 @@ class MessageScrapingRunMetadata(ScrapingRunMetadata):
     chats_failed: int = 0
     chats_skipped: int = 0
     total_messages_scraped: int = 0
+    chats_reached_stored: int = 0  # Incremental mode: chats that stopped early
+    scrapes_avoided: int = 0  # Change detection: unchanged chats not revisited
+    resumes: int = 0  # Times the run was resumed from its journal
+
+    # Per-phase timing across chats: phase -> count/total/mean/p50/p95/max seconds
+    phase_timings: Dict[str, Dict[str, float]] = Field(default_factory=dict)
 
     # Chat statuses
     chat_statuses: List[ChatScrapingStatus] = Field(default_factory=list)
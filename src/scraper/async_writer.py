@@ -0,0 +1,123 @@
+"""Off-event-loop persistence for scraped chat messages.
+
+Loading, merging and rewriting a chat's message file is CPU and disk work that
+would otherwise block every worker's page handlers on the event loop. The
+writer runs it on background threads while scraping continues:
+
+- Chats are sharded over single-thread executors by chat_id, so writes for the
+  same chat always run in submission order.
+- At most `max_pending` saves are in flight; submit() waits for a free slot,
+  which throttles scraping if the disk falls behind.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+from loguru import logger
+
+from src.models import MessageItem
+from src.scraper.message_central_db import MessageStore
+
+
+class AsyncMessageWriter:
+    """Merges and saves chat messages on background threads."""
+
+    def __init__(self, message_db: MessageStore, max_workers: int = 2, max_pending: int = 8):
+        """Initialize the writer.
+
+        Args:
+            message_db: Message database to merge into (must be thread-safe)
+            max_workers: Number of writer threads (chat shards)
+            max_pending: Maximum saves queued or running before submit() waits
+        """
+        self.message_db = message_db
+        self.max_pending = max_pending
+        self._executors = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"message-writer-{i}")
+            for i in range(max(1, max_workers))
+        ]
+        self._slots = asyncio.Semaphore(max_pending)
+        self._pending: Set[asyncio.Future] = set()
+
+        self.saved: Dict[int, Tuple[int, int]] = {}  # chat_id -> (new_count, updated_count)
+        self.failed: Dict[int, str] = {}  # chat_id -> error
+        self.save_seconds: Dict[int, float] = {}  # chat_id -> merge-and-save time (writer thread)
+
+    def _merge_and_save(
+        self,
+        chat_id: int,
+        messages: List[MessageItem],
+        chat_state: Optional[Dict[str, Any]]
+    ) -> Tuple[int, int]:
+        """Merge new messages into the stored chat and save it (writer thread)."""
+        started = time.perf_counter()
+        existing_messages = self.message_db.load_chat_messages(chat_id)
+        merged, new_count, updated_count = self.message_db.merge_and_update(
+            chat_id,
+            existing_messages,
+            messages
+        )
+        self.message_db.save_chat_messages(chat_id, merged, chat_state=chat_state)
+        self.save_seconds[chat_id] = self.save_seconds.get(chat_id, 0.0) + time.perf_counter() - started
+        return new_count, updated_count
+
+    async def submit(
+        self,
+        chat_id: int,
+        messages: List[MessageItem],
+        chat_state: Optional[Dict[str, Any]] = None
+    ) -> asyncio.Future:
+        """Queue a chat's messages for merge-and-save.
+
+        Waits only for a free slot, not for the write itself.
+
+        Args:
+            chat_id: ID of the chat
+            messages: Newly scraped messages
+            chat_state: Chat list state recorded as the chat's watermark
+
+        Returns:
+            Future resolving to (new_count, updated_count)
+        """
+        await self._slots.acquire()
+
+        executor = self._executors[chat_id % len(self._executors)]
+        future = asyncio.get_running_loop().run_in_executor(
+            executor, self._merge_and_save, chat_id, messages, chat_state
+        )
+        self._pending.add(future)
+
+        def _on_done(done: asyncio.Future) -> None:
+            self._pending.discard(done)
+            self._slots.release()
+            if done.cancelled():
+                self.failed[chat_id] = "save cancelled"
+            elif done.exception() is not None:
+                self.failed[chat_id] = f"save failed: {done.exception()}"
+                logger.error(f"Chat {chat_id}: Failed to save messages: {done.exception()}")
+            else:
+                self.saved[chat_id] = done.result()
+                new_count, updated_count = done.result()
+                logger.success(f"Chat {chat_id} - Updated DB ({new_count} new, {updated_count} updated)")
+
+        future.add_done_callback(_on_done)
+        return future
+
+    @property
+    def pending_count(self) -> int:
+        """Number of saves queued or running."""
+        return len(self._pending)
+
+    async def drain(self) -> None:
+        """Wait until every submitted save has finished."""
+        while self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+            # Let the futures' done callbacks run before checking again
+            await asyncio.sleep(0)
+
+    async def close(self) -> None:
+        """Drain pending saves and stop the writer threads."""
+        await self.drain()
+        for executor in self._executors:
+            executor.shutdown(wait=True)
@@ -0,0 +1,195 @@
+"""Offline scraper benchmark against the local mock Soomgo server.
+
+Runs the real scrape_chat_list / scrape_chat_messages code (browser mode) and
+the direct API fetchers against MockSoomgoServer, in a throwaway workspace, and
+reports chats/min and messages/sec per fetch mode and worker count. The corpus
+is deterministic for a given seed, so runs are comparable across changes.
+
+Browser mode keeps the scrapers' humanization delays, so its numbers show the
+real pacing; direct mode is bounded by the rate limit (pass rate=0 to measure
+the fetch and ingest path alone).
+"""
+
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from playwright.async_api import async_playwright
+from loguru import logger
+
+from src import config
+from src.models import ChatItem
+from src.scraper.chat_list_scraper import scrape_chat_list, fetch_chat_list_direct
+from src.scraper.chat_message_scraper import scrape_chat_messages
+from src.scraper.direct_api import DirectApiClient
+from src.scraper.mock_server import MockCorpus, MockSoomgoServer, generate_corpus
+from src.scraper.storage import open_chat_database
+
+FETCH_MODES = ("direct", "browser")
+
+
+@contextmanager
+def _workspace(path: Path, base_url: str) -> Iterator[Path]:
+    """Run inside `path` with all data paths and Soomgo URLs redirected there."""
+    path.mkdir(parents=True, exist_ok=True)
+    saved = (os.getcwd(), config.SOOMGO_BASE_URL, config.SOOMGO_API_URL, config.CHAT_DB_FILE)
+
+    # Run directories and JSONL databases use cwd-relative "data/" paths
+    os.chdir(path)
+    config.SOOMGO_BASE_URL = base_url
+    config.SOOMGO_API_URL = base_url
+    config.CHAT_DB_FILE = path / "db" / "chats.db"
+    try:
+        yield path
+    finally:
+        cwd, config.SOOMGO_BASE_URL, config.SOOMGO_API_URL, config.CHAT_DB_FILE = saved
+        os.chdir(cwd)
+
+
+def _read_scraping_log(run_dir: Path) -> Dict[str, Any]:
+    """Load a message run's scraping_log.json."""
+    with open(run_dir / "scraping_log.json", 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _rate(count: int, seconds: float, per: float = 1.0) -> Optional[float]:
+    """Items per `per` seconds, rounded."""
+    return round(count / seconds * per, 2) if seconds > 0 else None
+
+
+async def _run_chat_list(mode: str, browser, rate: Optional[float]) -> Tuple[float, int]:
+    """Scrape the chat list once; returns (seconds, chats in the database)."""
+    started = time.perf_counter()
+    if mode == "direct":
+        async with DirectApiClient(rate=rate) as client:
+            await fetch_chat_list_direct(client)
+    else:
+        context = await browser.new_context()
+        try:
+            await scrape_chat_list(context)
+        finally:
+            await context.close()
+    seconds = time.perf_counter() - started
+
+    return seconds, len(open_chat_database().load())
+
+
+async def _run_messages(mode: str, workers: int, browser, rate: Optional[float]) -> Tuple[float, Dict[str, Any]]:
+    """Scrape messages of every chat in the database; returns (seconds, scraping log)."""
+    started = time.perf_counter()
+    if mode == "direct":
+        async with DirectApiClient(rate=rate) as client:
+            run_dir = await scrape_chat_messages(None, workers=workers, client=client)
+    else:
+        context = await browser.new_context()
+        try:
+            run_dir = await scrape_chat_messages(context, workers=workers)
+        finally:
+            await context.close()
+    seconds = time.perf_counter() - started
+
+    return seconds, _read_scraping_log(run_dir)
+
+
+async def run_scraper_benchmark(
+    corpus: Optional[MockCorpus] = None,
+    chat_count: int = 50,
+    messages_per_chat: Tuple[int, int] = (5, 60),
+    worker_counts: Sequence[int] = (1, 2, 3),
+    modes: Sequence[str] = ("direct",),
+    rate: Optional[float] = None,
+    latency_ms: float = 50,
+    error_rate: float = 0.0,
+    seed: int = 0,
+    workspace: Optional[str] = None
+) -> Dict[str, Any]:
+    """Benchmark chat list and message scraping against the mock server.
+
+    Each measurement runs in its own workspace directory: the chat list run
+    starts from an empty database, each message run from a chat database
+    seeded with the corpus and no stored messages.
+
+    Args:
+        corpus: Corpus to serve (default: generate_corpus(chat_count, messages_per_chat, seed))
+        chat_count: Chats in the generated corpus
+        messages_per_chat: (min, max) messages per generated chat
+        worker_counts: Message worker counts to measure
+        modes: Fetch modes to measure ("direct" and/or "browser")
+        rate: Direct mode requests per second (None: DIRECT_API_RATE, 0: unlimited)
+        latency_ms: Mock API latency per request
+        error_rate: Fraction of mock API requests failing with 503
+        seed: Corpus and error injection seed
+        workspace: Directory for run outputs (default: a temporary directory)
+
+    Returns:
+        Dictionary with the corpus size and one result row per measurement
+    """
+    for mode in modes:
+        if mode not in FETCH_MODES:
+            raise ValueError(f"Unknown fetch mode: {mode} (expected one of {', '.join(FETCH_MODES)})")
+
+    corpus = corpus or generate_corpus(chat_count, messages_per_chat, seed=seed)
+    results: List[Dict[str, Any]] = []
+
+    with tempfile.TemporaryDirectory(prefix="scraper-benchmark-") as tmp, \
+            MockSoomgoServer(corpus, latency_ms=latency_ms, error_rate=error_rate, seed=seed) as server:
+        root = Path(workspace or tmp).resolve()
+        playwright = await async_playwright().start() if "browser" in modes else None
+        browser = await playwright.chromium.launch(headless=True) if playwright else None
+
+        try:
+            for mode in modes:
+                requests_before, errors_before = server.request_count, server.error_count
+                with _workspace(root / mode / "chat_list", server.base_url):
+                    seconds, chats = await _run_chat_list(mode, browser, rate)
+                results.append({
+                    "mode": mode,
+                    "phase": "chat_list",
+                    "workers": 1,
+                    "seconds": round(seconds, 2),
+                    "chats": chats,
+                    "chats_per_minute": _rate(chats, seconds, per=60),
+                    "api_requests": server.request_count - requests_before,
+                    "injected_errors": server.error_count - errors_before
+                })
+                logger.success(f"[{mode}] chat list: {chats} chats in {seconds:.1f}s")
+
+                for workers in worker_counts:
+                    requests_before, errors_before = server.request_count, server.error_count
+                    with _workspace(root / mode / f"messages_{workers}w", server.base_url):
+                        open_chat_database().append([ChatItem(**chat) for chat in corpus.chats])
+                        seconds, scraping_log = await _run_messages(mode, workers, browser, rate)
+                    messages = scraping_log["total_messages_scraped"]
+                    results.append({
+                        "mode": mode,
+                        "phase": "messages",
+                        "workers": workers,
+                        "seconds": round(seconds, 2),
+                        "chats": scraping_log["chats_succeeded"],
+                        "chats_failed": scraping_log["chats_failed"],
+                        "messages": messages,
+                        "chats_per_minute": _rate(scraping_log["chats_succeeded"], seconds, per=60),
+                        "messages_per_second": _rate(messages, seconds),
+                        "api_requests": server.request_count - requests_before,
+                        "injected_errors": server.error_count - errors_before
+                    })
+                    logger.success(f"[{mode}] messages, {workers} worker(s): {messages} messages in {seconds:.1f}s")
+        finally:
+            if browser:
+                await browser.close()
+            if playwright:
+                await playwright.stop()
+
+    return {
+        "corpus": {"chats": len(corpus.chats), "messages": corpus.message_count},
+        "settings": {
+            "rate": config.DIRECT_API_RATE if rate is None else rate,
+            "latency_ms": latency_ms,
+            "error_rate": error_rate,
+            "seed": seed
+        },
+        "results": results
+    }
@@ -1,35 +1,196 @@
-"""Central database manager for maintaining a deduplicated master chat list."""
+"""Central database manager for maintaining a deduplicated master chat list.
+
+The master list is stored as a sorted base file (chat_list_master.jsonl) plus an
+append-only write-ahead log (chat_list_master.wal.jsonl). Incremental scrapes only
+append the chats that changed to the log; compaction folds the log back into the
+sorted base file.
+
+A sidecar index (chat_list_master.idx.json) maps each chat_id to the byte offset
+and length of its latest record in either file, so single chats can be read
+without parsing the whole database.
+
+ChatStore is the interface shared with the other backends (see sqlite_store).
+"""
 
 import json
+import os
+from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterable, List, Optional
 from loguru import logger
 
 from src.models import ChatItem
 
 
-class CentralChatDatabase:
+class ChatStore(ABC):
+    """Interface shared by the chat list storage backends.
+
+    Backends implement storage access; diffing, merging and model decoding
+    are shared here.
+    """
+
+    db_path: Path
+
+    @abstractmethod
+    def load(self) -> Dict[int, ChatItem]:
+        """Load all chats (chat_id -> ChatItem)."""
+
+    @abstractmethod
+    def append(self, chats: Iterable[ChatItem]) -> int:
+        """Insert or update chats, returning the number written."""
+
+    @abstractmethod
+    def delete(self, chat_ids: Iterable[int]) -> int:
+        """Remove chats by ID, returning the number removed."""
+
+    @abstractmethod
+    def compact(self) -> int:
+        """Fold pending writes into the main storage, returning the chat count."""
+
+    @abstractmethod
+    def save(self, chats: Dict[int, ChatItem]) -> None:
+        """Replace the stored chats with the given complete state."""
+
+    @abstractmethod
+    def get_raw_many(self, chat_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Read chats by ID as raw stored records, in stored order."""
+
+    @abstractmethod
+    def hired_ids(self) -> List[int]:
+        """Sorted IDs of chats whose quote is marked as hired."""
+
+    @abstractmethod
+    def get_stats(self) -> Dict:
+        """Statistics about the stored chats."""
+
+    def get(self, chat_id: int) -> Optional[ChatItem]:
+        """Read a single chat by ID without loading the whole database.
+
+        Args:
+            chat_id: ID of the chat
+
+        Returns:
+            ChatItem, or None if the chat is not stored
+        """
+        return self.get_many([chat_id]).get(chat_id)
+
+    def get_many(self, chat_ids: Iterable[int]) -> Dict[int, ChatItem]:
+        """Read several chats by ID, decoding only the requested records.
+
+        Args:
+            chat_ids: IDs of the chats
+
+        Returns:
+            Dictionary mapping chat_id -> ChatItem for chats that exist
+        """
+        chats = {}
+        for chat_id, chat_data in self.get_raw_many(chat_ids).items():
+            try:
+                chats[chat_id] = ChatItem(**chat_data)
+            except Exception as e:
+                logger.warning(f"Failed to create ChatItem for chat {chat_id}: {e}")
+        return chats
+
+    def changed_chats(
+        self,
+        existing: Dict[int, ChatItem],
+        new_chats: List[ChatItem]
+    ) -> List[ChatItem]:
+        """Select chats that are new or differ from the stored version.
+
+        Args:
+            existing: Current chats in database (chat_id -> ChatItem)
+            new_chats: Chats from latest scraping run
+
+        Returns:
+            Chats that need to be written
+        """
+        return [chat for chat in new_chats if existing.get(chat.id) != chat]
+
+    def merge_and_update(
+        self,
+        existing: Dict[int, ChatItem],
+        new_chats: List[ChatItem]
+    ) -> tuple[Dict[int, ChatItem], int, int]:
+        """Merge new chats into existing database.
+
+        Args:
+            existing: Current chats in database (chat_id -> ChatItem)
+            new_chats: New chats from latest scraping run
+
+        Returns:
+            Tuple of (merged_chats, new_count, updated_count)
+        """
+        merged = existing.copy()
+        new_count = 0
+        updated_count = 0
+
+        for chat in new_chats:
+            if chat.id in merged:
+                # Chat exists - update it
+                merged[chat.id] = chat
+                updated_count += 1
+            else:
+                # New chat - add it
+                merged[chat.id] = chat
+                new_count += 1
+
+        logger.info(f"Merge complete: {new_count} new chats, {updated_count} updated chats")
+        return merged, new_count, updated_count
+
+
+class CentralChatDatabase(ChatStore):
     """Manages the central chat_list_master.jsonl database."""
 
-    def __init__(self, db_path: str = "data/chat_list_master.jsonl"):
+    def __init__(
+        self,
+        db_path: str = "data/chat_list_master.jsonl",
+        compaction_threshold: int = 5000
+    ):
         """Initialize the central database manager.
 
         Args:
             db_path: Path to the central database file
+            compaction_threshold: Number of log records after which append()
+                folds the write-ahead log back into the base file
         """
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.wal_path = self.db_path.with_name(f"{self.db_path.stem}.wal.jsonl")
+        self.index_path = self.db_path.with_name(f"{self.db_path.stem}.idx.json")
+        self.compaction_threshold = compaction_threshold
+
+        # Byte-offset index for base file and log (loaded lazily)
+        self._index: Optional[Dict] = None
+
+        # Highest sequence number and record count seen in the log (lazy)
+        self._wal_seq: Optional[int] = None
+        self._wal_records: Optional[int] = None
 
     def load(self) -> Dict[int, ChatItem]:
         """Load all chats from the central database.
 
+        Reads the sorted base file, then replays the write-ahead log on top of it
+        so that the latest upsert or tombstone for each chat wins.
+
+        Returns:
+            Dictionary mapping chat_id -> ChatItem
+        """
+        chats = self._load_base()
+        self._replay_wal(chats)
+        return chats
+
+    def _load_base(self) -> Dict[int, ChatItem]:
+        """Load chats from the sorted base file only.
+
         Returns:
             Dictionary mapping chat_id -> ChatItem
         """
         chats = {}
 
         if not self.db_path.exists():
-            logger.info(f"Central database not found at {self.db_path}, will create new one")
+            if not self.wal_path.exists():
+                logger.info(f"Central database not found at {self.db_path}, will create new one")
             return chats
 
         try:
@@ -55,40 +216,351 @@ class CentralChatDatabase:
             logger.error(f"Error loading central database: {e}")
             return chats
 
-    def merge_and_update(
-        self,
-        existing: Dict[int, ChatItem],
-        new_chats: List[ChatItem]
-    ) -> tuple[Dict[int, ChatItem], int, int]:
-        """Merge new chats into existing database.
+    def _read_wal(self) -> List[Dict]:
+        """Read all valid records from the write-ahead log.
+
+        Returns:
+            Log records ordered by sequence number (file order breaks ties)
+        """
+        records = []
+        max_seq = 0
+
+        if self.wal_path.exists():
+            with open(self.wal_path, 'r', encoding='utf-8') as f:
+                for line_num, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        # A torn final line is expected after a crash mid-append
+                        logger.warning(f"Failed to parse line {line_num} in central DB log: {e}")
+                        continue
+
+                    records.append(record)
+                    max_seq = max(max_seq, record.get("seq", 0))
+
+        self._wal_seq = max_seq
+        self._wal_records = len(records)
+
+        records.sort(key=lambda r: r.get("seq", 0))
+        return records
+
+    def _replay_wal(self, chats: Dict[int, ChatItem]) -> None:
+        """Apply write-ahead log records to chats in place.
 
         Args:
-            existing: Current chats in database (chat_id -> ChatItem)
-            new_chats: New chats from latest scraping run
+            chats: Chats loaded from the base file (chat_id -> ChatItem)
+        """
+        records = self._read_wal()
+        if not records:
+            return
+
+        upserts = 0
+        deletes = 0
+
+        for record in records:
+            op = record.get("op")
+            try:
+                if op == "upsert":
+                    chat = ChatItem(**record["chat"])
+                    chats[chat.id] = chat
+                    upserts += 1
+                elif op == "delete":
+                    chats.pop(record["id"], None)
+                    deletes += 1
+                else:
+                    logger.warning(f"Unknown central DB log operation: {op}")
+            except Exception as e:
+                logger.warning(f"Failed to apply central DB log record (seq={record.get('seq')}): {e}")
+
+        logger.info(f"Replayed central DB log: {upserts} upserts, {deletes} deletes")
+
+    def _append_wal(self, records: List[Dict]) -> None:
+        """Append records to the write-ahead log and flush them to disk.
+
+        Args:
+            records: Records without sequence numbers (assigned here)
+        """
+        if not records:
+            return
+
+        if self._wal_seq is None:
+            self._read_wal()
+
+        lines = []
+        for record in records:
+            self._wal_seq += 1
+            lines.append(json.dumps({"seq": self._wal_seq, **record}, ensure_ascii=False) + '\n')
+
+        with open(self.wal_path, 'a', encoding='utf-8') as f:
+            f.write(''.join(lines))
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._wal_records += len(records)
+
+    def append(self, chats: Iterable[ChatItem]) -> int:
+        """Append upserts for changed chats to the write-ahead log.
+
+        Cost is proportional to the number of chats passed in, not to the size
+        of the database. The log is compacted automatically once it grows past
+        compaction_threshold records.
+
+        Args:
+            chats: Chats to insert or update
 
         Returns:
-            Tuple of (merged_chats, new_count, updated_count)
+            Number of records appended
         """
-        merged = existing.copy()
-        new_count = 0
-        updated_count = 0
+        records = [
+            {"op": "upsert", "chat": chat.model_dump(mode="json")}
+            for chat in chats
+        ]
+        self._append_wal(records)
 
-        for chat in new_chats:
-            if chat.id in merged:
-                # Chat exists - update it
-                merged[chat.id] = chat
-                updated_count += 1
-            else:
-                # New chat - add it
-                merged[chat.id] = chat
-                new_count += 1
+        if records:
+            logger.info(f"Appended {len(records)} chats to central DB log at {self.wal_path}")
 
-        logger.info(f"Merge complete: {new_count} new chats, {updated_count} updated chats")
-        return merged, new_count, updated_count
+        if self._wal_records is not None and self._wal_records >= self.compaction_threshold:
+            self.compact()
+
+        return len(records)
+
+    def delete(self, chat_ids: Iterable[int]) -> int:
+        """Append tombstones for chats to the write-ahead log.
+
+        Args:
+            chat_ids: IDs of chats to remove
+
+        Returns:
+            Number of tombstones appended
+        """
+        records = [{"op": "delete", "id": chat_id} for chat_id in chat_ids]
+        self._append_wal(records)
+        return len(records)
+
+    def compact(self) -> int:
+        """Fold the write-ahead log into the sorted base file.
+
+        Returns:
+            Number of chats in the compacted base file
+        """
+        if not self.wal_path.exists():
+            return 0
+
+        chats = self.load()
+        self.save(chats)
+        logger.info(f"Compacted central DB log into {self.db_path}")
+        return len(chats)
+
+    # ===== Byte-offset index =====
+
+    @staticmethod
+    def _file_signature(path: Path) -> Optional[Dict[str, int]]:
+        """Get size/mtime signature used to detect index staleness."""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "ino": stat.st_ino}
+
+    @staticmethod
+    def _empty_section() -> Dict:
+        """Create an empty index section for one file."""
+        return {"signature": None, "offsets": {}, "hired": [], "deleted": []}
+
+    def _scan_file(self, path: Path, section: Dict, start: int, is_log: bool) -> None:
+        """Index records of a file from a byte offset onwards.
+
+        Args:
+            path: File to scan
+            section: Index section to update in place
+            start: Byte offset to start from (0 for a full scan)
+            is_log: Whether the file holds write-ahead log records
+        """
+        offsets = section["offsets"]
+        hired = set(section["hired"])
+        deleted = set(section["deleted"])
+
+        with open(path, 'rb') as f:
+            f.seek(start)
+            offset = start
+            for raw_line in f:
+                length = len(raw_line)
+                if raw_line.strip():
+                    try:
+                        record = json.loads(raw_line)
+                        if is_log and record.get("op") == "delete":
+                            chat_id = str(record["id"])
+                            offsets.pop(chat_id, None)
+                            hired.discard(chat_id)
+                            deleted.add(chat_id)
+                        else:
+                            chat_data = record["chat"] if is_log else record
+                            chat_id = str(chat_data["id"])
+                            offsets[chat_id] = [offset, length]
+                            deleted.discard(chat_id)
+                            if chat_data.get("quote", {}).get("is_hired"):
+                                hired.add(chat_id)
+                            else:
+                                hired.discard(chat_id)
+                    except (json.JSONDecodeError, KeyError, TypeError) as e:
+                        logger.warning(f"Skipping unindexable record at byte {offset} in {path}: {e}")
+                offset += length
+
+        section["hired"] = sorted(hired)
+        section["deleted"] = sorted(deleted)
+
+    def _refresh_section(self, section: Optional[Dict], path: Path, is_log: bool) -> tuple[Dict, bool]:
+        """Bring one index section up to date with its file.
+
+        The log is append-only, so when the same file only grew the new tail is
+        scanned incrementally. Any other change triggers a full rescan.
+
+        Returns:
+            Tuple of (section, changed)
+        """
+        signature = self._file_signature(path)
+        if section is not None and section.get("signature") == signature:
+            return section, False
+
+        if signature is None:
+            return self._empty_section(), section is not None and section.get("signature") is not None
+
+        old_signature = section.get("signature") if section else None
+        if (is_log and old_signature
+                and old_signature.get("ino") == signature["ino"]
+                and signature["size"] > old_signature["size"]):
+            start = old_signature["size"]
+        else:
+            section = self._empty_section()
+            start = 0
+
+        self._scan_file(path, section, start, is_log)
+        section["signature"] = signature
+        return section, True
+
+    def _ensure_index(self) -> Dict:
+        """Load the sidecar index and rebuild stale sections.
+
+        Returns:
+            Index with "base" and "wal" sections
+        """
+        if self._index is None and self.index_path.exists():
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                logger.warning(f"Discarding unreadable central DB index: {e}")
+                self._index = None
+
+        index = self._index or {}
+        base, base_changed = self._refresh_section(index.get("base"), self.db_path, is_log=False)
+        wal, wal_changed = self._refresh_section(index.get("wal"), self.wal_path, is_log=True)
+        self._index = {"base": base, "wal": wal}
+
+        if base_changed or wal_changed or not self.index_path.exists():
+            temp_path = self.index_path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._index, f)
+            temp_path.replace(self.index_path)
+            logger.debug(f"Central DB index updated ({len(base['offsets'])} base, {len(wal['offsets'])} log entries)")
+
+        return self._index
+
+    def _locate(self, chat_id: int) -> Optional[tuple[Path, int, int]]:
+        """Find the file, offset and length of a chat's latest record."""
+        return self._locate_in(self._ensure_index(), chat_id)
+
+    def _locate_in(self, index: Dict, chat_id: int) -> Optional[tuple[Path, int, int]]:
+        """Find a chat's latest record in an already refreshed index."""
+        key = str(chat_id)
+        wal = index["wal"]
+
+        if key in wal["offsets"]:
+            offset, length = wal["offsets"][key]
+            return self.wal_path, offset, length
+        if key in wal["deleted"]:
+            return None
+        if key in index["base"]["offsets"]:
+            offset, length = index["base"]["offsets"][key]
+            return self.db_path, offset, length
+        return None
+
+    def get_raw_many(self, chat_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Read several chats by ID as the raw stored JSON records.
+
+        All IDs are resolved against one index snapshot. Records are read in
+        file/offset order, so the access pattern stays sequential even for
+        large batches, and returned in stored order: chats in the base file
+        keep their position there (even when the log holds a newer record),
+        chats only in the log follow in log order.
+
+        Args:
+            chat_ids: IDs of the chats
+
+        Returns:
+            Dictionary mapping chat_id -> chat record for chats that exist
+        """
+        index = self._ensure_index()
+        locations = []
+        for chat_id in chat_ids:
+            location = self._locate_in(index, chat_id)
+            if location:
+                locations.append((location, chat_id))
+        locations.sort(key=lambda item: (item[0][0] == self.wal_path, item[0][1]))
+
+        records = {}
+        open_files = {}
+        try:
+            for (path, offset, length), chat_id in locations:
+                if path not in open_files:
+                    open_files[path] = open(path, 'rb')
+                f = open_files[path]
+                f.seek(offset)
+                try:
+                    record = json.loads(f.read(length))
+                    records[chat_id] = record["chat"] if path == self.wal_path else record
+                except Exception as e:
+                    logger.warning(f"Failed to read chat {chat_id} at byte {offset} in {path}: {e}")
+        finally:
+            for f in open_files.values():
+                f.close()
+
+        base_offsets = index["base"]["offsets"]
+        wal_offsets = index["wal"]["offsets"]
+
+        def stored_position(chat_id: int) -> tuple:
+            key = str(chat_id)
+            if key in base_offsets:
+                return (0, base_offsets[key][0])
+            return (1, wal_offsets[key][0])
+
+        return {chat_id: records[chat_id] for chat_id in sorted(records, key=stored_position)}
+
+    def hired_ids(self) -> List[int]:
+        """Get IDs of hired chats from the index.
+
+        Returns:
+            Sorted list of chat IDs whose quote is marked as hired
+        """
+        index = self._ensure_index()
+        wal = index["wal"]
+        overridden = set(wal["offsets"]) | set(wal["deleted"])
+
+        hired = {key for key in index["base"]["hired"] if key not in overridden}
+        hired.update(wal["hired"])
+        return sorted(int(key) for key in hired)
 
     def save(self, chats: Dict[int, ChatItem]) -> None:
         """Save all chats to the central database.
 
+        Rewrites the sorted base file and discards the write-ahead log, since the
+        given dictionary is the complete state.
+
         Args:
             chats: Dictionary of chat_id -> ChatItem to save
         """
@@ -107,6 +579,11 @@ class CentralChatDatabase:
             # Atomic rename
             temp_path.replace(self.db_path)
 
+            # Base file now holds everything the log recorded
+            self.wal_path.unlink(missing_ok=True)
+            self._wal_seq = 0
+            self._wal_records = 0
+
             logger.info(f"Saved {len(chats)} chats to central database at {self.db_path}")
 
         except Exception as e:
@@ -1,8 +1,11 @@
 """Chat list scraper using browser API interception."""
 
 import asyncio
+import json
+from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
 from playwright.async_api import Page, BrowserContext
 from loguru import logger
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
@@ -23,14 +26,48 @@ from src.utils import (
     exponential_backoff
 )
 from src.scraper.data_quality import generate_quality_report
-from src.scraper.central_db import CentralChatDatabase
+from src.scraper.direct_api import DirectApiClient, CHAT_LIST_PATH, CHAT_LIST_CURSOR_PARAM, cursor_request
+from src.scraper.central_db import ChatStore
+from src.scraper.storage import open_chat_database
+from src.scraper.response_archive import iter_run_responses
 from src.models import ChatItem
+from src import config
+
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+def find_chat_list_run(run_id: str, runs_dir: str = "data/runs") -> Path:
+    """Find a chat list run's directory by run ID (or directory name).
+
+    Args:
+        run_id: Short run ID (directory suffix) or full directory name
+        runs_dir: Directory holding run directories
+
+    Returns:
+        Run directory
+
+    Raises:
+        FileNotFoundError: If no run with a checkpoint matches
+    """
+    runs_path = Path(runs_dir)
+    candidates = [runs_path / run_id] + sorted(runs_path.glob(f"*_chat_list_{run_id}"))
+    for run_dir in candidates:
+        if (run_dir / CHECKPOINT_FILE).exists():
+            return run_dir
+    raise FileNotFoundError(f"No chat list run with a checkpoint found for '{run_id}' in {runs_dir}")
 
 
 class ChatListScraper:
     """Scrapes chat list from Soomgo using API interception."""
 
-    def __init__(self, run_logger: RunLogger, dry_run: bool = False, dry_run_limit: int = 50, date_filter: str = "all"):
+    def __init__(
+        self,
+        run_logger: RunLogger,
+        dry_run: bool = False,
+        dry_run_limit: int = 50,
+        date_filter: str = "all",
+        incremental: bool = False
+    ):
         self.run_logger = run_logger
         self.tracker = ChatListTracker()
         self.api_responses: List[Dict[str, Any]] = []
@@ -46,6 +83,10 @@ class ChatListScraper:
         self.backoff_count = 0  # Track exponential backoff events
         self.viewport_change_count = 0  # Track viewport changes
         self.date_filter = date_filter  # Date filter: "all" or "30days"
+        self.api_call_condition = asyncio.Condition()  # Notified after each parsed API response
+        self.next_cursor = None  # `next` of the latest API page (saved in checkpoints)
+        self.resume_cursor = None  # `next` to continue from when resuming a run
+        self.last_checkpoint_count = 0  # Chats collected at the last checkpoint
 
         # Calculate cutoff date for 30days filter
         self.date_cutoff = None
@@ -54,100 +95,233 @@ class ChatListScraper:
             self.date_cutoff = datetime.now() - timedelta(days=30)
             logger.info(f"Date filter: 30days (cutoff: {self.date_cutoff.strftime('%Y-%m-%d')})")
 
+        # Incremental sync: the central database is the watermark
+        self.incremental = incremental
+        self.chat_db = open_chat_database() if incremental else None
+        if incremental:
+            logger.info("Incremental sync: stopping at the first page of unchanged chats")
+
     async def intercept_api_response(self, response):
         """Handler for intercepted API responses."""
         try:
             # Check if this is the chat list API
-            if "api.soomgo.com/api/v2.4/chats" in response.url and response.status == 200:
+            if f"{config.SOOMGO_API_URL}{CHAT_LIST_PATH}" in response.url and response.status == 200:
                 data = await response.json()
+                await self.process_api_page(data)
+
+        except Exception as e:
+            logger.error(f"Error processing API response: {e}")
+            self.run_logger.log_error(e, "API response processing")
+
+    async def process_api_page(self, data: Dict[str, Any]):
+        """Process one chat list API page (intercepted or fetched directly)."""
+        try:
+            # Update last activity time
+            import time
+            from datetime import datetime
+            self.last_activity_time = time.time()
+
+            # Track first/last API call timestamps (only for ChatListScrapingRunMetadata)
+            now = datetime.now()
+            if hasattr(self.run_logger.metadata, 'first_api_call_at'):
+                if self.run_logger.metadata.first_api_call_at is None:
+                    self.run_logger.metadata.first_api_call_at = now
+                self.run_logger.metadata.last_api_call_at = now
+
+            # Save raw response
+            self.api_call_count += 1
+            if not self.dry_run:  # Don't save in dry run mode
+                self.run_logger.save_api_response(data, self.api_call_count)
+
+            # Add to responses list
+            self.api_responses.append(data)
+            self.next_cursor = data.get("next")
+
+            # Check if there are more chats (API signals via "next" field)
+            if data.get("next") is None or not data.get("results"):
+                self.has_more_chats = False
+                logger.success("API indicates no more chats available (next=null or empty results)")
+
+            # Process chats
+            new_count = self.tracker.add_chats_from_response(data)
+            total_chats = len(self.tracker.all_chats)
+
+            logger.info(f"API Call #{self.api_call_count}: +{new_count} new chats (Total: {total_chats})")
 
-                # Update last activity time
-                import time
+            # Check date filter: stop if we've reached chats older than cutoff
+            if self.date_cutoff and data.get("results"):
                 from datetime import datetime
-                self.last_activity_time = time.time()
-
-                # Track first/last API call timestamps (only for ChatListScrapingRunMetadata)
-                now = datetime.now()
-                if hasattr(self.run_logger.metadata, 'first_api_call_at'):
-                    if self.run_logger.metadata.first_api_call_at is None:
-                        self.run_logger.metadata.first_api_call_at = now
-                    self.run_logger.metadata.last_api_call_at = now
-
-                # Save raw response
-                self.api_call_count += 1
-                if not self.dry_run:  # Don't save in dry run mode
-                    self.run_logger.save_api_response(data, self.api_call_count)
-
-                # Add to responses list
-                self.api_responses.append(data)
-
-                # Check if there are more chats (API signals via "next" field)
-                if data.get("next") is None or not data.get("results"):
-                    self.has_more_chats = False
-                    logger.success("API indicates no more chats available (next=null or empty results)")
-
-                # Process chats
-                new_count = self.tracker.add_chats_from_response(data)
-                total_chats = len(self.tracker.all_chats)
-
-                logger.info(f"API Call #{self.api_call_count}: +{new_count} new chats (Total: {total_chats})")
-
-                # Check date filter: stop if we've reached chats older than cutoff
-                if self.date_cutoff and data.get("results"):
-                    from datetime import datetime
-                    # Check the oldest chat in this batch (results are in reverse chronological order)
-                    for chat_data in reversed(data.get("results", [])):
-                        try:
-                            updated_at_str = chat_data.get("updated_at", "")
-                            if updated_at_str:
-                                # Parse ISO format datetime
-                                updated_at = datetime.fromisoformat(updated_at_str.replace('Z', '+00:00'))
-                                if updated_at < self.date_cutoff:
-                                    self.has_more_chats = False
-                                    logger.success(f"Reached date cutoff ({self.date_cutoff.strftime('%Y-%m-%d')}) - stopping")
-                                    break
-                        except Exception as e:
-                            logger.debug(f"Error parsing date for chat: {e}")
-                            continue
-
-                # Update progress bar
-                if self.progress:
-                    self.progress.update(
-                        self.progress_task,
-                        completed=total_chats,
-                        description=f"[cyan]Scraping chats... ({total_chats} found)"
-                    )
-
-                # Update metadata
-                self.run_logger.metadata.total_items_found += len(data.get("results", []))
-                self.run_logger.metadata.total_items_processed = total_chats
-                self.run_logger.metadata.total_duplicates_filtered = self.tracker.duplicate_count
-
-                # Checkpoint
-                if total_chats % self.checkpoint_interval == 0:
-                    checkpoint_file = self.run_logger.run_dir / "checkpoint.json"
-                    self.tracker.save_checkpoint(checkpoint_file)
+                # Check the oldest chat in this batch (results are in reverse chronological order)
+                for chat_data in reversed(data.get("results", [])):
+                    try:
+                        updated_at_str = chat_data.get("updated_at", "")
+                        if updated_at_str:
+                            # Parse ISO format datetime
+                            updated_at = datetime.fromisoformat(updated_at_str.replace('Z', '+00:00'))
+                            if updated_at < self.date_cutoff:
+                                self.has_more_chats = False
+                                logger.success(f"Reached date cutoff ({self.date_cutoff.strftime('%Y-%m-%d')}) - stopping")
+                                break
+                    except Exception as e:
+                        logger.debug(f"Error parsing date for chat: {e}")
+                        continue
+
+            # Incremental sync: the list is newest-updated first, so once a whole
+            # page is unchanged every older chat is unchanged too
+            if self.incremental and self.has_more_chats and self.is_page_unchanged(data.get("results", [])):
+                self.has_more_chats = False
+                logger.success("Reached a page of unchanged chats - incremental sync complete")
+
+            # Update progress bar
+            if self.progress:
+                self.progress.update(
+                    self.progress_task,
+                    completed=total_chats,
+                    description=f"[cyan]Scraping chats... ({total_chats} found)"
+                )
+
+            # Update metadata
+            self.run_logger.metadata.total_items_found += len(data.get("results", []))
+            self.run_logger.metadata.total_items_processed = total_chats
+            self.run_logger.metadata.total_duplicates_filtered = self.tracker.duplicate_count
+
+            # Checkpoint (every checkpoint_interval chats, and at the end of the list)
+            if (total_chats // self.checkpoint_interval > self.last_checkpoint_count // self.checkpoint_interval
+                    or not self.has_more_chats):
+                self.save_checkpoint()
+
+            # Wake the scroll loop as soon as the page is parsed
+            async with self.api_call_condition:
+                self.api_call_condition.notify_all()
 
         except Exception as e:
             logger.error(f"Error processing API response: {e}")
             self.run_logger.log_error(e, "API response processing")
 
-    async def wait_for_new_api_call(self, timeout: int = 10000) -> bool:
+    def is_page_unchanged(self, results: List[Dict[str, Any]]) -> bool:
+        """
+        Check whether every chat of a page is already stored as is.
+
+        Args:
+            results: Raw chats of one API page
+
+        Returns:
+            True if all chats match the central database on updated_at and last_message
+        """
+        if not results:
+            return False
+
+        stored = self.chat_db.get_many(chat_data.get("id") for chat_data in results)
+        return all(
+            chat_data.get("id") in stored
+            and stored[chat_data["id"]].updated_at == chat_data.get("updated_at")
+            and stored[chat_data["id"]].last_message == chat_data.get("last_message")
+            for chat_data in results
+        )
+
+    def save_checkpoint(self):
+        """Save seen chats and the next page cursor so the run can be resumed."""
+        # Pages up to the checkpoint must be on disk to rebuild chats on resume
+        self.run_logger.flush_api_responses()
+        metadata = self.run_logger.metadata
+        self.tracker.save_checkpoint(
+            self.run_logger.run_dir / CHECKPOINT_FILE,
+            next=self.next_cursor,
+            has_more_chats=self.has_more_chats,
+            api_call_count=self.api_call_count,
+            scroll_count=self.scroll_count,
+            started_at=metadata.started_at,
+            first_api_call_at=metadata.first_api_call_at,
+            resumes=metadata.resumes,
+            config=metadata.config
+        )
+        self.last_checkpoint_count = len(self.tracker.all_chats)
+
+    def restore_checkpoint(self, checkpoint: Dict[str, Any]):
+        """
+        Restore an interrupted run from its checkpoint.
+
+        Chats are rebuilt from the run's saved API responses up to the
+        checkpoint; pages fetched after it are dropped from the response
+        archive and fetched again.
+
+        Args:
+            checkpoint: Data saved by save_checkpoint()
+        """
+        seen_ids = set(checkpoint.get("seen_ids", []))
+        replayed = ChatListTracker()
+        found = 0
+        api_call_count = checkpoint.get("api_call_count", 0)
+        for _, data in iter_run_responses(self.run_logger.run_dir, max_index=api_call_count):
+            replayed.add_chats_from_response(data)
+            found += len(data.get("results", []))
+        self.run_logger.response_archive.truncate(api_call_count)
+
+        self.tracker.seen_ids = seen_ids
+        self.tracker.all_chats = [chat for chat in replayed.all_chats if chat["id"] in seen_ids]
+        self.tracker.duplicate_count = replayed.duplicate_count
+        self.last_checkpoint_count = len(self.tracker.all_chats)
+
+        self.api_call_count = checkpoint.get("api_call_count", 0)
+        self.scroll_count = checkpoint.get("scroll_count", 0)
+        self.has_more_chats = checkpoint.get("has_more_chats", True)
+        self.next_cursor = checkpoint.get("next")
+        self.resume_cursor = self.next_cursor if self.has_more_chats else None
+
+        metadata = self.run_logger.metadata
+        if checkpoint.get("started_at"):
+            metadata.started_at = datetime.fromisoformat(checkpoint["started_at"])
+        if checkpoint.get("first_api_call_at"):
+            metadata.first_api_call_at = datetime.fromisoformat(checkpoint["first_api_call_at"])
+        metadata.resumes = checkpoint.get("resumes", 0) + 1
+        metadata.total_items_found = found
+        metadata.total_items_processed = len(self.tracker.all_chats)
+        metadata.total_duplicates_filtered = self.tracker.duplicate_count
+
+        if self.has_more_chats:
+            logger.info(f"Resuming after {self.api_call_count} API pages "
+                        f"({len(self.tracker.all_chats)} chats) from cursor {self.next_cursor}")
+        else:
+            logger.info(f"Checkpoint covers the whole list ({len(self.tracker.all_chats)} chats) - nothing left to fetch")
+
+    async def route_to_resume_cursor(self, route):
+        """Send the page's first chat list request to the checkpointed cursor instead."""
+        query = parse_qs(urlparse(route.request.url).query)
+        if self.resume_cursor is None or CHAT_LIST_CURSOR_PARAM in query:
+            await route.continue_()
+            return
+
+        url, params = cursor_request(CHAT_LIST_PATH, CHAT_LIST_CURSOR_PARAM, self.resume_cursor)
+        if not url.startswith(("http://", "https://")):
+            url = f"{config.SOOMGO_API_URL}{url}?{urlencode(params)}"
+        self.resume_cursor = None
+        logger.info(f"Resuming chat list at {url}")
+        await route.continue_(url=url)
+
+    async def wait_for_new_api_call(self, timeout: int = 10000, since: Optional[int] = None) -> bool:
         """
         Wait for a new API call to be intercepted.
 
+        Args:
+            timeout: Timeout in milliseconds
+            since: API call count to wait past (default: the current count);
+                pass the count from before a scroll so a response that arrived
+                during the scroll is not missed
+
         Returns:
             True if new call detected, False if timeout
         """
-        start_count = self.api_call_count
-        start_time = asyncio.get_event_loop().time()
-
-        while asyncio.get_event_loop().time() - start_time < timeout / 1000:
-            if self.api_call_count > start_count:
-                return True
-            await asyncio.sleep(0.5)
+        start_count = self.api_call_count if since is None else since
 
-        return False
+        try:
+            async with self.api_call_condition:
+                await asyncio.wait_for(
+                    self.api_call_condition.wait_for(lambda: self.api_call_count > start_count),
+                    timeout / 1000
+                )
+            return True
+        except asyncio.TimeoutError:
+            return False
 
     async def scroll_until_complete(self, page: Page, max_scrolls: int = 10000):
         """
@@ -182,8 +356,9 @@ class ChatListScraper:
 
             self.scroll_count += 1
 
-            # Track chat count before scroll
+            # Track chat and API call counts before scroll
             chats_before = len(self.tracker.all_chats)
+            calls_before = self.api_call_count
 
             # Viewport randomization (every 10 scrolls)
             if self.scroll_count % 10 == 0:
@@ -203,10 +378,9 @@ class ChatListScraper:
             # Rate limiting (2-5 second delay between scrolls)
             await apply_rate_limit(min_delay=2.0, max_delay=5.0)
 
-            # Wait for the observer to trigger API call
-            # Give extra time for Intersection Observer to fire
-            await asyncio.sleep(2)  # Let observer detect visibility
-            new_call = await self.wait_for_new_api_call(timeout=10000)  # 10s wait for API
+            # Wait for the observer-triggered API call (returns immediately if it
+            # already arrived during the scroll/rate-limit delay)
+            new_call = await self.wait_for_new_api_call(timeout=10000, since=calls_before)  # 10s wait for API
 
             # Log progress
             chats_after = len(self.tracker.all_chats)
@@ -218,6 +392,65 @@ class ChatListScraper:
         if scroll_num >= max_scrolls - 1:
             self.run_logger.log_warning(f"⚠ Reached max scroll safety limit ({max_scrolls})")
 
+    def record_run_stats(self):
+        """Copy counters, humanization and efficiency stats into the run metadata."""
+        # Update metadata
+        self.run_logger.metadata.scroll_iterations = self.scroll_count
+        self.run_logger.metadata.api_calls_intercepted = self.api_call_count
+        self.run_logger.metadata.viewport_changes = self.viewport_change_count
+        self.run_logger.metadata.backoff_events = self.backoff_count
+
+        # Save humanization stats
+        self.run_logger.metadata.humanization_stats.reading_pauses = self.humanization_tracker.reading_pauses
+        self.run_logger.metadata.humanization_stats.scroll_ups = self.humanization_tracker.scroll_ups
+        self.run_logger.metadata.humanization_stats.mouse_movements = self.humanization_tracker.mouse_movements
+        self.run_logger.metadata.humanization_stats.session_breaks = self.humanization_tracker.session_breaks
+        self.run_logger.metadata.humanization_stats.total_wait_time_seconds = self.humanization_tracker.total_wait_time
+
+        # Calculate efficiency metrics
+        total_chats = len(self.tracker.all_chats)
+        if self.api_call_count > 0:
+            self.run_logger.metadata.efficiency_metrics.chats_per_api_call = total_chats / self.api_call_count
+        if self.scroll_count > 0:
+            self.run_logger.metadata.efficiency_metrics.chats_per_scroll = total_chats / self.scroll_count
+
+        # Calculate rates (per minute)
+        if (hasattr(self.run_logger.metadata, 'first_api_call_at') and
+            hasattr(self.run_logger.metadata, 'last_api_call_at') and
+            self.run_logger.metadata.first_api_call_at and
+            self.run_logger.metadata.last_api_call_at):
+            duration_minutes = (self.run_logger.metadata.last_api_call_at - self.run_logger.metadata.first_api_call_at).total_seconds() / 60
+            if duration_minutes > 0:
+                self.run_logger.metadata.efficiency_metrics.api_calls_per_minute = self.api_call_count / duration_minutes
+                self.run_logger.metadata.efficiency_metrics.scrolls_per_minute = self.scroll_count / duration_minutes
+
+        # Extract statistics
+        if self.tracker.all_chats:
+            services = extract_service_titles(self.tracker.all_chats)
+            oldest, newest = get_date_range(self.tracker.all_chats)
+
+            self.run_logger.metadata.unique_services = services
+            self.run_logger.metadata.oldest_chat_date = oldest
+            self.run_logger.metadata.newest_chat_date = newest
+
+            logger.info(f"Services found: {', '.join(services)}")
+            logger.info(f"Date range: {oldest} to {newest}")
+
+        # Log efficiency stats
+        em = self.run_logger.metadata.efficiency_metrics
+        chats_per_api = f"{em.chats_per_api_call:.2f}" if em.chats_per_api_call else "N/A"
+        chats_per_scroll = f"{em.chats_per_scroll:.2f}" if em.chats_per_scroll else "N/A"
+        logger.info(f"Efficiency: {chats_per_api} chats/API call, {chats_per_scroll} chats/scroll")
+        logger.info(f"Humanization: {self.humanization_tracker.reading_pauses} pauses, "
+                   f"{self.humanization_tracker.scroll_ups} scroll-ups, "
+                   f"{self.humanization_tracker.mouse_movements} mouse moves, "
+                   f"{self.humanization_tracker.session_breaks} breaks")
+
+        if self.dry_run:
+            logger.success(f"[DRY RUN] Preview complete! Found {len(self.tracker.all_chats)} chats")
+        else:
+            logger.success(f"Scraping complete! Total chats: {len(self.tracker.all_chats)}")
+
     async def scrape(self, page: Page) -> List[Dict[str, Any]]:
         """
         Main scraping method.
@@ -231,12 +464,19 @@ class ChatListScraper:
         try:
             logger.info("Starting chat list scraping...")
 
+            if not self.has_more_chats:
+                # Resumed run whose checkpoint already covers the whole list
+                self.record_run_stats()
+                return self.tracker.all_chats
+
             # Set up API interception
             page.on("response", self.intercept_api_response)
+            if self.resume_cursor is not None:
+                await page.route(lambda url: urlparse(url).path == CHAT_LIST_PATH, self.route_to_resume_cursor)
 
             # Navigate to chat list page
             logger.info("Navigating to /pro/chats...")
-            await page.goto("https://soomgo.com/pro/chats", wait_until="domcontentloaded", timeout=60000)
+            await page.goto(f"{config.SOOMGO_BASE_URL}/pro/chats", wait_until="domcontentloaded", timeout=60000)
 
             # Wait for initial load
             await asyncio.sleep(3)
@@ -267,62 +507,7 @@ class ChatListScraper:
             # Take final screenshot
             await self.run_logger.save_screenshot(page, "final_state")
 
-            # Update metadata
-            self.run_logger.metadata.scroll_iterations = self.scroll_count
-            self.run_logger.metadata.api_calls_intercepted = self.api_call_count
-            self.run_logger.metadata.viewport_changes = self.viewport_change_count
-            self.run_logger.metadata.backoff_events = self.backoff_count
-
-            # Save humanization stats
-            self.run_logger.metadata.humanization_stats.reading_pauses = self.humanization_tracker.reading_pauses
-            self.run_logger.metadata.humanization_stats.scroll_ups = self.humanization_tracker.scroll_ups
-            self.run_logger.metadata.humanization_stats.mouse_movements = self.humanization_tracker.mouse_movements
-            self.run_logger.metadata.humanization_stats.session_breaks = self.humanization_tracker.session_breaks
-            self.run_logger.metadata.humanization_stats.total_wait_time_seconds = self.humanization_tracker.total_wait_time
-
-            # Calculate efficiency metrics
-            total_chats = len(self.tracker.all_chats)
-            if self.api_call_count > 0:
-                self.run_logger.metadata.efficiency_metrics.chats_per_api_call = total_chats / self.api_call_count
-            if self.scroll_count > 0:
-                self.run_logger.metadata.efficiency_metrics.chats_per_scroll = total_chats / self.scroll_count
-
-            # Calculate rates (per minute)
-            if (hasattr(self.run_logger.metadata, 'first_api_call_at') and
-                hasattr(self.run_logger.metadata, 'last_api_call_at') and
-                self.run_logger.metadata.first_api_call_at and
-                self.run_logger.metadata.last_api_call_at):
-                duration_minutes = (self.run_logger.metadata.last_api_call_at - self.run_logger.metadata.first_api_call_at).total_seconds() / 60
-                if duration_minutes > 0:
-                    self.run_logger.metadata.efficiency_metrics.api_calls_per_minute = self.api_call_count / duration_minutes
-                    self.run_logger.metadata.efficiency_metrics.scrolls_per_minute = self.scroll_count / duration_minutes
-
-            # Extract statistics
-            if self.tracker.all_chats:
-                services = extract_service_titles(self.tracker.all_chats)
-                oldest, newest = get_date_range(self.tracker.all_chats)
-
-                self.run_logger.metadata.unique_services = services
-                self.run_logger.metadata.oldest_chat_date = oldest
-                self.run_logger.metadata.newest_chat_date = newest
-
-                logger.info(f"Services found: {', '.join(services)}")
-                logger.info(f"Date range: {oldest} to {newest}")
-
-            # Log efficiency stats
-            em = self.run_logger.metadata.efficiency_metrics
-            chats_per_api = f"{em.chats_per_api_call:.2f}" if em.chats_per_api_call else "N/A"
-            chats_per_scroll = f"{em.chats_per_scroll:.2f}" if em.chats_per_scroll else "N/A"
-            logger.info(f"Efficiency: {chats_per_api} chats/API call, {chats_per_scroll} chats/scroll")
-            logger.info(f"Humanization: {self.humanization_tracker.reading_pauses} pauses, "
-                       f"{self.humanization_tracker.scroll_ups} scroll-ups, "
-                       f"{self.humanization_tracker.mouse_movements} mouse moves, "
-                       f"{self.humanization_tracker.session_breaks} breaks")
-
-            if self.dry_run:
-                logger.success(f"[DRY RUN] Preview complete! Found {len(self.tracker.all_chats)} chats")
-            else:
-                logger.success(f"Scraping complete! Total chats: {len(self.tracker.all_chats)}")
+            self.record_run_stats()
 
             return self.tracker.all_chats
 
@@ -331,8 +516,107 @@ class ChatListScraper:
             self.run_logger.log_error(e, "Main scraping loop")
             raise
 
+    async def fetch_direct(self, client: DirectApiClient) -> List[Dict[str, Any]]:
+        """
+        Fetch the chat list by following API cursors directly (no browser).
 
-async def scrape_chat_list(context: BrowserContext, dry_run: bool = False, dry_run_limit: int = 50, date_filter: str = "all") -> Path:
+        Pages go through the same processing as intercepted responses, so the
+        date filter, dry run limit and checkpoints behave as in scrape(). A
+        resumed run continues from its checkpointed cursor.
+
+        Args:
+            client: Open direct API client
+
+        Returns:
+            List of all fetched chats
+        """
+        try:
+            logger.info("Starting direct chat list fetch...")
+
+            if not self.has_more_chats:
+                # Resumed run whose checkpoint already covers the whole list
+                self.record_run_stats()
+                return self.tracker.all_chats
+
+            async for data in client.iter_chat_list_pages(start=self.resume_cursor):
+                await self.process_api_page(data)
+
+                if self.dry_run and len(self.tracker.all_chats) >= self.dry_run_limit:
+                    logger.success(f"[DRY RUN] Reached limit of {self.dry_run_limit} chats")
+                    break
+                if not self.has_more_chats:
+                    break
+
+            self.record_run_stats()
+
+            return self.tracker.all_chats
+
+        except Exception as e:
+            logger.error(f"Error during direct fetch: {e}")
+            self.run_logger.log_error(e, "Direct fetch loop")
+            raise
+
+
+def start_chat_list_run(
+    run_config: Dict[str, Any],
+    dry_run: bool = False,
+    dry_run_limit: int = 50,
+    date_filter: str = "all",
+    incremental: bool = False,
+    resume_run_id: Optional[str] = None
+) -> ChatListScraper:
+    """
+    Create the run logger and scraper of a new or resumed chat list run.
+
+    A resumed run reuses its directory, date filter and checkpointed progress;
+    the other arguments only apply to new runs.
+
+    Args:
+        run_config: Configuration recorded for a new run
+        dry_run: If True, only preview first N chats without saving full output
+        dry_run_limit: Number of chats to preview in dry run mode
+        date_filter: "all" or "30days"
+        incremental: Stop at the first page of chats unchanged in the central database
+        resume_run_id: ID of an interrupted run to continue
+
+    Returns:
+        ChatListScraper ready to scrape or fetch
+    """
+    if not resume_run_id:
+        run_type = "chat_list_dryrun" if dry_run else "chat_list"
+        run_logger = RunLogger(run_type, run_config)
+        return ChatListScraper(
+            run_logger,
+            dry_run=dry_run,
+            dry_run_limit=dry_run_limit,
+            date_filter=date_filter,
+            incremental=incremental
+        )
+
+    # Dry runs don't save API responses, so only full runs can be resumed
+    run_dir = find_chat_list_run(resume_run_id)
+    with open(run_dir / CHECKPOINT_FILE, 'r', encoding='utf-8') as f:
+        checkpoint = json.load(f)
+    resumed_config = {**checkpoint.get("config", {}), "fetch_mode": run_config.get("fetch_mode", "browser")}
+
+    run_logger = RunLogger("chat_list", resumed_config, run_dir=run_dir)
+    scraper = ChatListScraper(
+        run_logger,
+        date_filter=resumed_config.get("date_filter", "all"),
+        incremental=resumed_config.get("incremental", False)
+    )
+    scraper.restore_checkpoint(scraper.tracker.load_checkpoint(run_dir / CHECKPOINT_FILE))
+    return scraper
+
+
+async def scrape_chat_list(
+    context: BrowserContext,
+    dry_run: bool = False,
+    dry_run_limit: int = 50,
+    date_filter: str = "all",
+    incremental: bool = False,
+    resume_run_id: Optional[str] = None
+) -> Path:
     """
     High-level function to scrape the entire chat list.
 
@@ -341,6 +625,8 @@ async def scrape_chat_list(context: BrowserContext, dry_run: bool = False, dry_r
         dry_run: If True, only preview first N chats without saving full output
         dry_run_limit: Number of chats to preview in dry run mode
         date_filter: "all" or "30days" - stop scraping when reaching chats older than cutoff
+        incremental: Stop at the first page of chats unchanged in the central database
+        resume_run_id: ID of an interrupted run to continue from its checkpoint
 
     Returns:
         Path to the run directory containing results
@@ -352,97 +638,179 @@ async def scrape_chat_list(context: BrowserContext, dry_run: bool = False, dry_r
         "scroll_wait_time": 2000,
         "dry_run": dry_run,
         "dry_run_limit": dry_run_limit if dry_run else None,
-        "date_filter": date_filter
+        "date_filter": date_filter,
+        "incremental": incremental
     }
-    run_type = "chat_list_dryrun" if dry_run else "chat_list"
-    run_logger = RunLogger(run_type, config)
+    scraper = start_chat_list_run(config, dry_run, dry_run_limit, date_filter, incremental, resume_run_id)
+    run_logger = scraper.run_logger
 
     try:
-        # Create scraper
-        scraper = ChatListScraper(run_logger, dry_run=dry_run, dry_run_limit=dry_run_limit, date_filter=date_filter)
-
         # Create new page
         page = await context.new_page()
 
         # Scrape
         chats = await scraper.scrape(page)
 
-        # Generate data quality report
-        logger.info("Generating data quality report...")
-        quality_report = generate_quality_report(chats)
-
-        # Save quality report
-        import json
-        quality_report_file = run_logger.run_dir / "data_quality_report.json"
-        with open(quality_report_file, 'w', encoding='utf-8') as f:
-            json.dump(quality_report.dict(), f, indent=2, ensure_ascii=False, default=str)
-        run_logger.metadata.output_files.append(str(quality_report_file))
-        logger.success(f"Quality Score: {quality_report.quality_score}/100 ({quality_report.quality_grade})")
-
-        # Update central database (skip in dry run mode)
-        if not dry_run:
-            logger.info("Updating central database...")
-            central_db = CentralChatDatabase()
-
-            # Convert dict chats to ChatItem objects if needed
-            chat_items = []
-            for chat in chats:
-                if isinstance(chat, dict):
-                    chat_items.append(ChatItem(**chat))
-                else:
-                    chat_items.append(chat)
-
-            # Load existing database
-            existing_chats = central_db.load()
-
-            # Merge and update
-            merged_chats, new_count, updated_count = central_db.merge_and_update(
-                existing=existing_chats,
-                new_chats=chat_items
-            )
-
-            # Save back to central database
-            central_db.save(merged_chats)
-
-            logger.success(f"Central database updated: {new_count} new, {updated_count} updated, {len(merged_chats)} total")
-
-        # Save results (skip full output in dry run mode)
-        if not dry_run:
-            output_file = run_logger.run_dir / "chat_list.jsonl"
-            save_to_jsonl(chats, output_file)
-            run_logger.metadata.output_files.append(str(output_file))
-
-            # Also save as regular JSON for easy viewing
-            json_file = run_logger.run_dir / "chat_list.json"
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(chats, f, indent=2, ensure_ascii=False)
-            run_logger.metadata.output_files.append(str(json_file))
-        else:
-            # In dry run, save a preview sample
-            preview_file = run_logger.run_dir / "preview_sample.json"
-            sample = chats[:min(10, len(chats))]  # First 10 chats as preview
-            with open(preview_file, 'w', encoding='utf-8') as f:
-                json.dump(sample, f, indent=2, ensure_ascii=False)
-            run_logger.metadata.output_files.append(str(preview_file))
-            logger.info(f"Preview sample (first {len(sample)} chats) saved")
-
         # Close page
         await page.close()
 
-        # Finalize
-        status = "completed" if not dry_run else "dry_run_completed"
-        run_dir = run_logger.finalize(status)
+        return save_chat_list_results(run_logger, chats, dry_run=scraper.dry_run)
 
-        if dry_run:
-            logger.success(f"[DRY RUN] Preview completed: {run_dir}")
-            logger.success(f"Total chats found: {len(chats)} (stopped at limit)")
-        else:
-            logger.success(f"Results saved to: {run_dir}")
-            logger.success(f"Total chats scraped: {len(chats)}")
+    except Exception as e:
+        logger.error(f"Chat list scraping failed: {e}")
+        run_logger.finalize("failed")
+        if not scraper.dry_run:
+            logger.info(f"Resume with: --resume {run_logger.run_id}")
+        raise
+
+
+async def fetch_chat_list_direct(
+    client: DirectApiClient,
+    dry_run: bool = False,
+    dry_run_limit: int = 50,
+    date_filter: str = "all",
+    incremental: bool = False,
+    resume_run_id: Optional[str] = None
+) -> Path:
+    """
+    High-level function to fetch the entire chat list over the API.
+
+    Args:
+        client: Open direct API client (carries the saved session and rate limit)
+        dry_run: If True, only preview first N chats without saving full output
+        dry_run_limit: Number of chats to preview in dry run mode
+        date_filter: "all" or "30days" - stop fetching when reaching chats older than cutoff
+        incremental: Stop at the first page of chats unchanged in the central database
+        resume_run_id: ID of an interrupted run to continue from its checkpoint
+
+    Returns:
+        Path to the run directory containing results
+    """
+    config = {
+        "fetch_mode": "direct",
+        "checkpoint_interval": 50,
+        "rate_limit": client.rate_limiter.rate,
+        "dry_run": dry_run,
+        "dry_run_limit": dry_run_limit if dry_run else None,
+        "date_filter": date_filter,
+        "incremental": incremental
+    }
+    scraper = start_chat_list_run(config, dry_run, dry_run_limit, date_filter, incremental, resume_run_id)
+    run_logger = scraper.run_logger
+
+    try:
+        chats = await scraper.fetch_direct(client)
+
+        logger.info(f"Direct API: {client.request_count} requests, {client.retry_count} retries, "
+                    f"{client.rate_limiter.total_wait_time:.1f}s rate-limit wait")
 
-        return run_dir
+        return save_chat_list_results(run_logger, chats, dry_run=scraper.dry_run)
 
     except Exception as e:
-        logger.error(f"Chat list scraping failed: {e}")
+        logger.error(f"Direct chat list fetch failed: {e}")
         run_logger.finalize("failed")
+        if not scraper.dry_run:
+            logger.info(f"Resume with: --resume {run_logger.run_id}")
         raise
+
+
+def sync_chat_list(central_db: ChatStore, chats: List[ChatItem]) -> Tuple[int, int]:
+    """
+    Write a run's new and changed chats to the central database.
+
+    Only the run's chats are read back (through the index), so the cost is
+    proportional to the run, not to the size of the database.
+
+    Args:
+        central_db: Chat database to update
+        chats: Chats collected by the run
+
+    Returns:
+        Tuple of (new_count, updated_count)
+    """
+    existing = central_db.get_many([chat.id for chat in chats])
+
+    # Last occurrence wins when a chat appears on several pages
+    latest = {chat.id: chat for chat in chats}
+    changed = central_db.changed_chats(existing, list(latest.values()))
+    central_db.append(changed)
+
+    new_count = sum(1 for chat in changed if chat.id not in existing)
+    return new_count, len(changed) - new_count
+
+
+def save_chat_list_results(run_logger: RunLogger, chats: List[Dict[str, Any]], dry_run: bool = False) -> Path:
+    """
+    Write a chat list run's outputs and merge it into the central database.
+
+    Shared by the browser scraper and the direct API fetcher.
+
+    Args:
+        run_logger: Logger of the run
+        chats: Collected chats (as dictionaries)
+        dry_run: If True, save only a preview and skip the central database
+
+    Returns:
+        Path to the run directory containing results
+    """
+    # Generate data quality report
+    logger.info("Generating data quality report...")
+    quality_report = generate_quality_report(chats)
+
+    # Save quality report
+    import json
+    quality_report_file = run_logger.run_dir / "data_quality_report.json"
+    with open(quality_report_file, 'w', encoding='utf-8') as f:
+        json.dump(quality_report.dict(), f, indent=2, ensure_ascii=False, default=str)
+    run_logger.metadata.output_files.append(str(quality_report_file))
+    logger.success(f"Quality Score: {quality_report.quality_score}/100 ({quality_report.quality_grade})")
+
+    # Update central database (skip in dry run mode)
+    if not dry_run:
+        logger.info("Updating central database...")
+        central_db = open_chat_database()
+
+        # Convert dict chats to ChatItem objects if needed
+        chat_items = []
+        for chat in chats:
+            if isinstance(chat, dict):
+                chat_items.append(ChatItem(**chat))
+            else:
+                chat_items.append(chat)
+
+        new_count, updated_count = sync_chat_list(central_db, chat_items)
+        unchanged_count = len({chat.id for chat in chat_items}) - new_count - updated_count
+        logger.success(f"Central database updated: {new_count} new, {updated_count} updated, {unchanged_count} unchanged")
+
+    # Save results (skip full output in dry run mode)
+    if not dry_run:
+        output_file = run_logger.run_dir / "chat_list.jsonl"
+        save_to_jsonl(chats, output_file)
+        run_logger.metadata.output_files.append(str(output_file))
+
+        # Also save as regular JSON for easy viewing
+        json_file = run_logger.run_dir / "chat_list.json"
+        with open(json_file, 'w', encoding='utf-8') as f:
+            json.dump(chats, f, indent=2, ensure_ascii=False)
+        run_logger.metadata.output_files.append(str(json_file))
+    else:
+        # In dry run, save a preview sample
+        preview_file = run_logger.run_dir / "preview_sample.json"
+        sample = chats[:min(10, len(chats))]  # First 10 chats as preview
+        with open(preview_file, 'w', encoding='utf-8') as f:
+            json.dump(sample, f, indent=2, ensure_ascii=False)
+        run_logger.metadata.output_files.append(str(preview_file))
+        logger.info(f"Preview sample (first {len(sample)} chats) saved")
+
+    # Finalize
+    status = "completed" if not dry_run else "dry_run_completed"
+    run_dir = run_logger.finalize(status)
+
+    if dry_run:
+        logger.success(f"[DRY RUN] Preview completed: {run_dir}")
+        logger.success(f"Total chats found: {len(chats)} (stopped at limit)")
+    else:
+        logger.success(f"Results saved to: {run_dir}")
+        logger.success(f"Total chats scraped: {len(chats)}")
+
+    return run_dir
@@ -2,17 +2,18 @@
 
 import asyncio
 import json
+import os
 import time
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from playwright.async_api import Page, BrowserContext
 from loguru import logger
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
 
 from src.utils import (
     RunLogger,
-    save_to_jsonl,
+    append_many_to_jsonl,
     wait_for_network_idle,
     HumanizationTracker,
     apply_rate_limit,
@@ -25,9 +26,16 @@ from src.models import (
     MessageScrapingRunMetadata,
     ChatScrapingStatus
 )
-from src.scraper.message_central_db import MessageCentralDB
-from src.scraper.central_db import CentralChatDatabase
-from src.scraper.data_quality import generate_quality_report
+from src.scraper.message_central_db import MessageStore
+from src.scraper.storage import open_chat_database, open_message_database
+from src.scraper.scheduler import chat_state, schedule_chats
+from src.scraper.async_writer import AsyncMessageWriter
+from src.scraper.data_quality import QualityAccumulator
+from src.scraper.direct_api import DirectApiClient, MESSAGES_PATH
+from src.scraper.run_journal import RunJournal, find_run_dir
+from src.scraper.concurrency import AdaptiveConcurrency
+from src.scraper.timing import PhaseHistogram, PhaseTimer
+from src import config
 
 
 class MessageTracker:
@@ -66,13 +74,18 @@ class MessageTracker:
 class ChatMessageScraper:
     """Scrapes messages for a single chat using API interception."""
 
-    def __init__(self, chat_id: int):
+    def __init__(self, chat_id: int, watermark: Optional[Dict[str, Any]] = None):
         """Initialize scraper for a specific chat.
 
         Args:
             chat_id: ID of the chat to scrape
+            watermark: Manifest entry of the stored messages (last_message_id,
+                last_created_at). If given, scrolling stops as soon as a page
+                overlaps messages already on disk (incremental mode).
         """
         self.chat_id = chat_id
+        self.watermark = watermark
+        self.reached_stored = False
         self.tracker = MessageTracker()
         self.api_responses: List[Dict[str, Any]] = []
         self.api_call_count = 0
@@ -80,12 +93,24 @@ class ChatMessageScraper:
         self.has_more_messages = True
         self.humanization_tracker = HumanizationTracker()
         self.api_intercept_errors = 0  # Track failed API response reads
+        self.backoff_events = 0  # API timeouts (browser) or retried requests (direct)
+        self.page_latencies: List[float] = []  # Seconds from page request to parsed response
+        self.page_requested_at: Optional[float] = None
+        self.timer = PhaseTimer()  # Wall time per phase (see src/scraper/timing.py)
+        self.api_call_condition = asyncio.Condition()  # Notified after each parsed API response
+
+    @property
+    def mean_page_latency(self) -> Optional[float]:
+        """Mean API page latency of this chat (None if no page was timed)."""
+        if not self.page_latencies:
+            return None
+        return sum(self.page_latencies) / len(self.page_latencies)
 
     async def intercept_api_response(self, response):
         """Handler for intercepted API responses."""
         try:
             # Check if this is the messages API for our chat
-            expected_url = f"api.soomgo.com/api/v2.2/chats/{self.chat_id}/messages"
+            expected_url = f"{config.SOOMGO_API_URL}{MESSAGES_PATH.format(chat_id=self.chat_id)}"
             if expected_url in response.url and response.status == 200:
                 # Try to read response body with error tracking
                 try:
@@ -96,23 +121,61 @@ class ChatMessageScraper:
                     logger.warning(f"Chat {self.chat_id}: API intercept error #{self.api_intercept_errors} - {json_error}")
                     return
 
-                # Save response
-                self.api_call_count += 1
-                self.api_responses.append(data)
+                await self.process_api_page(data)
 
-                # Check if there are more messages
-                if data.get("next") is None:
-                    self.has_more_messages = False
-                    logger.success(f"Chat {self.chat_id}: API indicates no more messages (next=null)")
+        except Exception as e:
+            logger.error(f"Error processing API response for chat {self.chat_id}: {e}")
 
-                # Process messages
-                new_count = self.tracker.add_messages_from_response(data)
-                total_messages = len(self.tracker.all_messages)
+    async def process_api_page(self, data: Dict[str, Any]):
+        """Process one message API page (intercepted or fetched directly)."""
+        # Save response
+        self.api_call_count += 1
+        self.api_responses.append(data)
+        if self.page_requested_at is not None:
+            self.page_latencies.append(time.monotonic() - self.page_requested_at)
+            self.page_requested_at = None
 
-                logger.info(f"Chat {self.chat_id} API Call #{self.api_call_count}: +{new_count} new messages (Total: {total_messages})")
+        # Check if there are more messages
+        if data.get("next") is None:
+            self.has_more_messages = False
+            logger.success(f"Chat {self.chat_id}: API indicates no more messages (next=null)")
 
-        except Exception as e:
-            logger.error(f"Error processing API response for chat {self.chat_id}: {e}")
+        # Incremental mode: older pages are already stored
+        if self.has_more_messages and self.overlaps_stored(data):
+            self.reached_stored = True
+            self.has_more_messages = False
+            logger.success(f"Chat {self.chat_id}: Reached already-stored messages, stopping")
+
+        # Process messages
+        new_count = self.tracker.add_messages_from_response(data)
+        total_messages = len(self.tracker.all_messages)
+
+        logger.info(f"Chat {self.chat_id} API Call #{self.api_call_count}: +{new_count} new messages (Total: {total_messages})")
+
+        # Wake the scroll loop as soon as the page is parsed
+        async with self.api_call_condition:
+            self.api_call_condition.notify_all()
+
+    def overlaps_stored(self, response_data: Dict[str, Any]) -> bool:
+        """Check whether an API page reaches messages already on disk.
+
+        Args:
+            response_data: Raw MessageListResponse data
+
+        Returns:
+            True if the page contains the stored last message or anything older
+        """
+        if not self.watermark or not self.watermark.get("last_message_id"):
+            return False
+
+        last_id = self.watermark["last_message_id"]
+        last_created_at = self.watermark.get("last_created_at")
+        for message in response_data.get("results", []):
+            if message.get("id") == last_id:
+                return True
+            if last_created_at and message.get("created_at") and message["created_at"] <= last_created_at:
+                return True
+        return False
 
     async def scroll_to_load_messages(self, page: Page) -> None:
         """Scroll up to load older messages.
@@ -121,37 +184,44 @@ class ChatMessageScraper:
             page: Playwright page object
         """
         # Scroll to top of message container to load older messages
-        await page.evaluate("""
-            () => {
-                const container = document.querySelector('.chat-messages');
-                if (container) {
-                    container.scrollTop = 0;
+        with self.timer.phase("scroll"):
+            await page.evaluate("""
+                () => {
+                    const container = document.querySelector('.chat-messages');
+                    if (container) {
+                        container.scrollTop = 0;
+                    }
                 }
-            }
-        """)
+            """)
 
         # Small humanization delay
-        await asyncio.sleep(1.5 + (asyncio.get_event_loop().time() % 1.5))
+        with self.timer.phase("humanization"):
+            await asyncio.sleep(1.5 + (asyncio.get_event_loop().time() % 1.5))
         self.humanization_tracker.total_wait_time += 1.5
 
-    async def wait_for_new_api_call(self, timeout: int = 8000) -> bool:
+    async def wait_for_new_api_call(self, timeout: int = 8000, since: Optional[int] = None) -> bool:
         """Wait for a new API call to be intercepted.
 
         Args:
             timeout: Timeout in milliseconds
+            since: API call count to wait past (default: the current count);
+                pass the count from before a scroll so a response that arrived
+                during the scroll is not missed
 
         Returns:
             True if new call detected, False if timeout
         """
-        start_count = self.api_call_count
-        start_time = asyncio.get_event_loop().time()
+        start_count = self.api_call_count if since is None else since
 
-        while asyncio.get_event_loop().time() - start_time < timeout / 1000:
-            if self.api_call_count > start_count:
-                return True
-            await asyncio.sleep(0.5)
-
-        return False
+        try:
+            async with self.api_call_condition:
+                await asyncio.wait_for(
+                    self.api_call_condition.wait_for(lambda: self.api_call_count > start_count),
+                    timeout / 1000
+                )
+            return True
+        except asyncio.TimeoutError:
+            return False
 
     async def scroll_until_complete(self, page: Page, max_scrolls: int = 300):
         """Scroll the chat to load all messages until API returns next=null.
@@ -165,21 +235,28 @@ class ChatMessageScraper:
         for scroll_num in range(max_scrolls):
             # PRIMARY STOP CONDITION: Check if API says no more messages
             if not self.has_more_messages:
-                logger.success(f"Chat {self.chat_id}: ✓ All messages loaded (next=null)")
+                if self.reached_stored:
+                    logger.success(f"Chat {self.chat_id}: ✓ New messages loaded (reached stored history)")
+                else:
+                    logger.success(f"Chat {self.chat_id}: ✓ All messages loaded (next=null)")
                 break
 
             self.scroll_count += 1
 
-            # Track messages before scroll
+            # Track messages and API calls before scroll
             messages_before = len(self.tracker.all_messages)
+            calls_before = self.api_call_count
 
             # Scroll up to load older messages
             logger.debug(f"Chat {self.chat_id} Scroll #{self.scroll_count}")
+            self.page_requested_at = time.monotonic()
             await self.scroll_to_load_messages(page)
 
-            # Wait for API response
-            await asyncio.sleep(1)  # Let scroll trigger API call
-            new_call = await self.wait_for_new_api_call(timeout=8000)
+            # Wait for the API response triggered by this scroll
+            with self.timer.phase("scroll_wait"):
+                new_call = await self.wait_for_new_api_call(timeout=8000, since=calls_before)
+            if not new_call and self.has_more_messages:
+                self.backoff_events += 1
 
             # Log progress
             messages_after = len(self.tracker.all_messages)
@@ -188,7 +265,8 @@ class ChatMessageScraper:
 
             # Faster humanization for messages (1-3 second delay)
             delay = 1.0 + (asyncio.get_event_loop().time() % 2.0)
-            await asyncio.sleep(delay)
+            with self.timer.phase("humanization"):
+                await asyncio.sleep(delay)
             self.humanization_tracker.total_wait_time += delay
 
         if scroll_num >= max_scrolls - 1:
@@ -210,13 +288,17 @@ class ChatMessageScraper:
             page.on("response", self.intercept_api_response)
 
             # Navigate to chat page
-            chat_url = f"https://soomgo.com/pro/chats/{self.chat_id}?from=chatroom"
+            chat_url = f"{config.SOOMGO_BASE_URL}/pro/chats/{self.chat_id}?from=chatroom"
             logger.info(f"Navigating to {chat_url}...")
-            await page.goto(chat_url, wait_until="domcontentloaded", timeout=60000)
+            self.page_requested_at = time.monotonic()
+            with self.timer.phase("navigation"):
+                await page.goto(chat_url, wait_until="domcontentloaded", timeout=60000)
 
-            # Wait for initial load
-            await asyncio.sleep(3)
-            await wait_for_network_idle(page)
+            # Wait for initial load (the first message page arrives meanwhile)
+            with self.timer.phase("humanization"):
+                await asyncio.sleep(3)
+            with self.timer.phase("first_response"):
+                await wait_for_network_idle(page)
 
             # Scroll to load all messages
             await self.scroll_until_complete(page)
@@ -229,45 +311,263 @@ class ChatMessageScraper:
             logger.error(f"Error scraping chat {self.chat_id}: {e}")
             raise
 
+    async def fetch_direct(self, client: DirectApiClient) -> List[MessageItem]:
+        """Fetch all messages for this chat by following API cursors (no browser).
+
+        Args:
+            client: Open direct API client
+
+        Returns:
+            List of all messages
+        """
+        try:
+            logger.info(f"Fetching messages for chat {self.chat_id} over the API...")
+
+            # Retries are counted client-wide, so concurrent chats' retries count too
+            retries_before = client.retry_count
+            self.page_requested_at = time.monotonic()
+            pages = client.iter_message_pages(self.chat_id)
+            while True:
+                with self.timer.phase("first_response" if self.api_call_count == 0 else "api_fetch"):
+                    data = await anext(pages, None)
+                if data is None:
+                    break
+                await self.process_api_page(data)
+                if not self.has_more_messages:
+                    await pages.aclose()
+                    break
+                self.page_requested_at = time.monotonic()
+            self.backoff_events += client.retry_count - retries_before
+
+            logger.success(f"Chat {self.chat_id}: Fetch complete! Total messages: {len(self.tracker.all_messages)}")
+
+            return self.tracker.all_messages
+
+        except Exception as e:
+            logger.error(f"Error fetching chat {self.chat_id}: {e}")
+            raise
+
+
+class RunMessageSink:
+    """Streams each finished chat's messages to the run file and quality report.
+
+    Workers hand over one chat at a time, so a run never holds more than the
+    chat being processed (plus the small quality projections).
+    """
+
+    def __init__(self, output_file: Optional[Path] = None, truncate: bool = True):
+        """Initialize the sink.
+
+        Args:
+            output_file: Run messages.jsonl to append to (None: don't write,
+                e.g. in dry run mode)
+            truncate: Start from an empty file (False when resuming a run;
+                call restore() before adding chats)
+        """
+        self.output_file = output_file
+        self.quality = QualityAccumulator()
+        self.message_count = 0
+
+        if self.output_file and truncate:
+            self.output_file.write_text('', encoding='utf-8')
+
+    def add_chat(self, messages: List[MessageItem]) -> Optional[Tuple[int, int]]:
+        """Append one chat's messages and feed them to the quality report.
+
+        Args:
+            messages: Messages scraped for the chat
+
+        Returns:
+            Byte range (start, end) of the chat's records in the output file,
+            or None if nothing was written
+        """
+        records = [message.model_dump(mode="json") for message in messages]
+        self.quality.add(records)
+        self.message_count += len(records)
+
+        if not (self.output_file and records):
+            return None
+        start = self.output_file.stat().st_size
+        append_many_to_jsonl(records, self.output_file)
+        return start, self.output_file.stat().st_size
+
+    def restore(self, drop_ranges: List[Tuple[int, int]], valid_size: int) -> int:
+        """Rebuild the output file of an interrupted run before resuming it.
+
+        Keeps the first `valid_size` bytes (everything the run journal
+        accounts for) minus `drop_ranges` (records of chats that will be
+        scraped again), and feeds the kept records to the quality report.
+
+        Args:
+            drop_ranges: Sorted byte ranges to remove
+            valid_size: Bytes of the file recorded in the journal
+
+        Returns:
+            Size of the rebuilt file
+        """
+        if not self.output_file:
+            return 0
+        if not self.output_file.exists():
+            self.output_file.write_text('', encoding='utf-8')
+            return 0
+
+        temp_file = self.output_file.with_suffix('.tmp')
+        with open(self.output_file, 'rb') as source, open(temp_file, 'wb') as target:
+            position = 0
+            for start, end in drop_ranges + [(valid_size, valid_size)]:
+                target.write(source.read(max(0, start - position)))
+                source.seek(end)
+                position = end
+
+        with open(temp_file, 'r', encoding='utf-8') as f:
+            batch = []
+            for line in f:
+                if line.strip():
+                    batch.append(json.loads(line))
+                if len(batch) >= 1000:
+                    self.quality.add(batch)
+                    self.message_count += len(batch)
+                    batch = []
+            self.quality.add(batch)
+            self.message_count += len(batch)
+
+        os.replace(temp_file, self.output_file)
+        return self.output_file.stat().st_size
+
+
+def journal_chat_result(
+    journal: RunJournal,
+    status: ChatScrapingStatus,
+    output_range: Optional[Tuple[int, int]],
+    watermark: Dict[str, Any],
+    save_future: Optional[asyncio.Future] = None
+) -> None:
+    """Journal a scraped chat's outcome.
+
+    A chat with a pending database save is journaled as `scraped` now and as
+    `done` (or `failed`) once the save finished, so a crash in between leaves
+    it unfinished.
+
+    Args:
+        journal: Run journal
+        status: Scraping status of the chat
+        output_range: Byte range of its records in the run messages.jsonl
+        watermark: Chat list state the chat was scraped at
+        save_future: Pending save from the AsyncMessageWriter (None: nothing to wait for)
+    """
+    if status.status == "failed":
+        journal.record(status.chat_id, "failed", output_range=output_range, error=status.error, status=status.model_dump())
+        return
+    if save_future is None:
+        journal.record(status.chat_id, "done", output_range=output_range, watermark=watermark, status=status.model_dump())
+        return
+
+    journal.record(status.chat_id, "scraped", output_range=output_range)
+
+    def _on_saved(future: asyncio.Future) -> None:
+        if future.cancelled() or future.exception() is not None:
+            error = "save cancelled" if future.cancelled() else f"save failed: {future.exception()}"
+            journal.record(status.chat_id, "failed", error=error)
+        else:
+            journal.record(status.chat_id, "done", watermark=watermark, status=status.model_dump())
+
+    save_future.add_done_callback(_on_saved)
+
+
+def build_work_queue(chats: List[ChatItem], longest_first: bool = False) -> asyncio.Queue:
+    """Build the shared queue workers pull chats from.
+
+    Args:
+        chats: Chats to scrape, in priority order
+        longest_first: Order by provider_message_count (descending) so long
+            chats start early instead of straggling at the end of the run
+
+    Returns:
+        Queue pre-filled with the chats
+    """
+    if longest_first:
+        chats = sorted(chats, key=lambda chat: chat.provider_message_count, reverse=True)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for chat in chats:
+        queue.put_nowait(chat)
+    return queue
+
 
 async def scrape_worker(
     worker_id: int,
-    assigned_chats: List[ChatItem],
-    page: Page,
-    message_db: MessageCentralDB,
+    queue: asyncio.Queue,
+    total_chats: int,
+    page: Optional[Page],
+    message_db: MessageStore,
     dry_run: bool,
     progress,
-    progress_task
-) -> tuple[List[MessageItem], List[ChatScrapingStatus], HumanizationTracker]:
-    """Worker function to scrape assigned chats.
+    progress_task,
+    sink: RunMessageSink,
+    writer: Optional[AsyncMessageWriter] = None,
+    incremental: bool = False,
+    client: Optional[DirectApiClient] = None,
+    journal: Optional[RunJournal] = None,
+    controller: Optional[AdaptiveConcurrency] = None
+) -> tuple[List[ChatScrapingStatus], HumanizationTracker]:
+    """Worker function pulling chats from the shared queue until it is empty.
 
     Args:
         worker_id: Worker identifier
-        assigned_chats: List of chats assigned to this worker
-        page: Playwright page for this worker
+        queue: Shared queue of chats (see build_work_queue)
+        total_chats: Total chats in the run (for logging)
+        page: Playwright page for this worker (None in direct mode)
         message_db: Central message database
         dry_run: Whether in dry run mode
         progress: Progress bar instance
         progress_task: Progress task ID
+        sink: Run output each finished chat's messages are streamed to
+        writer: Background writer merging results into message_db (None in dry run)
+        incremental: Stop scrolling once already-stored messages are reached
+        client: Shared direct API client; if given, chats are fetched over the
+            API instead of scrolled, and pacing is left to its rate limit
+        journal: Run journal each chat's progress is recorded in
+        controller: Adaptive concurrency controller; if given, the worker only
+            takes chats while it is within the active worker count, reports
+            each chat's signals to it and uses its inter-chat delay
 
     Returns:
-        Tuple of (messages, statuses, humanization_tracker)
+        Tuple of (statuses, humanization_tracker)
     """
-    worker_messages = []
     worker_statuses = []
     worker_humanization = HumanizationTracker()
 
-    for idx, chat in enumerate(assigned_chats, 1):
+    idx = 0
+    while True:
+        if controller:
+            await controller.wait_turn(worker_id)
+        try:
+            chat = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            if controller:
+                # Let parked workers see the empty queue and exit
+                await controller.close()
+            break
+
+        idx += 1
         chat_start_time = time.time()
 
         try:
-            logger.info(f"Worker {worker_id}: Chat {idx}/{len(assigned_chats)} - {chat.id} ({chat.service.title})")
+            position = total_chats - queue.qsize()
+            logger.info(f"Worker {worker_id}: Chat {position}/{total_chats} (#{idx} for this worker) - {chat.id} ({chat.service.title})")
+
+            if journal:
+                journal.record(chat.id, "in_flight", worker_id=worker_id)
 
             # Create scraper for this chat
-            scraper = ChatMessageScraper(chat.id)
+            watermark = message_db.get_manifest_entry(chat.id) if incremental else None
+            scraper = ChatMessageScraper(chat.id, watermark=watermark)
 
             # Scrape messages
-            messages = await scraper.scrape(page)
+            if client:
+                messages = await scraper.fetch_direct(client)
+            else:
+                messages = await scraper.scrape(page)
 
             # Validate results before saving
             is_suspicious = False
@@ -280,22 +580,21 @@ async def scrape_worker(
                 is_suspicious = True
                 failure_reason = f"{scraper.api_intercept_errors} API intercept errors"
 
-            # Update message central DB only if results are valid (skip in dry run)
+            # Update message central DB only if results are valid (skip in dry run).
+            # The merge-and-save runs on the writer's threads while this worker
+            # moves on; failures are applied to the statuses after the drain.
+            save_future = None
             if not dry_run:
                 if is_suspicious:
                     logger.error(f"Worker {worker_id}: Chat {chat.id} - FAILED validation: {failure_reason}. NOT saving file.")
                 else:
-                    existing_messages = message_db.load_chat_messages(chat.id)
-                    merged, new_count, updated_count = message_db.merge_and_update(
-                        chat.id,
-                        existing_messages,
-                        messages
-                    )
-                    message_db.save_chat_messages(chat.id, merged)
-                    logger.success(f"Worker {worker_id}: Chat {chat.id} - Updated DB ({new_count} new, {updated_count} updated)")
-
-            # Collect messages (even if suspicious, for reporting)
-            worker_messages.extend(messages)
+                    # Waits only while the writer is at max_pending
+                    with scraper.timer.phase("persist_queue"):
+                        save_future = await writer.submit(chat.id, messages, chat_state=chat_state(chat))
+                    logger.info(f"Worker {worker_id}: Chat {chat.id} - Queued DB update ({writer.pending_count} pending)")
+
+            # Stream messages to the run output (even if suspicious, for reporting)
+            output_range = sink.add_chat(messages)
 
             # Track status
             chat_duration = time.time() - chat_start_time
@@ -306,31 +605,51 @@ async def scrape_worker(
                 api_calls=scraper.api_call_count,
                 scroll_iterations=scraper.scroll_count,
                 duration_seconds=chat_duration,
-                error=failure_reason if is_suspicious else None
+                error=failure_reason if is_suspicious else None,
+                reached_stored=scraper.reached_stored,
+                worker_id=worker_id,
+                phase_seconds=scraper.timer.as_dict()
             )
             worker_statuses.append(status)
+            if journal:
+                journal_chat_result(journal, status, output_range, chat_state(chat), save_future)
 
             # Aggregate humanization stats
             worker_humanization.total_wait_time += scraper.humanization_tracker.total_wait_time
 
+            if controller:
+                await controller.record(
+                    started_at=chat_start_time,
+                    page_latency=scraper.mean_page_latency,
+                    errors=scraper.api_intercept_errors,
+                    empty=len(messages) == 0 and scraper.scroll_count > 0,
+                    backoffs=scraper.backoff_events
+                )
+
             # Update progress
             if progress:
                 progress.update(progress_task, advance=1)
 
-            # Delay between chats (3-7 seconds, random)
-            if idx < len(assigned_chats):  # Don't delay after last chat
-                delay = 3.0 + (time.time() % 4.0)
+            # Delay between chats (adaptive, or 3-7 seconds random; without a
+            # controller direct mode is paced by the client's rate limit only)
+            if controller:
+                delay = controller.next_delay()
+            else:
+                delay = 0 if client else 3.0 + (time.time() % 4.0)
+            if not queue.empty() and delay > 0:  # Don't delay after last chat
                 logger.debug(f"Worker {worker_id}: Waiting {delay:.1f}s before next chat...")
                 await asyncio.sleep(delay)
                 worker_humanization.total_wait_time += delay
+                status.phase_seconds["chat_delay"] = round(delay, 3)
 
-                # Long break every 20 chats
-                if idx % 20 == 0:
-                    break_time = 15 + (time.time() % 15)
-                    logger.info(f"Worker {worker_id}: Taking session break ({break_time:.1f}s)...")
-                    await asyncio.sleep(break_time)
-                    worker_humanization.session_breaks += 1
-                    worker_humanization.total_wait_time += break_time
+            # Long break every 20 chats (browser mode)
+            if not queue.empty() and not client and idx % 20 == 0:
+                break_time = 15 + (time.time() % 15)
+                logger.info(f"Worker {worker_id}: Taking session break ({break_time:.1f}s)...")
+                await asyncio.sleep(break_time)
+                worker_humanization.session_breaks += 1
+                worker_humanization.total_wait_time += break_time
+                status.phase_seconds["chat_delay"] = round(status.phase_seconds.get("chat_delay", 0.0) + break_time, 3)
 
         except Exception as e:
             logger.error(f"Worker {worker_id}: Failed to scrape chat {chat.id}: {e}")
@@ -342,16 +661,57 @@ async def scrape_worker(
                 status="failed",
                 message_count=0,
                 error=str(e),
-                duration_seconds=chat_duration
+                duration_seconds=chat_duration,
+                worker_id=worker_id
             )
             worker_statuses.append(status)
+            if journal:
+                journal.record(chat.id, "failed", error=str(e))
+            if controller:
+                await controller.record(started_at=chat_start_time, failed=True)
 
             # Update progress even on failure
             if progress:
                 progress.update(progress_task, advance=1)
 
-    logger.success(f"Worker {worker_id}: Completed {len(assigned_chats)} chats")
-    return worker_messages, worker_statuses, worker_humanization
+        finally:
+            queue.task_done()
+
+    logger.success(f"Worker {worker_id}: Completed {idx} chats")
+    return worker_statuses, worker_humanization
+
+
+def log_phase_timings(phase_timings: Dict[str, Dict[str, float]]) -> None:
+    """Log the slowest phases of a run (by total time)."""
+    phases = [(name, stats) for name, stats in phase_timings.items() if name != "chat_total"]
+    for name, stats in phases[:5]:
+        logger.info(f"Phase {name}: {stats['total']:.1f}s total, p50 {stats['p50']:.2f}s, "
+                    f"p95 {stats['p95']:.2f}s, max {stats['max']:.2f}s ({stats['count']} chats)")
+
+
+def build_controller(max_workers: int, min_workers: int = 1, direct: bool = False) -> AdaptiveConcurrency:
+    """Create the adaptive concurrency controller of a message run.
+
+    Browser mode starts at the usual 3-7s between chats and never goes below
+    ADAPTIVE_MIN_DELAY; direct mode starts without a delay (the client's rate
+    limit paces requests) and only adds one when backing off.
+
+    Args:
+        max_workers: Upper bound of active workers
+        min_workers: Lower bound of active workers
+        direct: Whether chats are fetched over the direct API
+
+    Returns:
+        AdaptiveConcurrency controller
+    """
+    return AdaptiveConcurrency(
+        max_workers=max_workers,
+        min_workers=min_workers,
+        min_delay=0.0 if direct else config.ADAPTIVE_MIN_DELAY,
+        max_delay=config.ADAPTIVE_MAX_DELAY,
+        latency_target=config.ADAPTIVE_LATENCY_TARGET,
+        initial_delay=0.0 if direct else 5.0
+    )
 
 
 def filter_chats_by_date(chats: List[ChatItem], filter_type: str) -> List[ChatItem]:
@@ -389,52 +749,101 @@ def filter_chats_by_date(chats: List[ChatItem], filter_type: str) -> List[ChatIt
 
 
 async def scrape_chat_messages(
-    context: BrowserContext,
+    context: Optional[BrowserContext],
     date_filter: str = "all",
     chat_limit: Optional[int] = None,
     dry_run: bool = False,
     dry_run_limit: int = 3,
     workers: int = 1,
-    skip_existing: bool = False
+    skip_existing: bool = False,
+    incremental: bool = False,
+    changed_only: bool = False,
+    longest_first: bool = False,
+    client: Optional[DirectApiClient] = None,
+    resume_run_id: Optional[str] = None,
+    adaptive: bool = False,
+    min_workers: int = 1
 ) -> Path:
     """High-level function to scrape messages for multiple chats.
 
     Args:
-        context: Authenticated browser context
+        context: Authenticated browser context (unused in direct mode)
         date_filter: "all" or "30days"
         chat_limit: Optional limit on number of chats to process
         dry_run: If True, only scrape a few chats for testing
         dry_run_limit: Number of chats to scrape in dry run mode
-        workers: Number of concurrent workers (1=sequential, 2-3=parallel)
+        workers: Number of concurrent workers (1=sequential, 2-3=parallel);
+            the upper bound in adaptive mode
         skip_existing: If True, skip chats that already have message files
+        incremental: If True, only fetch pages newer than the stored messages
+        changed_only: If True, skip chats unchanged since their last scrape and
+            scrape changed chats (newest first) before never-scraped ones
+        longest_first: If True, workers take chats with the most provider
+            messages first
+        client: Open direct API client; if given, messages are fetched over
+            the API by `workers` concurrent workers instead of browser pages
+        resume_run_id: ID of an interrupted run to continue: only its chats
+            that are not done yet are scraped, into the same run directory,
+            with the run's original selection and mode options
+        adaptive: If True, an AIMD controller varies the active workers
+            (min_workers..workers) and the delay between chats from page
+            latency, API errors, empty results and backoffs
 
     Returns:
         Path to the run directory containing results
     """
+    # Resuming: pick up the interrupted run's journal and options
+    resume_dir = None
+    resume_state = None
+    if resume_run_id:
+        resume_dir = find_run_dir(resume_run_id)
+        resume_state = RunJournal.load(resume_dir)
+        previous_config = resume_state.header.get("config", {})
+        date_filter = previous_config.get("date_filter", date_filter)
+        dry_run = previous_config.get("dry_run", dry_run)
+        incremental = previous_config.get("incremental", incremental)
+        longest_first = previous_config.get("longest_first", longest_first)
+        logger.info(f"Resuming {resume_dir.name}: {len(resume_state.unfinished)}/{len(resume_state.chat_order)} chats unfinished")
+
     # Initialize run logger
     config = {
         "date_filter": date_filter,
         "chat_limit": chat_limit if not dry_run else dry_run_limit,
         "dry_run": dry_run,
         "workers": workers,
-        "skip_existing": skip_existing
+        "skip_existing": skip_existing,
+        "incremental": incremental,
+        "changed_only": changed_only,
+        "longest_first": longest_first,
+        "fetch_mode": "direct" if client else "browser",
+        "adaptive": adaptive,
+        "min_workers": min_workers if adaptive else None
     }
+    if resume_state:
+        config = {
+            **resume_state.header.get("config", {}),
+            "workers": workers,
+            "fetch_mode": config["fetch_mode"],
+            "adaptive": adaptive,
+            "min_workers": config["min_workers"]
+        }
     run_type = "messages_dryrun" if dry_run else "messages"
-    run_logger = RunLogger(run_type, config)
+    run_logger = RunLogger(run_type, config, run_dir=resume_dir)
     run_logger.metadata = MessageScrapingRunMetadata(
         run_id=run_logger.run_id,
         run_type=run_type,
-        started_at=datetime.now(),
+        started_at=datetime.fromisoformat(resume_state.header["started_at"]) if resume_state and resume_state.header else datetime.now(),
         status="in_progress",
         config=config,
         date_filter=date_filter,
-        chat_limit=chat_limit
+        chat_limit=config.get("chat_limit") if resume_state else chat_limit
     )
+    journal = None
 
     try:
         # Load chat list from central database
         logger.info("Loading chat list from central database...")
-        chat_db = CentralChatDatabase()
+        chat_db = open_chat_database()
         all_chats_dict = chat_db.load()
 
         if not all_chats_dict:
@@ -444,49 +853,74 @@ async def scrape_chat_messages(
         all_chats = list(all_chats_dict.values())
         logger.info(f"Loaded {len(all_chats)} chats from central database")
 
-        # Apply date filter
-        filtered_chats = filter_chats_by_date(all_chats, date_filter)
-
         # Initialize message central DB early for skip-existing check
-        message_db = MessageCentralDB()
-
-        # Filter out existing chats if skip_existing is enabled
-        if skip_existing and not dry_run:
-            chats_before_skip = len(filtered_chats)
-            filtered_chats = [
-                chat for chat in filtered_chats
-                if not message_db.chat_exists(chat.id)
-            ]
-            skipped_count = chats_before_skip - len(filtered_chats)
-            logger.info(f"Skipped {skipped_count} existing chats (skip_existing mode)")
-
-        # Apply limit (dry run or user-specified)
-        if dry_run:
-            chats_to_scrape = filtered_chats[:dry_run_limit]
-        elif chat_limit:
-            chats_to_scrape = filtered_chats[:chat_limit]
+        message_db = open_message_database()
+
+        if resume_state:
+            # Chats the interrupted run had not finished, in its queue order
+            chats_to_scrape = [all_chats_dict[chat_id] for chat_id in resume_state.unfinished if chat_id in all_chats_dict]
+            run_logger.metadata.resumes = resume_state.resumes + 1
+            run_logger.metadata.scrapes_avoided = resume_state.header.get("scrapes_avoided", 0)
         else:
-            chats_to_scrape = filtered_chats
+            # Apply date filter
+            filtered_chats = filter_chats_by_date(all_chats, date_filter)
+
+            # Filter out existing chats if skip_existing is enabled
+            if skip_existing and not dry_run:
+                chats_before_skip = len(filtered_chats)
+                filtered_chats = [
+                    chat for chat in filtered_chats
+                    if not message_db.chat_exists(chat.id)
+                ]
+                skipped_count = chats_before_skip - len(filtered_chats)
+                logger.info(f"Skipped {skipped_count} existing chats (skip_existing mode)")
+
+            # Change detection: drop unchanged chats, prioritize the rest
+            if changed_only:
+                schedule = schedule_chats(filtered_chats, message_db)
+                filtered_chats = schedule.work_list
+                run_logger.metadata.scrapes_avoided = schedule.scrapes_avoided
+
+            # Apply limit (dry run or user-specified)
+            if dry_run:
+                chats_to_scrape = filtered_chats[:dry_run_limit]
+            elif chat_limit:
+                chats_to_scrape = filtered_chats[:chat_limit]
+            else:
+                chats_to_scrape = filtered_chats
 
         logger.info(f"Will scrape {len(chats_to_scrape)} chats with {workers} worker(s)")
 
-        # Initialize tracking
-        all_run_messages = []
+        # Initialize tracking (run messages are streamed, skipped in dry run)
+        output_file = None if dry_run else run_logger.run_dir / "messages.jsonl"
+        sink = RunMessageSink(output_file, truncate=resume_state is None)
+        writer = None if dry_run else AsyncMessageWriter(message_db)
         chat_statuses = []
-        humanization_tracker = HumanizationTracker()
 
-        # Create pages for workers
-        pages = [await context.new_page() for _ in range(workers)]
+        # Journal every chat's progress so an interrupted run can be resumed
+        journal = RunJournal(run_logger.run_dir)
+        if resume_state:
+            # Drop output of unfinished chats (they are scraped again) and keep
+            # the statuses of finished ones, so the run's totals stay cumulative
+            output_size = sink.restore(resume_state.stale_output_ranges, resume_state.output_size)
+            journal.resumed(output_size)
+            chat_statuses = [ChatScrapingStatus(**status) for status in resume_state.done_statuses]
+        else:
+            journal.start(
+                run_logger.run_id,
+                config,
+                [chat.id for chat in chats_to_scrape],
+                scrapes_avoided=run_logger.metadata.scrapes_avoided
+            )
+        humanization_tracker = HumanizationTracker()
 
-        # Pre-assign chats to workers (round-robin distribution)
-        worker_assignments = [[] for _ in range(workers)]
-        for idx, chat in enumerate(chats_to_scrape):
-            worker_id = idx % workers
-            worker_assignments[worker_id].append(chat)
+        # Create pages for workers (direct mode shares the API client instead)
+        pages = [None] * workers if client else [await context.new_page() for _ in range(workers)]
+        controller = build_controller(workers, min_workers, direct=client is not None) if adaptive else None
 
-        # Log assignment distribution
-        for worker_id, assigned in enumerate(worker_assignments):
-            logger.info(f"Worker {worker_id}: Assigned {len(assigned)} chats")
+        # Shared queue: idle workers pull the next chat, so one worker drawing
+        # a few very long chats doesn't hold up the others
+        work_queue = build_work_queue(chats_to_scrape, longest_first=longest_first)
 
         # Scrape with progress bar
         with Progress(
@@ -497,7 +931,7 @@ async def scrape_chat_messages(
             TimeElapsedColumn(),
         ) as progress:
             task = progress.add_task(
-                f"[cyan]Scraping with {workers} worker(s)...",
+                f"[cyan]Scraping with {'up to ' if adaptive else ''}{workers} worker(s)...",
                 total=len(chats_to_scrape)
             )
 
@@ -505,12 +939,19 @@ async def scrape_chat_messages(
             worker_tasks = [
                 scrape_worker(
                     worker_id=i,
-                    assigned_chats=worker_assignments[i],
+                    queue=work_queue,
+                    total_chats=len(chats_to_scrape),
                     page=pages[i],
                     message_db=message_db,
                     dry_run=dry_run,
                     progress=progress,
-                    progress_task=task
+                    progress_task=task,
+                    sink=sink,
+                    writer=writer,
+                    incremental=incremental,
+                    client=client,
+                    journal=journal,
+                    controller=controller
                 )
                 for i in range(workers)
             ]
@@ -524,17 +965,28 @@ async def scrape_chat_messages(
                     logger.error(f"Worker {worker_id} failed with exception: {result}")
                     continue
 
-                worker_messages, worker_statuses, worker_humanization = result
+                worker_statuses, worker_humanization = result
+                logger.info(f"Worker {worker_id}: Processed {len(worker_statuses)} chats")
 
                 # Merge results
-                all_run_messages.extend(worker_messages)
                 chat_statuses.extend(worker_statuses)
                 humanization_tracker.total_wait_time += worker_humanization.total_wait_time
                 humanization_tracker.session_breaks += worker_humanization.session_breaks
 
         # Close all pages
         for page in pages:
-            await page.close()
+            if page:
+                await page.close()
+
+        # Wait for queued DB updates; chats whose save failed count as failed
+        if writer:
+            await writer.close()
+            for status in chat_statuses:
+                if status.chat_id in writer.failed and status.status == "success":
+                    status.status = "failed"
+                    status.error = writer.failed[status.chat_id]
+                if status.chat_id in writer.save_seconds:
+                    status.phase_seconds["persist"] = round(writer.save_seconds[status.chat_id], 3)
 
         # Update metadata from aggregated results
         for status in chat_statuses:
@@ -542,9 +994,17 @@ async def scrape_chat_messages(
             if status.status == "success":
                 run_logger.metadata.chats_succeeded += 1
                 run_logger.metadata.total_messages_scraped += status.message_count
+                if status.reached_stored:
+                    run_logger.metadata.chats_reached_stored += 1
             elif status.status == "failed":
                 run_logger.metadata.chats_failed += 1
 
+        # Phase timing histograms
+        timings = PhaseHistogram()
+        for status in chat_statuses:
+            timings.add({**status.phase_seconds, "chat_total": status.duration_seconds})
+        run_logger.metadata.phase_timings = timings.summary()
+
         # Save chat statuses
         run_logger.metadata.chat_statuses = chat_statuses
         run_logger.metadata.humanization_stats.total_wait_time_seconds = humanization_tracker.total_wait_time
@@ -552,19 +1012,16 @@ async def scrape_chat_messages(
 
         # Generate quality report (on all messages from this run)
         logger.info("Generating data quality report...")
-        # Convert MessageItem to dict for quality analysis
-        messages_as_dicts = [msg.model_dump() for msg in all_run_messages]
-        quality_report = generate_quality_report(messages_as_dicts)
+        quality_report = sink.quality.report()
 
         quality_report_file = run_logger.run_dir / "data_quality_report.json"
         with open(quality_report_file, 'w', encoding='utf-8') as f:
             json.dump(quality_report.dict(), f, indent=2, ensure_ascii=False, default=str)
         run_logger.metadata.output_files.append(str(quality_report_file))
 
-        # Save run messages (skip in dry run)
-        if not dry_run:
-            output_file = run_logger.run_dir / "messages.jsonl"
-            save_to_jsonl(all_run_messages, output_file)
+        # Run messages were streamed to messages.jsonl as each chat finished
+        if output_file:
+            logger.success(f"Saved {sink.message_count} messages to {output_file}")
             run_logger.metadata.output_files.append(str(output_file))
 
         # Save scraping log
@@ -574,13 +1031,32 @@ async def scrape_chat_messages(
             "chats_succeeded": run_logger.metadata.chats_succeeded,
             "chats_failed": run_logger.metadata.chats_failed,
             "chats_skipped": run_logger.metadata.chats_skipped,
+            "chats_reached_stored": run_logger.metadata.chats_reached_stored,
+            "scrapes_avoided": run_logger.metadata.scrapes_avoided,
             "total_messages_scraped": run_logger.metadata.total_messages_scraped,
             "chat_statuses": [status.model_dump() for status in chat_statuses]
         }
+        if client:
+            scraping_log["direct_api"] = {
+                "requests": client.request_count,
+                "retries": client.retry_count,
+                "rate_limit_wait_seconds": round(client.rate_limiter.total_wait_time, 2)
+            }
+        if controller:
+            scraping_log["adaptive_concurrency"] = controller.summary()
+            logger.info(f"Adaptive concurrency: peak {controller.peak_workers} worker(s), "
+                        f"{controller.increases} increases, {controller.decreases} decreases")
         with open(scraping_log_file, 'w', encoding='utf-8') as f:
             json.dump(scraping_log, f, indent=2, ensure_ascii=False)
         run_logger.metadata.output_files.append(str(scraping_log_file))
 
+        # Save per-phase timing report
+        timing_report_file = run_logger.run_dir / "timing_report.json"
+        with open(timing_report_file, 'w', encoding='utf-8') as f:
+            json.dump(timings.report(total_key="chat_total"), f, indent=2, ensure_ascii=False)
+        run_logger.metadata.output_files.append(str(timing_report_file))
+        log_phase_timings(run_logger.metadata.phase_timings)
+
         # Save failed chats for retry (skip in dry run)
         failed_chats = [status for status in chat_statuses if status.status == "failed"]
         if failed_chats and not dry_run:
@@ -607,12 +1083,21 @@ async def scrape_chat_messages(
         if run_logger.metadata.chats_failed > 0:
             logger.warning(f"Chats failed: {run_logger.metadata.chats_failed} (saved to failed_chats.jsonl for retry)")
         logger.success(f"Total messages: {run_logger.metadata.total_messages_scraped}")
+        if changed_only:
+            logger.success(f"Scrapes avoided (unchanged chats): {run_logger.metadata.scrapes_avoided}")
         logger.success(f"Results saved to: {run_dir}")
         logger.success(f"{'='*60}")
 
+        journal.finish(status)
+        journal.close()
+
         return run_dir
 
     except Exception as e:
         logger.error(f"Message scraping failed: {e}")
+        if journal:
+            journal.finish("failed")
+            journal.close()
+            logger.info(f"Resume with: --resume {run_logger.run_id}")
         run_logger.finalize("failed")
         raise
@@ -0,0 +1,188 @@
+"""Adaptive (AIMD) concurrency control for message scraping workers.
+
+A fixed worker count and fixed delays are either too timid or too aggressive
+depending on how the site responds. The controller adjusts both from what the
+workers observe, like TCP congestion control:
+
+- Every chat that finishes cleanly counts toward an additive increase: after
+  `increase_after` clean chats one more worker is let in and the delay between
+  chats shrinks by `delay_step`.
+- A congestion signal (slow API pages, intercept errors, empty results,
+  timeouts/retries or a failed chat) halves the active workers and doubles the
+  delay. Chats that started before the last decrease don't trigger another
+  one, so a single incident isn't punished once per in-flight chat.
+
+All workers are started up front; those above the active count park until
+they are let in again.
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Dict, List, Optional
+from loguru import logger
+
+
+class AdaptiveConcurrency:
+    """AIMD controller for the number of active workers and the inter-chat delay."""
+
+    def __init__(
+        self,
+        max_workers: int,
+        min_workers: int = 1,
+        min_delay: float = 3.0,
+        max_delay: float = 30.0,
+        latency_target: float = 5.0,
+        initial_delay: Optional[float] = None,
+        increase_after: int = 3,
+        delay_step: float = 1.0
+    ):
+        """Initialize the controller at its lowest concurrency.
+
+        Args:
+            max_workers: Upper bound of active workers
+            min_workers: Lower bound of active workers
+            min_delay: Lower bound of the delay between a worker's chats (seconds)
+            max_delay: Upper bound of the delay between chats (seconds)
+            latency_target: Mean API page latency (seconds) above which a chat
+                counts as congested
+            initial_delay: Starting delay (default: min_delay)
+            increase_after: Clean chats needed for one additive increase
+            delay_step: Delay change per additive increase (seconds)
+        """
+        self.max_workers = max(1, max_workers)
+        self.min_workers = max(1, min(min_workers, self.max_workers))
+        self.min_delay = max(0.0, min_delay)
+        self.max_delay = max(self.min_delay, max_delay)
+        self.latency_target = latency_target
+        self.increase_after = max(1, increase_after)
+        self.delay_step = delay_step
+
+        self.active_workers = self.min_workers
+        self.delay = min(self.max_delay, max(self.min_delay, self.min_delay if initial_delay is None else initial_delay))
+
+        self.clean_streak = 0
+        self.increases = 0
+        self.decreases = 0
+        self.peak_workers = self.active_workers
+        self.history: List[Dict[str, Any]] = []  # One entry per adjustment
+
+        self._last_decrease_at = 0.0
+        self._closed = False
+        self._condition = asyncio.Condition()
+
+    async def wait_turn(self, worker_id: int) -> None:
+        """Park a worker until it is within the active count (or the run ends).
+
+        Args:
+            worker_id: Worker identifier (0-based)
+        """
+        async with self._condition:
+            await self._condition.wait_for(lambda: worker_id < self.active_workers or self._closed)
+
+    async def close(self) -> None:
+        """Release all parked workers (the queue is empty)."""
+        async with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def next_delay(self) -> float:
+        """Delay before a worker's next chat: the current delay with ±40% jitter."""
+        return self.delay * random.uniform(0.6, 1.4)
+
+    def congestion_reason(
+        self,
+        page_latency: Optional[float] = None,
+        errors: int = 0,
+        empty: bool = False,
+        backoffs: int = 0,
+        failed: bool = False
+    ) -> Optional[str]:
+        """Describe why a chat's signals count as congestion (None if clean)."""
+        if failed:
+            return "chat failed"
+        if errors:
+            return f"{errors} API intercept errors"
+        if empty:
+            return "empty result"
+        if backoffs:
+            return f"{backoffs} timeouts/retries"
+        if page_latency is not None and page_latency > self.latency_target:
+            return f"page latency {page_latency:.1f}s > {self.latency_target:.1f}s"
+        return None
+
+    async def record(
+        self,
+        started_at: float,
+        page_latency: Optional[float] = None,
+        errors: int = 0,
+        empty: bool = False,
+        backoffs: int = 0,
+        failed: bool = False
+    ) -> None:
+        """Feed one finished chat's signals to the controller.
+
+        Args:
+            started_at: time.time() when the chat was started
+            page_latency: Mean API page latency of the chat (seconds)
+            errors: API intercept errors
+            empty: Whether the chat came back empty after scrolling
+            backoffs: API timeouts (browser) or retried requests (direct)
+            failed: Whether the chat raised
+        """
+        reason = self.congestion_reason(page_latency, errors, empty, backoffs, failed)
+
+        async with self._condition:
+            if reason:
+                self.clean_streak = 0
+                if started_at < self._last_decrease_at:
+                    # Already backed off for this incident
+                    return
+                self._last_decrease_at = time.time()
+                self.decreases += 1
+                self.active_workers = max(self.min_workers, self.active_workers // 2)
+                self.delay = min(self.max_delay, max(self.delay * 2, self.delay_step))
+                self._log("decrease", reason)
+                return
+
+            self.clean_streak += 1
+            if self.clean_streak < self.increase_after:
+                return
+            self.clean_streak = 0
+            if self.active_workers >= self.max_workers and self.delay <= self.min_delay:
+                return
+
+            self.increases += 1
+            self.active_workers = min(self.max_workers, self.active_workers + 1)
+            self.delay = max(self.min_delay, self.delay - self.delay_step)
+            self.peak_workers = max(self.peak_workers, self.active_workers)
+            self._log("increase", f"{self.increase_after} clean chats")
+            self._condition.notify_all()
+
+    def _log(self, action: str, reason: str) -> None:
+        """Record and log an adjustment."""
+        self.history.append({
+            "at": time.time(),
+            "action": action,
+            "reason": reason,
+            "workers": self.active_workers,
+            "delay": round(self.delay, 2)
+        })
+        log = logger.warning if action == "decrease" else logger.info
+        log(f"Concurrency {action} ({reason}): {self.active_workers} worker(s), {self.delay:.1f}s between chats")
+
+    def summary(self) -> Dict[str, Any]:
+        """Controller settings, final state and adjustment history."""
+        return {
+            "min_workers": self.min_workers,
+            "max_workers": self.max_workers,
+            "min_delay": self.min_delay,
+            "max_delay": self.max_delay,
+            "latency_target": self.latency_target,
+            "final_workers": self.active_workers,
+            "peak_workers": self.peak_workers,
+            "final_delay": round(self.delay, 2),
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "history": self.history
+        }
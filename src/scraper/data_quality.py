@@ -1,7 +1,7 @@
 """Data quality validation and reporting."""
 
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import Iterable, List, Dict, Any, Optional
 from collections import Counter
 from pydantic import BaseModel, Field
 import statistics
@@ -504,3 +504,55 @@ def generate_quality_report(chats: List[Dict[str, Any]]) -> DataQualityReport:
     """Generate a comprehensive data quality report"""
     analyzer = DataQualityAnalyzer(chats)
     return analyzer.analyze()
+
+
+# Fields DataQualityAnalyzer reads (top-level and one level of nesting)
+QUALITY_FIELDS = [
+    'id', 'created_at', 'updated_at', 'last_message',
+    'new_message_count', 'provider_message_count',
+    'unlock', 'unlock_customer', 'is_favorite'
+]
+QUALITY_NESTED_FIELDS = {
+    'quote': ['price', 'is_hired'],
+    'service': ['title'],
+    'user': ['id', 'name', 'is_banned', 'is_dormant', 'is_leaved', 'is_active', 'is_certify_name']
+}
+
+
+def project_quality_fields(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a record to the fields the quality analyzer reads.
+
+    Long free-text fields are only checked for completeness, so last_message
+    is replaced by a marker that keeps it non-empty.
+    """
+    projected = {key: record[key] for key in QUALITY_FIELDS if key in record}
+    if projected.get('last_message'):
+        projected['last_message'] = True
+
+    for parent, keys in QUALITY_NESTED_FIELDS.items():
+        value = record.get(parent)
+        if isinstance(value, dict):
+            projected[parent] = {key: value[key] for key in keys if key in value}
+        elif parent in record:
+            projected[parent] = value
+
+    return projected
+
+
+class QualityAccumulator:
+    """Collects quality-relevant fields chunk by chunk for a final report.
+
+    Lets a run feed records as each chat finishes instead of holding the full
+    records until the end; only the small projected dicts are retained.
+    """
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+
+    def add(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Add a chunk of records (e.g. one chat's messages)."""
+        self.records.extend(project_quality_fields(record) for record in records)
+
+    def report(self) -> DataQualityReport:
+        """Generate the quality report over everything added so far."""
+        return generate_quality_report(self.records)
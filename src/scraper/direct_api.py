@@ -0,0 +1,247 @@
+"""Direct paginated access to the Soomgo API using the saved browser session.
+
+The browser scrapers render a page and scroll it just to make the site issue
+the chat list / message API calls they intercept. This module issues those
+calls itself: it loads the cookies written by save_session() into a Playwright
+APIRequestContext (a pooled HTTP client, no browser), follows each response's
+`next` cursor, and paces requests with a token bucket, so throughput is set by
+DIRECT_API_RATE instead of by rendering and humanization delays.
+
+Point SOOMGO_API_URL at a local server to run it against recorded responses.
+"""
+
+import asyncio
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import urlencode
+from playwright.async_api import async_playwright
+from loguru import logger
+
+from src import config
+from src.utils import exponential_backoff
+
+CHAT_LIST_PATH = "/api/v2.4/chats"
+MESSAGES_PATH = "/api/v2.2/chats/{chat_id}/messages"
+
+# Query parameter a bare (non-URL) `next` cursor is sent back in
+CHAT_LIST_CURSOR_PARAM = "cursor"
+MESSAGES_CURSOR_PARAM = "next"
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def cursor_request(
+    path: str,
+    cursor_param: str,
+    next_cursor: Any,
+    params: Optional[Dict[str, Any]] = None
+) -> Tuple[str, Dict[str, Any]]:
+    """Build the request for a page from the previous page's `next` value.
+
+    Args:
+        path: Endpoint path
+        cursor_param: Query parameter for bare cursors
+        next_cursor: Full URL (requested as is) or bare cursor
+        params: Query parameters of the first page
+
+    Returns:
+        (url, params) for get_json()
+    """
+    if isinstance(next_cursor, str) and next_cursor.startswith(("http://", "https://")):
+        return next_cursor, {}
+    return path, {**(params or {}), cursor_param: next_cursor}
+
+
+class DirectApiError(Exception):
+    """Raised when an API request fails and is not worth retrying."""
+
+
+class TokenBucket:
+    """Async token bucket: `rate` requests per second with bursts up to `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        """Initialize the bucket (full).
+
+        Args:
+            rate: Tokens added per second (<= 0: unlimited)
+            burst: Bucket capacity
+        """
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.total_wait_time = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Take one token, waiting until one is available."""
+        if self.rate <= 0:
+            return
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+                self.total_wait_time += wait
+                await asyncio.sleep(wait)
+
+
+class DirectApiClient:
+    """Rate-limited, retrying JSON client for the Soomgo API.
+
+    Use as an async context manager; one client (and its connection pool and
+    rate limit) is meant to be shared by all workers of a run.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        session_file=None,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        max_retries: int = 3,
+        retry_base_delay: float = 2.0,
+        timeout_ms: int = 30000
+    ):
+        """Initialize the client.
+
+        Args:
+            base_url: API origin (default: config.SOOMGO_API_URL)
+            session_file: Storage state saved by save_session (default:
+                config.SESSION_FILE; skipped if it does not exist)
+            rate: Requests per second (default: config.DIRECT_API_RATE)
+            burst: Requests allowed back to back (default: config.DIRECT_API_BURST)
+            max_retries: Retries for 429/5xx responses and network errors
+            retry_base_delay: Base delay of the exponential backoff in seconds
+            timeout_ms: Per-request timeout in milliseconds
+        """
+        self.base_url = (base_url or config.SOOMGO_API_URL).rstrip("/")
+        self.session_file = Path(session_file) if session_file else config.SESSION_FILE
+        self.rate_limiter = TokenBucket(
+            config.DIRECT_API_RATE if rate is None else rate,
+            config.DIRECT_API_BURST if burst is None else burst
+        )
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.timeout_ms = timeout_ms
+
+        self.request_count = 0
+        self.retry_count = 0
+        self._playwright = None
+        self._request = None
+
+    async def __aenter__(self) -> "DirectApiClient":
+        storage_state = str(self.session_file) if self.session_file.exists() else None
+        if storage_state is None:
+            logger.warning("No saved session found - direct API requests are unauthenticated")
+
+        self._playwright = await async_playwright().start()
+        self._request = await self._playwright.request.new_context(
+            base_url=self.base_url,
+            storage_state=storage_state,
+            extra_http_headers={"Accept": "application/json"}
+        )
+        logger.info(f"Direct API client ready ({self.base_url}, {self.rate_limiter.rate} req/s)")
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Dispose the connection pool."""
+        if self._request:
+            await self._request.dispose()
+            self._request = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """GET a JSON document, retrying rate limits and server errors.
+
+        Args:
+            url: Path relative to base_url, or an absolute URL
+            params: Query parameters
+
+        Returns:
+            Parsed response body
+
+        Raises:
+            DirectApiError: On a non-retryable status or when retries run out
+        """
+        if params:
+            url = f"{url}{'&' if '?' in url else '?'}{urlencode(params)}"
+
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire()
+            self.request_count += 1
+
+            try:
+                response = await self._request.get(url, timeout=self.timeout_ms, fail_on_status_code=False)
+            except Exception as e:
+                error = f"request failed: {e}"
+            else:
+                if response.ok:
+                    return await response.json()
+                if response.status not in RETRY_STATUSES:
+                    raise DirectApiError(f"GET {url} returned {response.status}")
+                error = f"status {response.status}"
+
+            if attempt == self.max_retries:
+                raise DirectApiError(f"GET {url} failed after {attempt + 1} attempts ({error})")
+
+            self.retry_count += 1
+            logger.warning(f"GET {url}: {error}, retrying")
+            await exponential_backoff(attempt, base_delay=self.retry_base_delay)
+
+    async def iter_pages(
+        self,
+        path: str,
+        cursor_param: str,
+        params: Optional[Dict[str, Any]] = None,
+        start: Any = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield API pages, following `next` until it is null.
+
+        `next` may be a full URL (requested as is) or a bare cursor (sent back
+        as `cursor_param`).
+
+        Args:
+            path: Endpoint path of the first page
+            cursor_param: Query parameter for bare cursors
+            params: Query parameters of the first page
+            start: `next` value to start from (resuming), instead of the first page
+
+        Yields:
+            Raw API response dictionaries
+        """
+        if start:
+            url, page_params = cursor_request(path, cursor_param, start, params)
+        else:
+            url, page_params = path, dict(params or {})
+
+        while True:
+            data = await self.get_json(url, page_params)
+            yield data
+
+            next_cursor = data.get("next")
+            if not next_cursor or not data.get("results"):
+                return
+
+            url, page_params = cursor_request(path, cursor_param, next_cursor, params)
+
+    def iter_chat_list_pages(self, start: Any = None) -> AsyncIterator[Dict[str, Any]]:
+        """Yield chat list pages, newest chats first (from cursor `start` if given)."""
+        return self.iter_pages(CHAT_LIST_PATH, CHAT_LIST_CURSOR_PARAM, start=start)
+
+    def iter_message_pages(self, chat_id: int) -> AsyncIterator[Dict[str, Any]]:
+        """Yield a chat's message pages, newest messages first."""
+        return self.iter_pages(MESSAGES_PATH.format(chat_id=chat_id), MESSAGES_CURSOR_PARAM)
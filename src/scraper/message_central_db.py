@@ -1,24 +1,181 @@
-"""Central database manager for per-chat message files."""
+"""Central database manager for per-chat message files.
+
+MessageStore is the interface shared with the other backends (see
+sqlite_store and segment_store).
+"""
 
 import json
+import os
+import threading
+from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from loguru import logger
 
 from src.models import MessageItem
 
 
-class MessageCentralDB:
-    """Manages per-chat message master files in data/messages/ directory."""
+# Chat list fields recorded with each save; the scheduler compares them with the
+# chat list to decide whether a chat changed since it was last scraped
+CHAT_STATE_FIELDS = ("chat_updated_at", "chat_last_message")
+
+
+def summarize_messages(messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the manifest summary for a chat's messages.
+
+    Args:
+        messages: Message dictionaries in chronological order
+
+    Returns:
+        Dictionary with message_count and first/last message id and created_at
+    """
+    first = messages[0] if messages else {}
+    last = messages[-1] if messages else {}
+    return {
+        "message_count": len(messages),
+        "first_message_id": first.get("id"),
+        "last_message_id": last.get("id"),
+        "first_created_at": first.get("created_at"),
+        "last_created_at": last.get("created_at")
+    }
+
+
+def chat_state_of(entry: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Extract the recorded chat state from a manifest entry.
+
+    Args:
+        entry: Manifest entry (or None)
+
+    Returns:
+        Dictionary of CHAT_STATE_FIELDS, or None if none were recorded
+    """
+    state = {key: entry[key] for key in CHAT_STATE_FIELDS if entry and entry.get(key) is not None}
+    return state or None
+
+
+class MessageStore(ABC):
+    """Interface shared by the message storage backends.
+
+    Backends implement storage access; merging, corpus iteration and counts
+    derived from the manifest are shared here.
+    """
+
+    @abstractmethod
+    def load_chat_messages(self, chat_id: int) -> Dict[int, MessageItem]:
+        """Load a chat's messages (message_id -> MessageItem)."""
+
+    @abstractmethod
+    def save_chat_messages(
+        self,
+        chat_id: int,
+        messages: Dict[int, MessageItem],
+        chat_state: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Replace a chat's messages, recording the chat state it was scraped at."""
+
+    @abstractmethod
+    def load_raw_messages(self, chat_id: int) -> List[Dict[str, Any]]:
+        """Load a chat's messages as plain dictionaries in chronological order."""
+
+    @abstractmethod
+    def list_chat_ids(self) -> List[int]:
+        """Sorted IDs of all chats that have stored messages."""
+
+    @abstractmethod
+    def chat_exists(self, chat_id: int) -> bool:
+        """Whether messages are stored for a chat."""
+
+    @abstractmethod
+    def get_manifest_entry(self, chat_id: int) -> Optional[Dict[str, Any]]:
+        """A chat's message count, first/last message and recorded chat state."""
+
+    @abstractmethod
+    def rebuild_manifest(self) -> int:
+        """Recompute all manifest entries, returning the number of chats."""
+
+    @abstractmethod
+    def get_stats(self) -> Dict:
+        """Statistics about all stored chat messages."""
+
+    def merge_and_update(
+        self,
+        chat_id: int,
+        existing: Dict[int, MessageItem],
+        new_messages: List[MessageItem]
+    ) -> tuple[Dict[int, MessageItem], int, int]:
+        """Merge new messages into existing messages for a chat.
+
+        Args:
+            chat_id: ID of the chat
+            existing: Current messages in database (message_id -> MessageItem)
+            new_messages: New messages from latest scraping run
+
+        Returns:
+            Tuple of (merged_messages, new_count, updated_count)
+        """
+        merged = existing.copy()
+        new_count = 0
+        updated_count = 0
+
+        for message in new_messages:
+            if message.id in merged:
+                # Message exists - update it (in case of edits or status changes)
+                merged[message.id] = message
+                updated_count += 1
+            else:
+                # New message - add it
+                merged[message.id] = message
+                new_count += 1
+
+        logger.info(f"Chat {chat_id}: {new_count} new, {updated_count} updated messages")
+        return merged, new_count, updated_count
+
+    def iter_chats(self) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """Iterate over every stored chat for corpus-wide passes.
+
+        Yields:
+            Tuples of (chat_id, message dictionaries)
+        """
+        for chat_id in self.list_chat_ids():
+            yield chat_id, self.load_raw_messages(chat_id)
+
+    def get_message_count(self, chat_id: int) -> int:
+        """Get the number of messages stored for a chat.
+
+        Args:
+            chat_id: ID of the chat
+
+        Returns:
+            Number of messages
+        """
+        entry = self.get_manifest_entry(chat_id)
+        return entry["message_count"] if entry else 0
+
+
+class MessageCentralDB(MessageStore):
+    """Manages per-chat message master files in data/messages/ directory.
 
-    def __init__(self, messages_dir: str = "data/messages"):
+    A manifest (manifest.jsonl, append-only, last entry per chat wins) keeps
+    each chat's message count, first/last message and the file size/mtime it
+    was computed from, so counts and stats don't need to read message files.
+    """
+
+    def __init__(self, messages_dir: str = "data/messages", manifest_compaction_threshold: int = 1000):
         """Initialize the message central database manager.
 
         Args:
             messages_dir: Path to the messages directory
+            manifest_compaction_threshold: Superseded manifest entries tolerated
+                before the manifest is rewritten
         """
         self.messages_dir = Path(messages_dir)
         self.messages_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.messages_dir / "manifest.jsonl"
+        self.manifest_compaction_threshold = manifest_compaction_threshold
+
+        self._manifest_lock = threading.RLock()
+        self._manifest: Optional[Dict[int, Dict[str, Any]]] = None
+        self._manifest_records = 0
 
     def get_chat_file_path(self, chat_id: int) -> Path:
         """Get the file path for a specific chat's messages.
@@ -70,45 +227,19 @@ class MessageCentralDB:
             logger.error(f"Error loading messages for chat {chat_id}: {e}")
             return messages
 
-    def merge_and_update(
+    def save_chat_messages(
         self,
         chat_id: int,
-        existing: Dict[int, MessageItem],
-        new_messages: List[MessageItem]
-    ) -> tuple[Dict[int, MessageItem], int, int]:
-        """Merge new messages into existing messages for a chat.
-
-        Args:
-            chat_id: ID of the chat
-            existing: Current messages in database (message_id -> MessageItem)
-            new_messages: New messages from latest scraping run
-
-        Returns:
-            Tuple of (merged_messages, new_count, updated_count)
-        """
-        merged = existing.copy()
-        new_count = 0
-        updated_count = 0
-
-        for message in new_messages:
-            if message.id in merged:
-                # Message exists - update it (in case of edits or status changes)
-                merged[message.id] = message
-                updated_count += 1
-            else:
-                # New message - add it
-                merged[message.id] = message
-                new_count += 1
-
-        logger.info(f"Chat {chat_id}: {new_count} new, {updated_count} updated messages")
-        return merged, new_count, updated_count
-
-    def save_chat_messages(self, chat_id: int, messages: Dict[int, MessageItem]) -> None:
+        messages: Dict[int, MessageItem],
+        chat_state: Optional[Dict[str, Any]] = None
+    ) -> None:
         """Save all messages for a specific chat.
 
         Args:
             chat_id: ID of the chat
             messages: Dictionary of message_id -> MessageItem to save
+            chat_state: Chat list state at scrape time (CHAT_STATE_FIELDS),
+                stored in the manifest as the chat's watermark
         """
         file_path = self.get_chat_file_path(chat_id)
 
@@ -127,55 +258,217 @@ class MessageCentralDB:
             # Atomic rename
             temp_path.replace(file_path)
 
+            # Manifest entry is stamped with the renamed file's size/mtime, so a
+            # crash before it is written is detected and repaired on next read
+            summary = summarize_messages([
+                {"id": m.id, "created_at": m.created_at} for m in sorted_messages
+            ])
+            self._record_manifest(chat_id, {**self._stamp(summary, file_path), **(chat_state or {})})
+
             logger.info(f"Saved {len(messages)} messages for chat {chat_id} to {file_path}")
 
         except Exception as e:
             logger.error(f"Error saving messages for chat {chat_id}: {e}")
             raise
 
-    def chat_exists(self, chat_id: int) -> bool:
-        """Check if messages file exists for a chat.
+    def load_raw_messages(self, chat_id: int) -> List[Dict[str, Any]]:
+        """Load a chat's messages as plain dictionaries (no model validation).
 
         Args:
             chat_id: ID of the chat
 
         Returns:
-            True if chat messages file exists
+            List of message dictionaries in stored (chronological) order
         """
-        return self.get_chat_file_path(chat_id).exists()
+        file_path = self.get_chat_file_path(chat_id)
+        if not file_path.exists():
+            return []
+
+        messages = []
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    messages.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return messages
+
+    def list_chat_ids(self) -> List[int]:
+        """List IDs of all chats that have stored messages.
 
-    def get_message_count(self, chat_id: int) -> int:
-        """Get the number of messages stored for a chat.
+        Returns:
+            Sorted list of chat IDs
+        """
+        return sorted(
+            int(chat_file.stem.replace("chat_", ""))
+            for chat_file in self.messages_dir.glob("chat_*.jsonl")
+        )
+
+    def chat_exists(self, chat_id: int) -> bool:
+        """Check if messages file exists for a chat.
 
         Args:
             chat_id: ID of the chat
 
         Returns:
-            Number of messages
+            True if chat messages file exists
         """
-        messages = self.load_chat_messages(chat_id)
-        return len(messages)
+        return self.get_chat_file_path(chat_id).exists()
 
     def get_stats(self) -> Dict:
-        """Get statistics about all stored chat messages.
+        """Get statistics about all stored chat messages from the manifest.
+
+        Reads no message files and does not list the directory unless the
+        manifest is missing and has to be rebuilt. Chat files added, edited
+        or removed outside save_chat_messages are picked up when accessed,
+        or by `rebuild-manifest`.
 
         Returns:
             Dictionary with stats about the message database
         """
-        chat_files = list(self.messages_dir.glob("chat_*.jsonl"))
-        total_chats = len(chat_files)
-        total_messages = 0
-
-        for chat_file in chat_files:
-            try:
-                with open(chat_file, 'r', encoding='utf-8') as f:
-                    message_count = sum(1 for line in f if line.strip())
-                    total_messages += message_count
-            except Exception as e:
-                logger.warning(f"Error reading {chat_file}: {e}")
+        with self._manifest_lock:
+            manifest = self._ensure_manifest()
+            total_chats = len(manifest)
+            total_messages = sum(entry["message_count"] for entry in manifest.values())
 
         return {
             "total_chats_with_messages": total_chats,
             "total_messages": total_messages,
             "avg_messages_per_chat": total_messages / total_chats if total_chats > 0 else 0
         }
+
+    # ===== Manifest =====
+
+    def _stamp(self, summary: Dict[str, Any], file_path: Path) -> Dict[str, Any]:
+        """Attach the file size/mtime a summary was computed from."""
+        stat = file_path.stat()
+        return {**summary, "file_size": stat.st_size, "file_mtime_ns": stat.st_mtime_ns}
+
+    def _summarize_file(self, chat_id: int) -> Optional[Dict[str, Any]]:
+        """Compute a chat's manifest entry from its message file."""
+        file_path = self.get_chat_file_path(chat_id)
+        try:
+            stat_before = file_path.stat()
+            entry = self._stamp(summarize_messages(self.load_raw_messages(chat_id)), file_path)
+        except FileNotFoundError:
+            return None
+        if entry["file_mtime_ns"] != stat_before.st_mtime_ns:
+            # File was replaced while reading; summarize the new version
+            return self._summarize_file(chat_id)
+        return entry
+
+    def _ensure_manifest(self) -> Dict[int, Dict[str, Any]]:
+        """Load the manifest on first use, rebuilding it if it is missing."""
+        if self._manifest is not None:
+            return self._manifest
+
+        if not self.manifest_path.exists():
+            self.rebuild_manifest()
+            return self._manifest
+
+        manifest: Dict[int, Dict[str, Any]] = {}
+        records = 0
+        with open(self.manifest_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn final line after a crash; the affected chat fails
+                    # validation and is re-summarized on access
+                    continue
+                records += 1
+                if entry.get("deleted"):
+                    manifest.pop(entry["chat_id"], None)
+                else:
+                    manifest[entry["chat_id"]] = entry
+
+        self._manifest = manifest
+        self._manifest_records = records
+        return manifest
+
+    def _write_manifest(self, manifest: Dict[int, Dict[str, Any]]) -> None:
+        """Atomically rewrite the manifest with one entry per chat."""
+        temp_path = self.manifest_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for chat_id in sorted(manifest):
+                f.write(json.dumps(manifest[chat_id]) + '\n')
+        temp_path.replace(self.manifest_path)
+
+        self._manifest = manifest
+        self._manifest_records = len(manifest)
+
+    def _record_manifest(self, chat_id: int, entry: Optional[Dict[str, Any]]) -> None:
+        """Durably record a chat's manifest entry (None removes the chat)."""
+        with self._manifest_lock:
+            manifest = self._ensure_manifest()
+            record = {"chat_id": chat_id, **entry} if entry else {"chat_id": chat_id, "deleted": True}
+
+            with open(self.manifest_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+            if entry:
+                manifest[chat_id] = record
+            else:
+                manifest.pop(chat_id, None)
+            self._manifest_records += 1
+
+            if self._manifest_records - len(manifest) > self.manifest_compaction_threshold:
+                self._write_manifest(manifest)
+
+    def rebuild_manifest(self) -> int:
+        """Rebuild the manifest by scanning every chat file.
+
+        Returns:
+            Number of chats in the manifest
+        """
+        with self._manifest_lock:
+            # Keep recorded chat states (scheduler watermarks) of known chats
+            previous = self._ensure_manifest() if self.manifest_path.exists() else {}
+            manifest = {}
+            for chat_id in self.list_chat_ids():
+                entry = self._summarize_file(chat_id)
+                if entry:
+                    manifest[chat_id] = {"chat_id": chat_id, **entry, **(chat_state_of(previous.get(chat_id)) or {})}
+            self._write_manifest(manifest)
+
+        logger.info(f"Rebuilt message manifest: {len(manifest)} chats")
+        return len(manifest)
+
+    def get_manifest_entry(self, chat_id: int) -> Optional[Dict[str, Any]]:
+        """Get a chat's manifest entry, repairing it if the file changed.
+
+        Args:
+            chat_id: ID of the chat
+
+        Returns:
+            Dictionary with message_count, first/last message id and created_at,
+            file_size, file_mtime_ns and any recorded CHAT_STATE_FIELDS, or None
+            if the chat has no messages file
+        """
+        with self._manifest_lock:
+            entry = self._ensure_manifest().get(chat_id)
+            file_path = self.get_chat_file_path(chat_id)
+
+            try:
+                stat = file_path.stat()
+            except FileNotFoundError:
+                if entry:
+                    self._record_manifest(chat_id, None)
+                return None
+
+            if entry and entry["file_size"] == stat.st_size and entry["file_mtime_ns"] == stat.st_mtime_ns:
+                return entry
+
+            # Missing or stale (file written outside save_chat_messages); the
+            # recorded chat state still describes the chat, so carry it over
+            fresh = self._summarize_file(chat_id)
+            if fresh and entry:
+                fresh.update(chat_state_of(entry) or {})
+            self._record_manifest(chat_id, fresh)
+            return self._ensure_manifest().get(chat_id)
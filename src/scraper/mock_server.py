@@ -0,0 +1,407 @@
+"""Local stand-in for the Soomgo API and chat pages.
+
+Serves a synthetic (or recorded) corpus in the exact ChatListResponse /
+MessageListResponse shapes, plus minimal /pro/chats pages whose infinite
+scroll issues those API calls the way the real site does, so both the browser
+scrapers and the direct API client can run and be timed without an account.
+
+Point SOOMGO_BASE_URL and SOOMGO_API_URL (or src.config at runtime) at
+MockSoomgoServer.base_url. Latency and error injection simulate a slow or
+flaky upstream.
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+from loguru import logger
+
+CHAT_LIST_PATH = "/api/v2.4/chats"
+MESSAGES_PATH_PATTERN = re.compile(r"^/api/v2\.2/chats/(\d+)/messages$")
+CHAT_PAGE_PATTERN = re.compile(r"^/pro/chats/(\d+)$")
+
+SERVICES = ["이사", "입주청소", "에어컨 청소", "인테리어", "과외", "웨딩 촬영", "PT", "도배"]
+ADDRESSES = [("서울", "강남구"), ("서울", "마포구"), ("경기", "성남시"), ("부산", "해운대구"), ("인천", "연수구")]
+
+CHAT_LIST_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Mock chat list</title>
+<style>.chat-item {{ height: 80px; border-bottom: 1px solid #ddd; }} .observer-container {{ height: 10px; }}</style>
+</head><body>
+<div class="chat-list"></div>
+<div class="observer-container"></div>
+<script>
+let next = "{api_url}{chat_list_path}";
+let loading = false;
+async function load() {{
+  if (loading || !next) return;
+  loading = true;
+  try {{
+    const response = await fetch(next, {{credentials: "include"}});
+    if (!response.ok) throw new Error(response.status);
+    const data = await response.json();
+    const list = document.querySelector(".chat-list");
+    for (const chat of data.results) {{
+      const item = document.createElement("div");
+      item.className = "chat-item";
+      item.textContent = chat.user.name + ": " + chat.last_message;
+      list.appendChild(item);
+    }}
+    next = data.next;
+  }} catch (error) {{
+    setTimeout(() => {{ loading = false; load(); }}, 500);
+    return;
+  }}
+  loading = false;
+}}
+new IntersectionObserver(entries => {{
+  if (entries.some(entry => entry.isIntersecting)) load();
+}}).observe(document.querySelector(".observer-container"));
+</script>
+</body></html>
+"""
+
+CHAT_PAGE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>Mock chat {chat_id}</title>
+<style>.chat-messages {{ height: 400px; overflow-y: auto; }} .message {{ height: 40px; }}</style>
+</head><body>
+<div class="chat-messages"></div>
+<script>
+const api = "{api_url}/api/v2.2/chats/{chat_id}/messages";
+const container = document.querySelector(".chat-messages");
+let cursor = null, done = false, loading = false;
+async function load() {{
+  if (loading || done) return;
+  loading = true;
+  try {{
+    const response = await fetch(cursor === null ? api : api + "?next=" + cursor, {{credentials: "include"}});
+    if (!response.ok) throw new Error(response.status);
+    const data = await response.json();
+    const heightBefore = container.scrollHeight;
+    for (const message of data.results) {{
+      const item = document.createElement("div");
+      item.className = "message";
+      item.textContent = message.message;
+      container.prepend(item);
+    }}
+    container.scrollTop = container.scrollHeight - heightBefore;
+    cursor = data.next;
+    done = cursor === null;
+  }} catch (error) {{
+    setTimeout(() => {{ loading = false; load(); }}, 500);
+    return;
+  }}
+  loading = false;
+}}
+container.addEventListener("scroll", () => {{ if (container.scrollTop === 0) load(); }});
+load();
+</script>
+</body></html>
+"""
+
+
+class MockCorpus:
+    """Chats (newest first) and each chat's messages (newest first)."""
+
+    def __init__(self, chats: List[Dict[str, Any]], messages: Dict[int, List[Dict[str, Any]]]):
+        self.chats = chats
+        self.messages = messages
+
+    @property
+    def message_count(self) -> int:
+        """Total messages over all chats."""
+        return sum(len(chat_messages) for chat_messages in self.messages.values())
+
+
+def _timestamp(value: datetime) -> str:
+    """Format a timestamp like the API does."""
+    return value.strftime("%Y-%m-%dT%H:%M:%S.%f") + "+09:00"
+
+
+def generate_corpus(
+    chat_count: int = 100,
+    messages_per_chat: Tuple[int, int] = (5, 60),
+    seed: int = 0,
+    start: datetime = datetime(2025, 1, 1, 9, 0, 0)
+) -> MockCorpus:
+    """Generate a deterministic synthetic corpus.
+
+    Chat and message records carry every field the models require, so they
+    validate as ChatItem / MessageItem and flow through quality reports.
+
+    Args:
+        chat_count: Number of chats
+        messages_per_chat: Inclusive (min, max) number of messages per chat
+        seed: Random seed (same seed, same corpus)
+        start: Creation time of the oldest chat
+
+    Returns:
+        MockCorpus
+    """
+    rng = random.Random(seed)
+    chats = []
+    messages: Dict[int, List[Dict[str, Any]]] = {}
+    next_message_id = 900000000
+
+    for index in range(chat_count):
+        chat_id = 150000000 + index
+        customer_id = 5000000 + index
+        provider_id = 1000
+        created_at = start + timedelta(hours=index * 3 + rng.randint(0, 2))
+
+        chat_messages = []
+        sent_at = created_at
+        provider_count = 0
+        for position in range(rng.randint(*messages_per_chat)):
+            sent_at += timedelta(minutes=rng.randint(1, 240))
+            from_provider = position % 2 == 1
+            provider_count += from_provider
+            next_message_id += 1
+            chat_messages.append({
+                "id": next_message_id,
+                "user": {
+                    "id": provider_id if from_provider else customer_id,
+                    "name": "고수" if from_provider else f"고객{index}",
+                    "profile_image": None
+                },
+                "type": "TEXT",
+                "own_type": "TEXT",
+                "message": f"{'견적 안내드립니다' if from_provider else '문의드립니다'} #{position}",
+                "is_receiver_read": True,
+                "created_at": _timestamp(sent_at)
+            })
+
+        province, city = rng.choice(ADDRESSES)
+        chats.append({
+            "id": chat_id,
+            "quote": {
+                "id": 70000000 + index,
+                "price": rng.randrange(50000, 2000000, 10000),
+                "is_hired": rng.random() < 0.2,
+                "is_instantmatch": False,
+                "is_extra_pro": False,
+                "unit": "총 비용",
+                "is_opened": True,
+                "is_reward": False
+            },
+            "user": {
+                "id": customer_id,
+                "address": f"{province} {city}",
+                "is_leaved": False,
+                "name": f"고객{index}",
+                "profile_image": None,
+                "is_certify_name": True,
+                "is_active": True,
+                "is_dormant": False,
+                "is_banned": False,
+                "is_soomgo_leaved": False
+            },
+            "service": {"title": rng.choice(SERVICES)},
+            "request": {
+                "id": 80000000 + index,
+                "is_targeted": False,
+                "object_id": f"{rng.getrandbits(96):024x}",
+                "address": {"address1": province, "address2": city}
+            },
+            "is_favorite": False,
+            "last_message_type": "TEXT",
+            "last_message": chat_messages[-1]["message"] if chat_messages else "",
+            "created_at": _timestamp(created_at),
+            "updated_at": _timestamp(sent_at),
+            "escrow": None,
+            "new_message_count": 0,
+            "unlock": True,
+            "unlock_customer": True,
+            "role": "provider",
+            "is_induce_customer": False,
+            "safe_payment": None,
+            "provider_message_count": provider_count,
+            "notification_status": True
+        })
+        messages[chat_id] = list(reversed(chat_messages))
+
+    chats.sort(key=lambda chat: chat["updated_at"], reverse=True)
+    return MockCorpus(chats, messages)
+
+
+def load_recorded_corpus(chat_db, message_db, limit: Optional[int] = None) -> MockCorpus:
+    """Build a corpus from previously scraped chats and messages.
+
+    Args:
+        chat_db: Chat database (see open_chat_database)
+        message_db: Message database (see open_message_database)
+        limit: Serve only the newest N chats
+
+    Returns:
+        MockCorpus
+    """
+    chats = sorted(
+        (chat.model_dump(mode="json") for chat in chat_db.load().values()),
+        key=lambda chat: chat["updated_at"],
+        reverse=True
+    )[:limit]
+    messages = {chat["id"]: list(reversed(message_db.load_raw_messages(chat["id"]))) for chat in chats}
+    return MockCorpus(chats, messages)
+
+
+class MockSoomgoServer:
+    """Threaded HTTP server serving a corpus like the Soomgo API and pages."""
+
+    def __init__(
+        self,
+        corpus: MockCorpus,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        chat_page_size: int = 20,
+        message_page_size: int = 30,
+        latency_ms: float = 0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 0
+    ):
+        """Initialize the server (call start() or use as a context manager).
+
+        Args:
+            corpus: Chats and messages to serve
+            host: Interface to bind
+            port: Port to bind (0: pick a free port)
+            chat_page_size: Chats per chat list page
+            message_page_size: Messages per message page (>= 10 so a page
+                overflows the mock chat page and scrolling keeps working)
+            latency_ms: Delay added to every API response
+            error_rate: Fraction of API requests answered with error_status
+            error_status: Status code of injected errors
+            seed: Seed for error injection
+        """
+        self.corpus = corpus
+        self.chat_page_size = chat_page_size
+        self.message_page_size = message_page_size
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+        self.request_count = 0
+        self.error_count = 0
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        """Origin the pages and API are served from."""
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockSoomgoServer":
+        """Serve on a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-soomgo", daemon=True)
+        self._thread.start()
+        logger.info(f"Mock Soomgo server on {self.base_url} ({len(self.corpus.chats)} chats, {self.corpus.message_count} messages)")
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "MockSoomgoServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def _inject_error(self) -> bool:
+        """Count an API request and decide whether it fails."""
+        with self._rng_lock:
+            self.request_count += 1
+            if self.error_rate > 0 and self._rng.random() < self.error_rate:
+                self.error_count += 1
+                return True
+            return False
+
+    def chat_list_page(self, cursor: int) -> Dict[str, Any]:
+        """Build a ChatListResponse page starting at offset `cursor`."""
+        end = cursor + self.chat_page_size
+        has_next = end < len(self.corpus.chats)
+        return {
+            "next": f"{self.base_url}{CHAT_LIST_PATH}?cursor={end}" if has_next else None,
+            "cursor": str(cursor),
+            "results": self.corpus.chats[cursor:end],
+            "escrow_events_meta": []
+        }
+
+    def message_page(self, chat_id: int, cursor: int) -> Optional[Dict[str, Any]]:
+        """Build a MessageListResponse page starting at offset `cursor` (None: unknown chat)."""
+        if chat_id not in self.corpus.messages:
+            return None
+        chat_messages = self.corpus.messages[chat_id]
+        end = cursor + self.message_page_size
+        return {
+            "prev": cursor or None,
+            "next": end if end < len(chat_messages) else None,
+            "results": chat_messages[cursor:end]
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+
+                if url.path == "/pro/chats":
+                    return self._send_html(CHAT_LIST_PAGE.format(api_url=server.base_url, chat_list_path=CHAT_LIST_PATH))
+                chat_page = CHAT_PAGE_PATTERN.match(url.path)
+                if chat_page:
+                    return self._send_html(CHAT_PAGE.format(api_url=server.base_url, chat_id=chat_page.group(1)))
+
+                messages_path = MESSAGES_PATH_PATTERN.match(url.path)
+                if url.path != CHAT_LIST_PATH and not messages_path:
+                    return self._send_json(404, {"detail": "Not found."})
+
+                if server.latency_ms:
+                    time.sleep(server.latency_ms / 1000)
+                if server._inject_error():
+                    return self._send_json(server.error_status, {"detail": "Injected error."})
+
+                try:
+                    cursor_param = "cursor" if url.path == CHAT_LIST_PATH else "next"
+                    cursor = int(query.get(cursor_param, ["0"])[0])
+                except ValueError:
+                    return self._send_json(400, {"detail": "Invalid cursor."})
+
+                if url.path == CHAT_LIST_PATH:
+                    return self._send_json(200, server.chat_list_page(cursor))
+                page = server.message_page(int(messages_path.group(1)), cursor)
+                if page is None:
+                    return self._send_json(404, {"detail": "Not found."})
+                return self._send_json(200, page)
+
+            def _send_json(self, status: int, body: Dict[str, Any]):
+                self._send(status, "application/json", json.dumps(body, ensure_ascii=False))
+
+            def _send_html(self, body: str):
+                self._send(200, "text/html; charset=utf-8", body)
+
+            def _send(self, status: int, content_type: str, body: str):
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
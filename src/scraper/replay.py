@@ -0,0 +1,150 @@
+"""Offline replay of saved chat list API responses.
+
+Every chat list run stores its raw API pages in
+data/runs/<run>/api_responses.jsonl.gz (older runs: api_responses/*.json). Replaying them through the same ingest path the
+scraper uses (ChatListTracker -> ChatItem -> merge_and_update -> append) rebuilds
+the master chat list or recomputes quality reports without a browser, and
+because the input is fixed it doubles as a deterministic ingest benchmark.
+
+Message API responses are not saved by the message scraper, so only chat list
+runs can be replayed.
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+from loguru import logger
+
+from src.models import ChatItem
+from src.utils import ChatListTracker
+from src.scraper.central_db import ChatStore
+from src.scraper.data_quality import generate_quality_report
+from src.scraper.response_archive import has_saved_responses, iter_run_responses
+
+
+def find_replayable_runs(runs_dir: str = "data/runs") -> List[Path]:
+    """Find chat list runs with saved API responses, oldest first.
+
+    Args:
+        runs_dir: Directory holding run directories
+
+    Returns:
+        Run directories sorted by name (timestamp prefix)
+    """
+    runs_path = Path(runs_dir)
+    if not runs_path.exists():
+        return []
+
+    return sorted(
+        run_dir for run_dir in runs_path.iterdir()
+        if run_dir.is_dir()
+        and "_chat_list_" in run_dir.name
+        and has_saved_responses(run_dir)
+    )
+
+
+def iter_saved_responses(run_dir: Path) -> Iterator[Dict[str, Any]]:
+    """Yield a run's saved API responses in capture order.
+
+    Args:
+        run_dir: Run directory
+
+    Yields:
+        Raw API response dictionaries
+    """
+    for _, response in iter_run_responses(run_dir):
+        yield response
+
+
+def replay_chat_list_runs(
+    run_dirs: List[Path],
+    chat_db: ChatStore,
+    write: bool = True,
+    start_empty: bool = False,
+    write_quality_reports: bool = False
+) -> Dict[str, Any]:
+    """Replay saved chat list runs through the ingest path.
+
+    Runs are applied in the given order, each merged on top of the previous
+    state, exactly as if they had been scraped again.
+
+    Args:
+        run_dirs: Run directories to replay (oldest first)
+        chat_db: Chat database to merge into
+        write: Append changed chats to chat_db (False: merge in memory only)
+        start_empty: Ignore the database's current contents; with write=False
+            this makes the replay a deterministic benchmark of the ingest path
+        write_quality_reports: Rewrite each run's data_quality_report.json
+
+    Returns:
+        Dictionary with per-run results, totals and timings
+    """
+    started = time.perf_counter()
+    existing: Dict[int, ChatItem] = {} if start_empty else chat_db.load()
+    load_seconds = time.perf_counter() - started
+
+    totals = {"responses": 0, "chats": 0, "new": 0, "updated": 0, "written": 0}
+    timings = {"load": load_seconds, "parse": 0.0, "merge": 0.0, "write": 0.0, "quality": 0.0}
+    runs = []
+
+    for run_dir in run_dirs:
+        # Parse: same tracker the scraper feeds from intercepted responses
+        phase_start = time.perf_counter()
+        tracker = ChatListTracker()
+        responses = 0
+        for response in iter_saved_responses(run_dir):
+            tracker.add_chats_from_response(response)
+            responses += 1
+        chat_items = [ChatItem(**chat) for chat in tracker.all_chats]
+        timings["parse"] += time.perf_counter() - phase_start
+
+        # Merge into the running state
+        phase_start = time.perf_counter()
+        changed = chat_db.changed_chats(existing, chat_items)
+        existing, new_count, updated_count = chat_db.merge_and_update(existing, chat_items)
+        timings["merge"] += time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
+        if write:
+            chat_db.append(changed)
+        timings["write"] += time.perf_counter() - phase_start
+
+        if write_quality_reports:
+            phase_start = time.perf_counter()
+            quality_report = generate_quality_report(tracker.all_chats)
+            with open(run_dir / "data_quality_report.json", 'w', encoding='utf-8') as f:
+                json.dump(quality_report.dict(), f, indent=2, ensure_ascii=False, default=str)
+            timings["quality"] += time.perf_counter() - phase_start
+
+        runs.append({
+            "run": run_dir.name,
+            "responses": responses,
+            "chats": len(chat_items),
+            "duplicates": tracker.duplicate_count,
+            "new": new_count,
+            "updated": updated_count,
+            "written": len(changed)
+        })
+        totals["responses"] += responses
+        totals["chats"] += len(chat_items)
+        totals["new"] += new_count
+        totals["updated"] += updated_count
+        totals["written"] += len(changed)
+        logger.info(f"Replayed {run_dir.name}: {responses} responses, {len(chat_items)} chats, {len(changed)} changed")
+
+    total_seconds = time.perf_counter() - started
+    result = {
+        "runs": runs,
+        "totals": totals,
+        "total_chats_in_db": len(existing),
+        "timings_seconds": {name: round(seconds, 4) for name, seconds in timings.items()},
+        "total_seconds": round(total_seconds, 4),
+        "chats_per_second": round(totals["chats"] / total_seconds, 1) if total_seconds > 0 else None
+    }
+
+    logger.success(
+        f"Replayed {len(runs)} runs: {totals['chats']} chats from {totals['responses']} responses "
+        f"in {total_seconds:.2f}s ({result['chats_per_second']} chats/s)"
+    )
+    return result
@@ -0,0 +1,195 @@
+"""Compressed, batched archive of a run's raw API responses.
+
+Runs used to save every API page as its own pretty-printed
+api_responses/response_NNN.json, leaving thousands of small files per full
+run. The archive appends them to a single gzip-compressed JSONL stream
+(api_responses.jsonl.gz) instead, one `{"index": n, "response": {...}}` record
+per line:
+
+- Records are buffered and written `batch_size` at a time, each batch as its
+  own gzip member (concatenated members are a valid gzip stream), then
+  fsynced. A crash can only lose the unflushed batch or tear the last member,
+  which the reader skips.
+- Indices are strictly increasing; truncate() drops records past a checkpoint
+  before a resumed run appends them again.
+
+The reader also understands the old per-file layout, so existing runs stay
+replayable; pack_run_responses() converts them.
+"""
+
+import gzip
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from loguru import logger
+
+ARCHIVE_FILE = "api_responses.jsonl.gz"
+LEGACY_DIR = "api_responses"
+
+
+def _encode(index: int, response: Dict[str, Any]) -> bytes:
+    """One archive line."""
+    return (json.dumps({"index": index, "response": response}, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+class ResponseArchive:
+    """Appends a run's API responses to its compressed archive."""
+
+    def __init__(self, path: Path, batch_size: int = 20):
+        """Open (or continue) an archive.
+
+        Args:
+            path: Archive file (usually run_dir / ARCHIVE_FILE)
+            batch_size: Responses buffered per compressed batch
+        """
+        self.path = Path(path)
+        self.batch_size = max(1, batch_size)
+        self._buffer: List[bytes] = []
+
+    def append(self, index: int, response: Dict[str, Any]) -> None:
+        """Add a response; the batch is written once it is full.
+
+        Args:
+            index: Capture order of the response (1-based, increasing)
+            response: Raw API response
+        """
+        self._buffer.append(_encode(index, response))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered responses as one gzip member and make them durable."""
+        if not self._buffer:
+            return
+        with open(self.path, 'ab') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='wb', mtime=0) as gz:
+                gz.write(b''.join(self._buffer))
+            raw.flush()
+            os.fsync(raw.fileno())
+        self._buffer = []
+
+    def close(self) -> None:
+        """Flush remaining responses."""
+        self.flush()
+
+    def truncate(self, max_index: int) -> int:
+        """Drop records past `max_index` (and any torn tail) before resuming.
+
+        Args:
+            max_index: Last response index to keep
+
+        Returns:
+            Number of records kept
+        """
+        self.flush()
+        if not self.path.exists():
+            return 0
+
+        temp_path = self.path.with_suffix('.tmp')
+        kept = ResponseArchive(temp_path, batch_size=500)
+        count = 0
+        for index, response in iter_archive(self.path):
+            if index <= max_index:
+                kept.append(index, response)
+                count += 1
+        kept.close()
+
+        if count:
+            os.replace(temp_path, self.path)
+        else:
+            self.path.unlink()
+        return count
+
+
+def iter_archive(path: Path) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (index, response) records of an archive in write order.
+
+    A torn last batch (crash mid-write) ends the iteration with a warning.
+
+    Args:
+        path: Archive file
+
+    Yields:
+        (index, raw API response) tuples
+    """
+    try:
+        with gzip.open(path, 'rb') as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping unreadable record {line_number} in {path}")
+                    continue
+                yield record["index"], record["response"]
+    except (EOFError, gzip.BadGzipFile, zlib.error) as e:
+        logger.warning(f"Archive {path} ends in a torn batch, ignoring the rest: {e}")
+
+
+def _iter_legacy(response_dir: Path) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (index, response) from per-file response_NNN.json responses."""
+    response_files = sorted(
+        response_dir.glob("response_*.json"),
+        key=lambda path: int(path.stem.replace("response_", ""))
+    )
+    for response_file in response_files:
+        try:
+            with open(response_file, 'r', encoding='utf-8') as f:
+                yield int(response_file.stem.replace("response_", "")), json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Skipping unreadable response {response_file}: {e}")
+
+
+def iter_run_responses(run_dir: Path, max_index: Optional[int] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield a run's saved API responses in capture order, from either layout.
+
+    Args:
+        run_dir: Run directory
+        max_index: Stop after this response index (None: all)
+
+    Yields:
+        (index, raw API response) tuples
+    """
+    archive_path = Path(run_dir) / ARCHIVE_FILE
+    source = iter_archive(archive_path) if archive_path.exists() else _iter_legacy(Path(run_dir) / LEGACY_DIR)
+    for index, response in source:
+        if max_index is not None and index > max_index:
+            break
+        yield index, response
+
+
+def has_saved_responses(run_dir: Path) -> bool:
+    """Whether a run has saved API responses in either layout."""
+    run_dir = Path(run_dir)
+    return (run_dir / ARCHIVE_FILE).exists() or any((run_dir / LEGACY_DIR).glob("response_*.json"))
+
+
+def pack_run_responses(run_dir: Path, remove: bool = True) -> int:
+    """Convert a run's per-file responses into its archive.
+
+    Args:
+        run_dir: Run directory
+        remove: Delete the response files (and their directory, if empty) afterwards
+
+    Returns:
+        Number of responses packed (0 if the run has no per-file responses)
+    """
+    run_dir = Path(run_dir)
+    response_dir = run_dir / LEGACY_DIR
+    if (run_dir / ARCHIVE_FILE).exists() or not response_dir.exists():
+        return 0
+
+    archive = ResponseArchive(run_dir / ARCHIVE_FILE, batch_size=500)
+    count = 0
+    for index, response in _iter_legacy(response_dir):
+        archive.append(index, response)
+        count += 1
+    archive.close()
+
+    if remove and count:
+        for response_file in response_dir.glob("response_*.json"):
+            response_file.unlink()
+        if not any(response_dir.iterdir()):
+            response_dir.rmdir()
+    return count
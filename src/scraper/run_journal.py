@@ -0,0 +1,189 @@
+"""Durable per-run journal for message scraping runs.
+
+Every state change of every chat in a run is appended to the run's
+journal.jsonl and fsynced before the run moves on:
+
+    queued -> in_flight -> scraped -> done
+                                   \\-> failed
+
+`scraped` means the chat's messages were streamed to the run's messages.jsonl
+(the byte range is recorded) and the database save is pending; `done` is only
+written once the save finished, together with the chat's new watermark. A run
+that dies can therefore be resumed from its journal: every chat that is not
+`done` is scraped again, and records of unfinished chats are cut out of
+messages.jsonl first so nothing is written twice.
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Tuple
+from loguru import logger
+
+JOURNAL_FILE = "journal.jsonl"
+
+CHAT_STATES = ("queued", "in_flight", "scraped", "done", "failed")
+
+
+def find_run_dir(run_id: str, runs_dir: str = "data/runs") -> Path:
+    """Find a message run's directory by run ID (or directory name).
+
+    Args:
+        run_id: Short run ID (directory suffix) or full directory name
+        runs_dir: Directory holding run directories
+
+    Returns:
+        Run directory
+
+    Raises:
+        FileNotFoundError: If no run with a journal matches
+    """
+    runs_path = Path(runs_dir)
+    candidates = [runs_path / run_id] + sorted(runs_path.glob(f"*_messages*_{run_id}"))
+    for run_dir in candidates:
+        if (run_dir / JOURNAL_FILE).exists():
+            return run_dir
+    raise FileNotFoundError(f"No message run with a journal found for '{run_id}' in {runs_dir}")
+
+
+class JournalState:
+    """State of a run reconstructed from its journal."""
+
+    def __init__(self):
+        self.header: Dict[str, Any] = {}
+        self.chat_order: List[int] = []  # Queue order
+        self.chats: Dict[int, Dict[str, Any]] = {}  # chat_id -> latest event
+        self.output_ranges: Dict[int, Tuple[int, int]] = {}  # chat_id -> latest messages.jsonl byte range
+        self.output_size = 0  # messages.jsonl bytes accounted for by the journal
+        self.resumes = 0
+
+    @property
+    def unfinished(self) -> List[int]:
+        """Chats not done yet, in queue order."""
+        return [chat_id for chat_id in self.chat_order if self.chats[chat_id]["state"] != "done"]
+
+    @property
+    def done_statuses(self) -> List[Dict[str, Any]]:
+        """Recorded ChatScrapingStatus of every done chat."""
+        return [
+            self.chats[chat_id]["status"] for chat_id in self.chat_order
+            if self.chats[chat_id]["state"] == "done" and self.chats[chat_id].get("status")
+        ]
+
+    @property
+    def stale_output_ranges(self) -> List[Tuple[int, int]]:
+        """messages.jsonl byte ranges written for chats that are not done."""
+        return sorted(
+            output_range for chat_id, output_range in self.output_ranges.items()
+            if self.chats[chat_id]["state"] != "done"
+        )
+
+
+class RunJournal:
+    """Append-only, fsynced journal of a message scraping run."""
+
+    def __init__(self, run_dir: Path):
+        """Open (or create) the journal of a run.
+
+        Args:
+            run_dir: Run directory
+        """
+        self.path = Path(run_dir) / JOURNAL_FILE
+        torn = False
+        if self.path.exists() and self.path.stat().st_size > 0:
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b'\n'
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if torn:
+            # Keep the next event off a line torn by a crash
+            self._file.write('\n')
+
+    def _write(self, events: Iterable[Dict[str, Any]]) -> None:
+        """Append events and make them durable."""
+        if self._file.closed:
+            # Late callbacks of a failed run segment; the journal is already final
+            return
+        self._file.write(''.join(json.dumps(event, ensure_ascii=False) + '\n' for event in events))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def start(self, run_id: str, config: Dict[str, Any], chat_ids: List[int], **fields: Any) -> None:
+        """Record the run header and queue its chats.
+
+        Args:
+            run_id: Run ID
+            config: Run configuration
+            chat_ids: Chats to scrape, in queue order
+            **fields: Extra header fields restored on resume
+        """
+        now = datetime.now().isoformat()
+        self._write(
+            [{"event": "run", "run_id": run_id, "started_at": now, "config": config, **fields}]
+            + [{"event": "chat", "chat_id": chat_id, "state": "queued", "at": now} for chat_id in chat_ids]
+        )
+
+    def resumed(self, output_size: int) -> None:
+        """Record a resume (messages.jsonl was rewritten to output_size bytes)."""
+        self._write([{"event": "resume", "at": datetime.now().isoformat(), "output_size": output_size}])
+
+    def record(self, chat_id: int, state: str, **fields: Any) -> None:
+        """Record a chat's state change.
+
+        Args:
+            chat_id: ID of the chat
+            state: One of CHAT_STATES
+            **fields: Extra fields (status, watermark, output_range, error)
+        """
+        if state not in CHAT_STATES:
+            raise ValueError(f"Unknown chat state: {state}")
+        self._write([{"event": "chat", "chat_id": chat_id, "state": state, "at": datetime.now().isoformat(), **fields}])
+
+    def finish(self, status: str) -> None:
+        """Record the end of a run segment."""
+        self._write([{"event": "finish", "status": status, "at": datetime.now().isoformat()}])
+
+    def close(self) -> None:
+        """Close the journal file."""
+        self._file.close()
+
+    @staticmethod
+    def load(run_dir: Path) -> JournalState:
+        """Rebuild a run's state from its journal.
+
+        A torn last line (crash mid-write) is ignored.
+
+        Args:
+            run_dir: Run directory
+
+        Returns:
+            JournalState
+        """
+        state = JournalState()
+        with open(Path(run_dir) / JOURNAL_FILE, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Ignoring unreadable journal line {line_number}")
+                    continue
+
+                kind = event.get("event")
+                if kind == "run":
+                    state.header = event
+                elif kind == "resume":
+                    # Earlier byte ranges refer to the file before the rewrite
+                    state.resumes += 1
+                    state.output_ranges.clear()
+                    state.output_size = event["output_size"]
+                elif kind == "chat":
+                    chat_id = event["chat_id"]
+                    if chat_id not in state.chats:
+                        state.chat_order.append(chat_id)
+                    state.chats[chat_id] = {**state.chats.get(chat_id, {}), **event}
+                    if event.get("output_range"):
+                        start, end = event["output_range"]
+                        state.output_ranges[chat_id] = (start, end)
+                        state.output_size = max(state.output_size, end)
+        return state
@@ -0,0 +1,120 @@
+"""Change-detection scheduler for message scraping.
+
+Each saved chat records the chat list state it was scraped at (updated_at and
+last_message) in the message manifest. Comparing that watermark with the
+current chat list tells which chats actually changed, so a run only revisits
+those plus chats that were never scraped.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from loguru import logger
+
+from src.models import ChatItem
+from src.scraper.message_central_db import MessageStore
+
+
+def chat_state(chat: ChatItem) -> Dict[str, Any]:
+    """Get the chat list state recorded as a chat's scrape watermark.
+
+    Args:
+        chat: Chat from the master chat list
+
+    Returns:
+        Dictionary of CHAT_STATE_FIELDS
+    """
+    return {"chat_updated_at": chat.updated_at, "chat_last_message": chat.last_message}
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an API timestamp, returning None if it is missing or invalid."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def _sort_key(chat: ChatItem) -> str:
+    """Sort key for newest-first ordering by updated_at."""
+    return chat.updated_at or ""
+
+
+def is_chat_changed(chat: ChatItem, entry: Dict[str, Any]) -> bool:
+    """Check whether a chat changed since its messages were last saved.
+
+    Args:
+        chat: Chat from the master chat list
+        entry: Manifest entry of the chat's stored messages
+
+    Returns:
+        True if the chat should be scraped again
+    """
+    if entry.get("chat_updated_at") is not None:
+        return (
+            chat.updated_at != entry["chat_updated_at"]
+            or chat.last_message != entry.get("chat_last_message")
+        )
+
+    # Saved before watermarks were recorded: fall back to the newest stored
+    # message and rescrape when in doubt
+    updated_at = _parse_timestamp(chat.updated_at)
+    last_created_at = _parse_timestamp(entry.get("last_created_at"))
+    if updated_at is None or last_created_at is None:
+        return True
+    try:
+        return updated_at > last_created_at
+    except TypeError:
+        # Naive vs aware timestamps
+        return True
+
+
+class ScrapeSchedule:
+    """Prioritized work list built from the chat list and stored watermarks."""
+
+    def __init__(self):
+        self.changed: List[ChatItem] = []
+        self.never_scraped: List[ChatItem] = []
+        self.unchanged: List[ChatItem] = []
+
+    @property
+    def work_list(self) -> List[ChatItem]:
+        """Chats to scrape: changed chats newest first, then never-scraped chats."""
+        return self.changed + self.never_scraped
+
+    @property
+    def scrapes_avoided(self) -> int:
+        """Number of unchanged chats skipped."""
+        return len(self.unchanged)
+
+
+def schedule_chats(chats: List[ChatItem], message_db: MessageStore) -> ScrapeSchedule:
+    """Split chats into changed, never-scraped and unchanged.
+
+    Args:
+        chats: Candidate chats from the master chat list
+        message_db: Message database holding the per-chat watermarks
+
+    Returns:
+        ScrapeSchedule with both scrape groups sorted newest first
+    """
+    schedule = ScrapeSchedule()
+
+    for chat in chats:
+        entry = message_db.get_manifest_entry(chat.id)
+        if entry is None:
+            schedule.never_scraped.append(chat)
+        elif is_chat_changed(chat, entry):
+            schedule.changed.append(chat)
+        else:
+            schedule.unchanged.append(chat)
+
+    schedule.changed.sort(key=_sort_key, reverse=True)
+    schedule.never_scraped.sort(key=_sort_key, reverse=True)
+
+    logger.info(
+        f"Schedule: {len(schedule.changed)} changed, {len(schedule.never_scraped)} never scraped, "
+        f"{schedule.scrapes_avoided} unchanged (skipped)"
+    )
+    return schedule
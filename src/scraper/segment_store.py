@@ -0,0 +1,464 @@
+"""Segment-based message store packing many chats into a few large files.
+
+Instead of one JSONL file per chat, each chat's messages are written as a single
+record line ({"chat_id": ..., "messages": [...]}, plus the chat state it
+was scraped at) appended to a large segment
+file (segment_00000.jsonl, segment_00001.jsonl, ...). An append-only index
+(index.jsonl) maps chat_id -> (segment, offset, length) plus the chat's
+manifest summary (message count, first/last message); the last entry for a
+chat wins. Reads are served from memory-mapped segments, and corpus-wide scans
+become sequential passes over a handful of files.
+
+Every save appends a complete record, so superseded records accumulate; once
+their number passes compaction_threshold the live records are rewritten into
+fresh segments.
+"""
+
+import json
+import mmap
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from loguru import logger
+
+from src.models import MessageItem
+from src.scraper.message_central_db import CHAT_STATE_FIELDS, MessageStore, chat_state_of, summarize_messages
+
+
+class SegmentMessageDB(MessageStore):
+    """MessageStore backed by append-only segment files."""
+
+    def __init__(
+        self,
+        segments_dir: str = "data/messages/segments",
+        max_segment_bytes: int = 256 * 1024 * 1024,
+        compaction_threshold: int = 5000
+    ):
+        """Initialize the segment store.
+
+        Args:
+            segments_dir: Directory holding segment and index files
+            max_segment_bytes: Size after which a new segment is started
+            compaction_threshold: Superseded records tolerated before writes
+                compact the store
+        """
+        self.messages_dir = Path(segments_dir)
+        self.messages_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.messages_dir / "index.jsonl"
+        self.max_segment_bytes = max_segment_bytes
+        self.compaction_threshold = compaction_threshold
+
+        self._lock = threading.RLock()
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._index: Dict[int, Tuple[int, int, int]] = {}
+        self._summaries: Dict[int, Dict[str, Any]] = {}
+        self._index_records = 0
+        self._load_index()
+
+    # ===== Index =====
+
+    def _segment_path(self, segment: int) -> Path:
+        """Get the file path for a segment number."""
+        return self.messages_dir / f"segment_{segment:05d}.jsonl"
+
+    def _segment_numbers(self) -> List[int]:
+        """List existing segment numbers in ascending order."""
+        return sorted(
+            int(path.stem.replace("segment_", ""))
+            for path in self.messages_dir.glob("segment_*.jsonl")
+        )
+
+    def _load_index(self) -> None:
+        """Load the index, rebuilding it from segments if it is missing."""
+        if not self.index_path.exists():
+            if self._segment_numbers():
+                self.rebuild_index()
+            return
+
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn final line after a crash; the segment record is still
+                    # recoverable through rebuild_index()
+                    continue
+                self._apply_index_entry(entry)
+                self._index_records += 1
+
+        logger.info(f"Loaded segment index: {len(self._index)} chats in {len(self._segment_numbers())} segments")
+
+    def _apply_index_entry(self, entry: Dict[str, Any]) -> None:
+        """Apply one index entry (last entry for a chat wins)."""
+        chat_id = entry["chat_id"]
+        self._index[chat_id] = (entry["segment"], entry["offset"], entry["length"])
+        if "message_count" in entry:
+            keys = [*summarize_messages([]), *CHAT_STATE_FIELDS]
+            self._summaries[chat_id] = {key: entry[key] for key in keys if key in entry}
+        else:
+            # Entry written before summaries were indexed; computed on demand
+            self._summaries.pop(chat_id, None)
+
+    def _index_entry(
+        self,
+        chat_id: int,
+        segment: int,
+        offset: int,
+        length: int,
+        record: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the index entry for a stored record."""
+        return {
+            "chat_id": chat_id, "segment": segment, "offset": offset, "length": length,
+            **summarize_messages(record["messages"]),
+            **{key: record[key] for key in CHAT_STATE_FIELDS if key in record}
+        }
+
+    def rebuild_index(self) -> int:
+        """Rebuild the index by scanning every segment sequentially.
+
+        Returns:
+            Number of chats indexed
+        """
+        with self._lock:
+            self._index = {}
+            self._summaries = {}
+            entries = []
+
+            for segment in self._segment_numbers():
+                offset = 0
+                with open(self._segment_path(segment), 'rb') as f:
+                    for raw_line in f:
+                        length = len(raw_line)
+                        try:
+                            record = json.loads(raw_line)
+                            entry = self._index_entry(record["chat_id"], segment, offset, length, record)
+                            self._apply_index_entry(entry)
+                            entries.append(entry)
+                        except (json.JSONDecodeError, KeyError) as e:
+                            logger.warning(f"Skipping bad record at byte {offset} in segment {segment}: {e}")
+                        offset += length
+
+            temp_path = self.index_path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                for entry in entries:
+                    f.write(json.dumps(entry) + '\n')
+            temp_path.replace(self.index_path)
+            self._index_records = len(entries)
+
+        logger.info(f"Rebuilt segment index: {len(self._index)} chats")
+        return len(self._index)
+
+    # ===== Reading =====
+
+    def _map(self, segment: int, end: int) -> mmap.mmap:
+        """Get a read-only mapping of a segment covering at least `end` bytes."""
+        mapped = self._maps.get(segment)
+        if mapped is None or len(mapped) < end:
+            if mapped is not None:
+                mapped.close()
+            with open(self._segment_path(segment), 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = mapped
+        return mapped
+
+    def _read_record(self, chat_id: int) -> Optional[Dict[str, Any]]:
+        """Read and decode a chat's record from its segment."""
+        with self._lock:
+            location = self._index.get(chat_id)
+            if location is None:
+                return None
+            segment, offset, length = location
+            data = self._map(segment, offset + length)[offset:offset + length]
+        return json.loads(data)
+
+    def load_raw_messages(self, chat_id: int) -> List[Dict[str, Any]]:
+        """Load a chat's messages as plain dictionaries (no model validation).
+
+        Args:
+            chat_id: ID of the chat
+
+        Returns:
+            List of message dictionaries in chronological order
+        """
+        record = self._read_record(chat_id)
+        return record["messages"] if record else []
+
+    def load_chat_messages(self, chat_id: int) -> Dict[int, MessageItem]:
+        """Load all messages for a specific chat.
+
+        Args:
+            chat_id: ID of the chat
+
+        Returns:
+            Dictionary mapping message_id -> MessageItem
+        """
+        messages = {}
+        for message_data in self.load_raw_messages(chat_id):
+            try:
+                message = MessageItem(**message_data)
+                messages[message.id] = message
+            except Exception as e:
+                logger.warning(f"Failed to create MessageItem in chat {chat_id}: {e}")
+
+        logger.info(f"Loaded {len(messages)} messages for chat {chat_id}")
+        return messages
+
+    def list_chat_ids(self) -> List[int]:
+        """List IDs of all chats that have stored messages.
+
+        Returns:
+            Sorted list of chat IDs
+        """
+        with self._lock:
+            return sorted(self._index)
+
+    def iter_chats(self) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """Iterate over every stored chat in segment/offset order.
+
+        Live records are visited in physical order, so a full scan is a
+        sequential read over each segment.
+
+        Yields:
+            Tuples of (chat_id, message dictionaries)
+        """
+        with self._lock:
+            order = [chat_id for _, chat_id in sorted((location, chat_id) for chat_id, location in self._index.items())]
+
+        for chat_id in order:
+            # Looked up again per chat: a concurrent save may have compacted
+            record = self._read_record(chat_id)
+            if record is not None:
+                yield chat_id, record["messages"]
+
+    def chat_exists(self, chat_id: int) -> bool:
+        """Check if messages are stored for a chat.
+
+        Args:
+            chat_id: ID of the chat
+
+        Returns:
+            True if the chat has a record in the index
+        """
+        with self._lock:
+            return chat_id in self._index
+
+    def get_manifest_entry(self, chat_id: int) -> Optional[Dict[str, Any]]:
+        """Get a chat's manifest summary from the segment index.
+
+        Args:
+            chat_id: ID of the chat
+
+        Returns:
+            Dictionary with message_count and first/last message id and
+            created_at, or None if the chat has no record
+        """
+        with self._lock:
+            if chat_id not in self._index:
+                return None
+            summary = self._summaries.get(chat_id)
+            if summary is None:
+                record = self._read_record(chat_id)
+                summary = {
+                    **summarize_messages(record["messages"]),
+                    **{key: record[key] for key in CHAT_STATE_FIELDS if key in record}
+                }
+                self._summaries[chat_id] = summary
+            return {"chat_id": chat_id, **summary}
+
+    def rebuild_manifest(self) -> int:
+        """Rebuild the manifest (the segment index) from the segments.
+
+        Returns:
+            Number of chats indexed
+        """
+        return self.rebuild_index()
+
+    def get_stats(self) -> Dict:
+        """Get statistics about all stored chat messages from the index.
+
+        Returns:
+            Dictionary with stats about the message database
+        """
+        chat_ids = self.list_chat_ids()
+        total_chats = len(chat_ids)
+        total_messages = sum(self.get_message_count(chat_id) for chat_id in chat_ids)
+
+        return {
+            "total_chats_with_messages": total_chats,
+            "total_messages": total_messages,
+            "avg_messages_per_chat": total_messages / total_chats if total_chats > 0 else 0
+        }
+
+    # ===== Writing =====
+
+    def _append_records(
+        self,
+        records: List[Tuple[int, List[Dict[str, Any]]]],
+        chat_states: Optional[Dict[int, Dict[str, Any]]] = None
+    ) -> None:
+        """Append chat records to the active segment and index them.
+
+        Args:
+            records: List of (chat_id, message dictionaries)
+            chat_states: Optional chat_id -> chat state stored with the record
+        """
+        chat_states = chat_states or {}
+        if not records:
+            return
+
+        with self._lock:
+            segments = self._segment_numbers()
+            segment = segments[-1] if segments else 0
+            segment_file = None
+            entries = []
+
+            try:
+                for chat_id, messages in records:
+                    if segment_file is None or segment_file.tell() >= self.max_segment_bytes:
+                        if segment_file is not None:
+                            segment_file.flush()
+                            os.fsync(segment_file.fileno())
+                            segment_file.close()
+                            segment += 1
+                        segment_file = open(self._segment_path(segment), 'ab')
+                        if segment_file.tell() >= self.max_segment_bytes:
+                            segment_file.close()
+                            segment += 1
+                            segment_file = open(self._segment_path(segment), 'ab')
+
+                    record = {"chat_id": chat_id, **chat_states.get(chat_id, {}), "messages": messages}
+                    line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+                    offset = segment_file.tell()
+                    segment_file.write(line)
+                    entries.append(self._index_entry(chat_id, segment, offset, len(line), record))
+            finally:
+                if segment_file is not None:
+                    segment_file.flush()
+                    os.fsync(segment_file.fileno())
+                    segment_file.close()
+
+            # Index entries are written only after their records are durable
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(''.join(json.dumps(entry) + '\n' for entry in entries))
+                f.flush()
+                os.fsync(f.fileno())
+
+            for entry in entries:
+                self._apply_index_entry(entry)
+            self._index_records += len(entries)
+
+            if self.dead_records > self.compaction_threshold:
+                self.compact()
+
+    @property
+    def dead_records(self) -> int:
+        """Number of superseded records still stored in the segments."""
+        with self._lock:
+            return self._index_records - len(self._index)
+
+    def save_chat_messages(
+        self,
+        chat_id: int,
+        messages: Dict[int, MessageItem],
+        chat_state: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Save all messages for a chat as a new record in the active segment.
+
+        Args:
+            chat_id: ID of the chat
+            messages: Dictionary of message_id -> MessageItem to save
+            chat_state: Chat list state at scrape time, stored with the record
+        """
+        try:
+            sorted_messages = sorted(messages.values(), key=lambda m: m.created_at)
+            self._append_records(
+                [(chat_id, [m.model_dump(mode="json") for m in sorted_messages])],
+                {chat_id: chat_state} if chat_state else None
+            )
+            logger.info(f"Saved {len(messages)} messages for chat {chat_id} to segment store")
+        except Exception as e:
+            logger.error(f"Error saving messages for chat {chat_id}: {e}")
+            raise
+
+    def import_from_files(self, source: MessageStore, chats_per_batch: int = 500) -> int:
+        """Pack per-chat message files from another store into segments.
+
+        Args:
+            source: Store to read from (usually the per-chat JSONL directory)
+            chats_per_batch: Chats appended per segment write
+
+        Returns:
+            Number of chats imported
+        """
+        batch = []
+        chat_states = {}
+        imported = 0
+
+        for chat_id, messages in source.iter_chats():
+            batch.append((chat_id, messages))
+            chat_state = chat_state_of(source.get_manifest_entry(chat_id))
+            if chat_state:
+                chat_states[chat_id] = chat_state
+            if len(batch) >= chats_per_batch:
+                self._append_records(batch, chat_states)
+                imported += len(batch)
+                batch = []
+                chat_states = {}
+
+        if batch:
+            self._append_records(batch, chat_states)
+            imported += len(batch)
+
+        logger.success(f"Packed {imported} chats into {len(self._segment_numbers())} segments")
+        return imported
+
+    def compact(self) -> int:
+        """Rewrite live records into fresh segments, dropping superseded ones.
+
+        Returns:
+            Number of chats in the compacted store
+        """
+        with self._lock:
+            compact_dir = self.messages_dir.with_name(self.messages_dir.name + ".compact")
+            shutil.rmtree(compact_dir, ignore_errors=True)
+
+            # Live records are rewritten in chat_id order
+            target = SegmentMessageDB(str(compact_dir), self.max_segment_bytes, self.compaction_threshold)
+            chat_ids = self.list_chat_ids()
+            for start in range(0, len(chat_ids), 500):
+                batch = [(chat_id, self._read_record(chat_id)) for chat_id in chat_ids[start:start + 500]]
+                target._append_records(
+                    [(chat_id, record["messages"]) for chat_id, record in batch],
+                    {
+                        chat_id: {key: record[key] for key in CHAT_STATE_FIELDS if key in record}
+                        for chat_id, record in batch
+                    }
+                )
+            target.close()
+
+            self.close()
+            old_dir = self.messages_dir.with_name(self.messages_dir.name + ".old")
+            shutil.rmtree(old_dir, ignore_errors=True)
+            self.messages_dir.rename(old_dir)
+            compact_dir.rename(self.messages_dir)
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+            self._index = {}
+            self._summaries = {}
+            self._index_records = 0
+            self._load_index()
+
+        logger.info(f"Compacted segment store: {len(self._index)} chats")
+        return len(self._index)
+
+    def close(self) -> None:
+        """Release memory mappings."""
+        with self._lock:
+            for mapped in self._maps.values():
+                mapped.close()
+            self._maps = {}
@@ -0,0 +1,578 @@
+"""SQLite storage backend for chats and messages.
+
+Stores the master chat list and all chat messages in a single SQLite database
+(db/chats.db by default) running in WAL mode. SQLiteChatDatabase and
+SQLiteMessageDB implement the same ChatStore and MessageStore interfaces as
+the JSONL backend, so callers can switch backends without code changes.
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from loguru import logger
+
+from src.models import ChatItem, MessageItem
+from src.scraper.central_db import CentralChatDatabase, ChatStore
+from src.scraper.message_central_db import CHAT_STATE_FIELDS, MessageCentralDB, MessageStore, chat_state_of
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS chats (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    service_title TEXT NOT NULL,
+    is_hired INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chats_created_at ON chats (created_at);
+CREATE INDEX IF NOT EXISTS idx_chats_updated_at ON chats (updated_at);
+CREATE INDEX IF NOT EXISTS idx_chats_service_title ON chats (service_title);
+CREATE INDEX IF NOT EXISTS idx_chats_is_hired ON chats (is_hired);
+
+CREATE TABLE IF NOT EXISTS messages (
+    chat_id INTEGER NOT NULL,
+    id INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (chat_id, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_messages_chat_created_at ON messages (chat_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_messages_created_at ON messages (created_at);
+
+CREATE TABLE IF NOT EXISTS message_watermarks (
+    chat_id INTEGER PRIMARY KEY,
+    chat_updated_at TEXT,
+    chat_last_message TEXT
+);
+"""
+
+
+class SQLiteStore:
+    """Shared SQLite connection manager (one connection per thread)."""
+
+    def __init__(self, db_path: str = "db/chats.db"):
+        """Initialize the store and create the schema if needed.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+        with self.transaction() as conn:
+            conn.executescript(SCHEMA)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run a block inside a single transaction (commit or roll back)."""
+        conn = self.conn
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def _chat_row(chat: ChatItem) -> tuple:
+    """Convert a chat to a row for the chats table."""
+    return (
+        chat.id,
+        chat.created_at,
+        chat.updated_at,
+        chat.service.title,
+        int(chat.quote.is_hired),
+        chat.model_dump_json(),
+    )
+
+
+def _message_row(chat_id: int, message: MessageItem) -> tuple:
+    """Convert a message to a row for the messages table."""
+    return (chat_id, message.id, message.created_at, message.model_dump_json())
+
+
+class SQLiteChatDatabase(ChatStore):
+    """ChatStore backed by the chats table."""
+
+    def __init__(self, db_path: str = "db/chats.db", batch_size: int = 500):
+        """Initialize the SQLite chat database.
+
+        Args:
+            db_path: Path to the SQLite database file
+            batch_size: Rows per executemany() call for upserts
+        """
+        self.store = SQLiteStore(db_path)
+        self.db_path = self.store.db_path
+        self.batch_size = batch_size
+
+    def load(self) -> Dict[int, ChatItem]:
+        """Load all chats from the database.
+
+        Returns:
+            Dictionary mapping chat_id -> ChatItem
+        """
+        chats = {}
+        for chat_id, data in self.store.conn.execute("SELECT id, data FROM chats ORDER BY id"):
+            try:
+                chats[chat_id] = ChatItem(**json.loads(data))
+            except Exception as e:
+                logger.warning(f"Failed to create ChatItem for chat {chat_id}: {e}")
+
+        logger.info(f"Loaded {len(chats)} chats from {self.db_path}")
+        return chats
+
+    def append(self, chats: Iterable[ChatItem]) -> int:
+        """Upsert chats in batched transactions.
+
+        Args:
+            chats: Chats to insert or update
+
+        Returns:
+            Number of chats written
+        """
+        rows = [_chat_row(chat) for chat in chats]
+
+        with self.store.transaction() as conn:
+            for start in range(0, len(rows), self.batch_size):
+                conn.executemany(
+                    "INSERT OR REPLACE INTO chats (id, created_at, updated_at, service_title, is_hired, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    rows[start:start + self.batch_size]
+                )
+
+        if rows:
+            logger.info(f"Upserted {len(rows)} chats into {self.db_path}")
+        return len(rows)
+
+    def delete(self, chat_ids: Iterable[int]) -> int:
+        """Delete chats by ID.
+
+        Args:
+            chat_ids: IDs of chats to remove
+
+        Returns:
+            Number of chats deleted
+        """
+        with self.store.transaction() as conn:
+            cursor = conn.executemany("DELETE FROM chats WHERE id = ?", [(chat_id,) for chat_id in chat_ids])
+        return cursor.rowcount
+
+    def compact(self) -> int:
+        """Checkpoint the SQLite WAL file into the main database.
+
+        Returns:
+            Number of chats in the database
+        """
+        self.store.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return self.store.conn.execute("SELECT COUNT(*) FROM chats").fetchone()[0]
+
+    def save(self, chats: Dict[int, ChatItem]) -> None:
+        """Replace all chats in the database.
+
+        Args:
+            chats: Dictionary of chat_id -> ChatItem to save
+        """
+        with self.store.transaction() as conn:
+            conn.execute("DELETE FROM chats")
+            conn.executemany(
+                "INSERT INTO chats (id, created_at, updated_at, service_title, is_hired, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [_chat_row(chat) for chat in chats.values()]
+            )
+
+        logger.info(f"Saved {len(chats)} chats to {self.db_path}")
+
+    def get_raw_many(self, chat_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Read several chats by primary key as the raw stored JSON records.
+
+        Args:
+            chat_ids: IDs of the chats
+
+        Returns:
+            Dictionary mapping chat_id -> chat record for chats that exist,
+            ordered by chat ID
+        """
+        ids = list(dict.fromkeys(chat_ids))
+        records = {}
+
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(ids), self.batch_size):
+            batch = ids[start:start + self.batch_size]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.store.conn.execute(
+                f"SELECT id, data FROM chats WHERE id IN ({placeholders})", batch
+            )
+            for chat_id, data in rows:
+                records[chat_id] = json.loads(data)
+
+        return {chat_id: records[chat_id] for chat_id in sorted(records)}
+
+    def hired_ids(self) -> List[int]:
+        """Get IDs of hired chats.
+
+        Returns:
+            Sorted list of chat IDs whose quote is marked as hired
+        """
+        rows = self.store.conn.execute("SELECT id FROM chats WHERE is_hired = 1 ORDER BY id")
+        return [chat_id for (chat_id,) in rows]
+
+    def get_stats(self) -> Dict:
+        """Get statistics about the chat table.
+
+        Returns:
+            Dictionary with stats about the database
+        """
+        conn = self.store.conn
+        total, oldest, newest = conn.execute(
+            "SELECT COUNT(*), MIN(created_at), MAX(updated_at) FROM chats"
+        ).fetchone()
+        services = [
+            title for (title,) in conn.execute("SELECT DISTINCT service_title FROM chats ORDER BY service_title")
+        ]
+
+        return {
+            "total_chats": total,
+            "oldest_chat": oldest,
+            "newest_chat": newest,
+            "unique_services": services
+        }
+
+
+class SQLiteMessageDB(MessageStore):
+    """MessageStore backed by the messages table."""
+
+    def __init__(self, db_path: str = "db/chats.db", batch_size: int = 500):
+        """Initialize the SQLite message database.
+
+        Args:
+            db_path: Path to the SQLite database file
+            batch_size: Rows per executemany() call for upserts
+        """
+        self.store = SQLiteStore(db_path)
+        self.db_path = self.store.db_path
+        self.batch_size = batch_size
+
+    def load_chat_messages(self, chat_id: int) -> Dict[int, MessageItem]:
+        """Load all messages for a specific chat.
+
+        Args:
+            chat_id: ID of the chat
+
+        Returns:
+            Dictionary mapping message_id -> MessageItem (chronological order)
+        """
+        messages = {}
+        rows = self.store.conn.execute(
+            "SELECT id, data FROM messages WHERE chat_id = ? ORDER BY created_at", (chat_id,)
+        )
+        for message_id, data in rows:
+            try:
+                messages[message_id] = MessageItem(**json.loads(data))
+            except Exception as e:
+                logger.warning(f"Failed to create MessageItem {message_id} in chat {chat_id}: {e}")
+
+        logger.info(f"Loaded {len(messages)} messages for chat {chat_id}")
+        return messages
+
+    def save_chat_messages(
+        self,
+        chat_id: int,
+        messages: Dict[int, MessageItem],
+        chat_state: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Replace all messages for a chat in one transaction.
+
+        Args:
+            chat_id: ID of the chat
+            messages: Dictionary of message_id -> MessageItem to save
+            chat_state: Chat list state at scrape time, stored as the watermark
+        """
+        rows = [_message_row(chat_id, message) for message in messages.values()]
+
+        with self.store.transaction() as conn:
+            conn.execute("DELETE FROM messages WHERE chat_id = ?", (chat_id,))
+            for start in range(0, len(rows), self.batch_size):
+                conn.executemany(
+                    "INSERT INTO messages (chat_id, id, created_at, data) VALUES (?, ?, ?, ?)",
+                    rows[start:start + self.batch_size]
+                )
+            if chat_state:
+                conn.execute(
+                    "INSERT OR REPLACE INTO message_watermarks (chat_id, chat_updated_at, chat_last_message) VALUES (?, ?, ?)",
+                    (chat_id, *(chat_state.get(key) for key in CHAT_STATE_FIELDS))
+                )
+
+        logger.info(f"Saved {len(messages)} messages for chat {chat_id} to {self.db_path}")
+
+    def upsert_messages(self, messages_by_chat: Dict[int, List[MessageItem]]) -> int:
+        """Insert or update messages for many chats in one transaction.
+
+        Args:
+            messages_by_chat: Dictionary of chat_id -> messages
+
+        Returns:
+            Number of messages written
+        """
+        rows = [
+            _message_row(chat_id, message)
+            for chat_id, messages in messages_by_chat.items()
+            for message in messages
+        ]
+
+        with self.store.transaction() as conn:
+            for start in range(0, len(rows), self.batch_size):
+                conn.executemany(
+                    "INSERT OR REPLACE INTO messages (chat_id, id, created_at, data) VALUES (?, ?, ?, ?)",
+                    rows[start:start + self.batch_size]
+                )
+
+        return len(rows)
+
+    def save_chat_states(self, chat_states: Dict[int, Dict[str, Any]]) -> None:
+        """Record scrape watermarks for many chats in one transaction.
+
+        Args:
+            chat_states: Dictionary of chat_id -> chat state
+        """
+        with self.store.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO message_watermarks (chat_id, chat_updated_at, chat_last_message) VALUES (?, ?, ?)",
+                [
+                    (chat_id, *(state.get(key) for key in CHAT_STATE_FIELDS))
+                    for chat_id, state in chat_states.items()
+                ]
+            )
+
+    def load_raw_messages(self, chat_id: int) -> List[Dict[str, Any]]:
+        """Load a chat's messages as plain dictionaries (no model validation).
+
+        Args:
+            chat_id: ID of the chat
+
+        Returns:
+            List of message dictionaries in chronological order
+        """
+        rows = self.store.conn.execute(
+            "SELECT data FROM messages WHERE chat_id = ? ORDER BY created_at", (chat_id,)
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def list_chat_ids(self) -> List[int]:
+        """List IDs of all chats that have stored messages.
+
+        Returns:
+            Sorted list of chat IDs
+        """
+        rows = self.store.conn.execute("SELECT DISTINCT chat_id FROM messages ORDER BY chat_id")
+        return [chat_id for (chat_id,) in rows]
+
+    def iter_chats(self) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """Iterate over every stored chat with a single ordered table scan.
+
+        Yields:
+            Tuples of (chat_id, message dictionaries)
+        """
+        current_id = None
+        current: List[Dict[str, Any]] = []
+
+        rows = self.store.conn.execute("SELECT chat_id, data FROM messages ORDER BY chat_id, created_at")
+        for chat_id, data in rows:
+            if chat_id != current_id and current_id is not None:
+                yield current_id, current
+                current = []
+            current_id = chat_id
+            current.append(json.loads(data))
+
+        if current_id is not None:
+            yield current_id, current
+
+    def chat_exists(self, chat_id: int) -> bool:
+        """Check if any messages are stored for a chat.
+
+        Args:
+            chat_id: ID of the chat
+
+        Returns:
+            True if the chat has stored messages
+        """
+        row = self.store.conn.execute(
+            "SELECT 1 FROM messages WHERE chat_id = ? LIMIT 1", (chat_id,)
+        ).fetchone()
+        return row is not None
+
+    def get_message_count(self, chat_id: int) -> int:
+        """Get the number of messages stored for a chat.
+
+        Args:
+            chat_id: ID of the chat
+
+        Returns:
+            Number of messages
+        """
+        return self.store.conn.execute(
+            "SELECT COUNT(*) FROM messages WHERE chat_id = ?", (chat_id,)
+        ).fetchone()[0]
+
+    def get_manifest_entry(self, chat_id: int) -> Optional[Dict[str, Any]]:
+        """Get a chat's message count and first/last message from the indexes.
+
+        Args:
+            chat_id: ID of the chat
+
+        Returns:
+            Dictionary with message_count and first/last message id and
+            created_at, or None if the chat has no messages
+        """
+        conn = self.store.conn
+        count = self.get_message_count(chat_id)
+        if count == 0:
+            return None
+
+        first = conn.execute(
+            "SELECT id, created_at FROM messages WHERE chat_id = ? ORDER BY created_at, id LIMIT 1", (chat_id,)
+        ).fetchone()
+        last = conn.execute(
+            "SELECT id, created_at FROM messages WHERE chat_id = ? ORDER BY created_at DESC, id DESC LIMIT 1", (chat_id,)
+        ).fetchone()
+        state = conn.execute(
+            "SELECT chat_updated_at, chat_last_message FROM message_watermarks WHERE chat_id = ?", (chat_id,)
+        ).fetchone()
+
+        entry = {
+            "chat_id": chat_id,
+            "message_count": count,
+            "first_message_id": first[0],
+            "last_message_id": last[0],
+            "first_created_at": first[1],
+            "last_created_at": last[1]
+        }
+        if state:
+            entry.update(zip(CHAT_STATE_FIELDS, state))
+        return entry
+
+    def rebuild_manifest(self) -> int:
+        """No-op: counts and first/last messages come from table indexes.
+
+        Returns:
+            Number of chats with messages
+        """
+        return len(self.list_chat_ids())
+
+    def get_stats(self) -> Dict:
+        """Get statistics about all stored chat messages.
+
+        Returns:
+            Dictionary with stats about the message database
+        """
+        total_chats, total_messages = self.store.conn.execute(
+            "SELECT COUNT(DISTINCT chat_id), COUNT(*) FROM messages"
+        ).fetchone()
+
+        return {
+            "total_chats_with_messages": total_chats,
+            "total_messages": total_messages,
+            "avg_messages_per_chat": total_messages / total_chats if total_chats > 0 else 0
+        }
+
+
+# ===== JSONL import/export bridge =====
+
+def import_from_jsonl(
+    chat_db: CentralChatDatabase,
+    message_db: MessageCentralDB,
+    sqlite_chat_db: SQLiteChatDatabase,
+    sqlite_message_db: SQLiteMessageDB,
+    chats_per_batch: int = 200
+) -> Dict[str, int]:
+    """Copy the JSONL master list and per-chat message files into SQLite.
+
+    Args:
+        chat_db: Source JSONL chat database
+        message_db: Source per-chat message files
+        sqlite_chat_db: Destination chat table
+        sqlite_message_db: Destination message table
+        chats_per_batch: Chats whose messages are written per transaction
+
+    Returns:
+        Dictionary with imported chat and message counts
+    """
+    chats = chat_db.load()
+    sqlite_chat_db.append(chats.values())
+
+    total_messages = 0
+    batch: Dict[int, List[MessageItem]] = {}
+    chat_states: Dict[int, Dict[str, Any]] = {}
+    chat_ids = message_db.list_chat_ids()
+
+    for chat_id in chat_ids:
+        batch[chat_id] = list(message_db.load_chat_messages(chat_id).values())
+        chat_state = chat_state_of(message_db.get_manifest_entry(chat_id))
+        if chat_state:
+            chat_states[chat_id] = chat_state
+
+        if len(batch) >= chats_per_batch:
+            total_messages += sqlite_message_db.upsert_messages(batch)
+            batch = {}
+
+    if batch:
+        total_messages += sqlite_message_db.upsert_messages(batch)
+    sqlite_message_db.save_chat_states(chat_states)
+
+    logger.success(f"Imported {len(chats)} chats and {total_messages} messages ({len(chat_ids)} chat files) into SQLite")
+    return {"chats": len(chats), "messages": total_messages, "chat_files": len(chat_ids)}
+
+
+def export_to_jsonl(
+    sqlite_chat_db: SQLiteChatDatabase,
+    sqlite_message_db: SQLiteMessageDB,
+    chat_db: CentralChatDatabase,
+    message_db: MessageCentralDB
+) -> Dict[str, int]:
+    """Write the SQLite contents back out in the JSONL layout.
+
+    Args:
+        sqlite_chat_db: Source chat table
+        sqlite_message_db: Source message table
+        chat_db: Destination JSONL chat database
+        message_db: Destination per-chat message files
+
+    Returns:
+        Dictionary with exported chat and message counts
+    """
+    chats = sqlite_chat_db.load()
+    chat_db.save(chats)
+
+    chat_ids = sqlite_message_db.list_chat_ids()
+
+    total_messages = 0
+    for chat_id in chat_ids:
+        messages = sqlite_message_db.load_chat_messages(chat_id)
+        chat_state = chat_state_of(sqlite_message_db.get_manifest_entry(chat_id))
+        message_db.save_chat_messages(chat_id, messages, chat_state=chat_state)
+        total_messages += len(messages)
+
+    logger.success(f"Exported {len(chats)} chats and {total_messages} messages ({len(chat_ids)} chats) to JSONL")
+    return {"chats": len(chats), "messages": total_messages, "chat_files": len(chat_ids)}
@@ -0,0 +1,85 @@
+"""Storage backend selection for the chat and message databases."""
+
+from pathlib import Path
+from typing import Optional
+
+from src import config
+from src.scraper.central_db import CentralChatDatabase, ChatStore
+from src.scraper.message_central_db import MessageCentralDB, MessageStore
+
+
+CHAT_BACKENDS = ("jsonl", "sqlite")
+MESSAGE_BACKENDS = ("jsonl", "sqlite", "segments")
+
+
+def _resolve_backend(backend: Optional[str], default: str, allowed: tuple) -> str:
+    """Resolve the backend name, falling back to the configured default."""
+    backend = (backend or default).lower()
+    if backend not in allowed:
+        raise ValueError(f"Unknown storage backend: {backend} (expected one of {', '.join(allowed)})")
+    return backend
+
+
+def open_chat_database(
+    db_path: str = "data/chat_list_master.jsonl",
+    backend: Optional[str] = None,
+    sqlite_path: Optional[str] = None
+) -> ChatStore:
+    """Open the chat list database for the configured backend.
+
+    Args:
+        db_path: Path to the JSONL master list (jsonl backend)
+        backend: "jsonl" or "sqlite" (default: STORAGE_BACKEND setting)
+        sqlite_path: Path to the SQLite file (default: CHAT_DB_FILE setting)
+
+    Returns:
+        Chat database instance
+    """
+    if _resolve_backend(backend, config.STORAGE_BACKEND, CHAT_BACKENDS) == "sqlite":
+        from src.scraper.sqlite_store import SQLiteChatDatabase
+        return SQLiteChatDatabase(str(sqlite_path or config.CHAT_DB_FILE))
+    return CentralChatDatabase(db_path)
+
+
+def open_chat_database_file(path: str) -> ChatStore:
+    """Open exactly the chat database at `path`, ignoring STORAGE_BACKEND.
+
+    The backend follows the file: a `.db` path is a SQLite database,
+    anything else a JSONL master list.
+
+    Args:
+        path: Chat database file
+
+    Returns:
+        Chat database instance
+    """
+    if Path(path).suffix == ".db":
+        return open_chat_database(backend="sqlite", sqlite_path=path)
+    return open_chat_database(path, backend="jsonl")
+
+
+def open_message_database(
+    messages_dir: str = "data/messages",
+    backend: Optional[str] = None,
+    sqlite_path: Optional[str] = None
+) -> MessageStore:
+    """Open the message database for the configured backend.
+
+    Args:
+        messages_dir: Directory of per-chat message files (jsonl backend);
+            the segments backend uses its "segments" subdirectory
+        backend: "jsonl", "sqlite" or "segments"
+            (default: MESSAGE_STORAGE_BACKEND setting)
+        sqlite_path: Path to the SQLite file (default: CHAT_DB_FILE setting)
+
+    Returns:
+        Message database instance
+    """
+    backend = _resolve_backend(backend, config.MESSAGE_STORAGE_BACKEND, MESSAGE_BACKENDS)
+    if backend == "sqlite":
+        from src.scraper.sqlite_store import SQLiteMessageDB
+        return SQLiteMessageDB(str(sqlite_path or config.CHAT_DB_FILE))
+    if backend == "segments":
+        from src.scraper.segment_store import SegmentMessageDB
+        return SegmentMessageDB(str(Path(messages_dir) / "segments"))
+    return MessageCentralDB(messages_dir)
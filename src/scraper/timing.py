@@ -0,0 +1,115 @@
+"""Per-phase timing of message scraping.
+
+Each chat gets a PhaseTimer that accumulates wall time per phase
+(navigation, first_response, scroll, scroll_wait, humanization, api_fetch,
+persist_queue, persist, chat_delay). The run folds every chat's phases into a
+PhaseHistogram, whose p50/p95/max per phase go into the run metadata and whose
+full report (with bucket counts and each phase's share of the time) is written
+to timing_report.json.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# Upper bounds (seconds) of the report's histogram buckets
+BUCKET_BOUNDS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+class PhaseTimer:
+    """Accumulates wall time per phase for one chat."""
+
+    def __init__(self):
+        self.seconds: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as part of `name` (also around awaits)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add seconds to a phase."""
+        self.seconds[name] = self.seconds.get(name, 0.0) + seconds
+
+    def as_dict(self) -> Dict[str, float]:
+        """Phase totals rounded to milliseconds."""
+        return {name: round(seconds, 3) for name, seconds in self.seconds.items()}
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Linearly interpolated percentile of sorted values.
+
+    Args:
+        sorted_values: Samples in ascending order (non-empty)
+        q: Percentile in [0, 100]
+
+    Returns:
+        Percentile value
+    """
+    position = (len(sorted_values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class PhaseHistogram:
+    """Per-phase distribution of chat timings across a run."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+
+    def add(self, phases: Dict[str, float]) -> None:
+        """Add one chat's phase totals."""
+        for name, seconds in phases.items():
+            self.samples.setdefault(name, []).append(seconds)
+
+    def stats(self, name: str) -> Optional[Dict[str, float]]:
+        """Count, total, mean, p50, p95 and max of a phase (None if never seen)."""
+        values = sorted(self.samples.get(name, []))
+        if not values:
+            return None
+        total = sum(values)
+        return {
+            "count": len(values),
+            "total": round(total, 3),
+            "mean": round(total / len(values), 3),
+            "p50": round(percentile(values, 50), 3),
+            "p95": round(percentile(values, 95), 3),
+            "max": round(values[-1], 3)
+        }
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Stats of every phase, slowest total first."""
+        phases = {name: self.stats(name) for name in self.samples}
+        return dict(sorted(phases.items(), key=lambda item: item[1]["total"], reverse=True))
+
+    def report(self, total_key: Optional[str] = None) -> Dict[str, Any]:
+        """Full timing report: stats, bucket counts and share of time per phase.
+
+        Args:
+            total_key: Phase holding whole-chat durations; it is reported but
+                left out of the other phases' shares
+
+        Returns:
+            Report dictionary
+        """
+        summary = self.summary()
+        phase_total = sum(stats["total"] for name, stats in summary.items() if name != total_key)
+
+        phases = {}
+        for name, stats in summary.items():
+            buckets = {f"<={bound:g}s": 0 for bound in BUCKET_BOUNDS}
+            buckets[f">{BUCKET_BOUNDS[-1]:g}s"] = 0
+            for seconds in self.samples[name]:
+                bound = next((bound for bound in BUCKET_BOUNDS if seconds <= bound), None)
+                buckets[f"<={bound:g}s" if bound is not None else f">{BUCKET_BOUNDS[-1]:g}s"] += 1
+
+            phases[name] = {**stats, "buckets": buckets}
+            if name != total_key and phase_total > 0:
+                phases[name]["share"] = round(stats["total"] / phase_total, 3)
+
+        return {"bucket_bounds_seconds": list(BUCKET_BOUNDS), "phases": phases}
@@ -4,7 +4,7 @@ import asyncio
 from pathlib import Path
 from typing import Optional, List
 
-from src.scraper.message_central_db import MessageCentralDB
+from src.scraper.storage import open_message_database
 from src.simulation.simulator import Simulator
 from src.simulation.storage import SimulationStorage
 from src.simulation.models import SimulationRun
@@ -20,7 +20,7 @@ class SimulationRunner:
             messages_dir: Path to messages directory
             simulations_dir: Path to simulations directory
         """
-        self.message_db = MessageCentralDB(str(messages_dir))
+        self.message_db = open_message_database(str(messages_dir))
         self.storage = SimulationStorage(simulations_dir)
 
     def run_simulation(
@@ -1,11 +1,15 @@
 """Load and filter chat data for DSPy training."""
 
-import json
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 from loguru import logger
 
+from src.scraper.central_db import CentralChatDatabase
+from src.scraper.message_central_db import MessageStore
+from src.scraper.storage import open_message_database
+
 from .models import ConversationData
 
 
@@ -15,27 +19,24 @@ def load_hired_chats(
     """
     Load all hired chats from the master chat list.
 
+    Uses the central database index to decode only hired chats instead of
+    parsing every record in the master list. Records are returned as stored
+    (all raw API fields) in master list order, with updates from the
+    write-ahead log applied.
+
     Args:
         chat_list_path: Path to chat_list_master.jsonl
 
     Returns:
         List of chat metadata dictionaries for hired chats
     """
-    if not chat_list_path.exists():
-        raise FileNotFoundError(f"Chat list not found: {chat_list_path}")
-
-    hired_chats = []
+    chat_db = CentralChatDatabase(str(chat_list_path))
 
-    with open(chat_list_path, "r", encoding="utf-8") as f:
-        for line in f:
-            if not line.strip():
-                continue
-
-            chat = json.loads(line)
+    if not chat_db.db_path.exists() and not chat_db.wal_path.exists():
+        raise FileNotFoundError(f"Chat list not found: {chat_list_path}")
 
-            # Filter: is_hired == true
-            if chat.get("quote", {}).get("is_hired", False):
-                hired_chats.append(chat)
+    # Filter: is_hired == true (resolved from the index)
+    hired_chats = list(chat_db.get_raw_many(chat_db.hired_ids()).values())
 
     logger.info(f"Loaded {len(hired_chats)} hired chats from {chat_list_path}")
     return hired_chats
@@ -55,23 +56,19 @@ def load_chat_messages(
     Returns:
         List of message dictionaries
     """
-    message_file = messages_dir / f"chat_{chat_id}.jsonl"
+    message_db = _open_message_db(str(messages_dir))
 
-    if not message_file.exists():
-        logger.warning(f"Message file not found for chat {chat_id}: {message_file}")
+    if not message_db.chat_exists(chat_id):
+        logger.warning(f"Messages not found for chat {chat_id} in {messages_dir}")
         return []
 
-    messages = []
-
-    with open(message_file, "r", encoding="utf-8") as f:
-        for line in f:
-            if not line.strip():
-                continue
+    return message_db.load_raw_messages(chat_id)
 
-            message = json.loads(line)
-            messages.append(message)
 
-    return messages
+@lru_cache(maxsize=4)
+def _open_message_db(messages_dir: str) -> MessageStore:
+    """Open (once per directory) the message store for the configured backend."""
+    return open_message_database(messages_dir)
 
 
 def filter_human_messages(messages: list[dict]) -> list[dict]:
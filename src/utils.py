@@ -2,6 +2,7 @@
 
 import asyncio
 import json
+import os
 import random
 import uuid
 from datetime import datetime
@@ -11,21 +12,29 @@ from loguru import logger
 from playwright.async_api import Page
 
 from .models import ScrapingRunMetadata, ChatListScrapingRunMetadata, ChatItem
+from .scraper.response_archive import ARCHIVE_FILE, ResponseArchive
 
 
 class RunLogger:
     """Manages logging and metadata for a scraping run."""
 
-    def __init__(self, run_type: str, config: Dict[str, Any] = None):
-        self.run_id = str(uuid.uuid4())[:8]  # Short ID
-        timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-        self.run_dir = Path(f"data/runs/{timestamp}_{run_type}_{self.run_id}")
+    def __init__(self, run_type: str, config: Dict[str, Any] = None, run_dir: Path = None):
+        if run_dir:
+            # Resuming an existing run: keep its directory and ID
+            self.run_dir = Path(run_dir)
+            self.run_id = self.run_dir.name.rsplit("_", 1)[-1]
+        else:
+            self.run_id = str(uuid.uuid4())[:8]  # Short ID
+            timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+            self.run_dir = Path(f"data/runs/{timestamp}_{run_type}_{self.run_id}")
         self.run_dir.mkdir(parents=True, exist_ok=True)
 
         # Create subdirectories
-        (self.run_dir / "api_responses").mkdir(exist_ok=True)
         (self.run_dir / "screenshots").mkdir(exist_ok=True)
 
+        # Raw API responses go to one compressed archive per run
+        self.response_archive = ResponseArchive(self.run_dir / ARCHIVE_FILE)
+
         # Set up file logging
         log_file = self.run_dir / "run.log"
         logger.add(log_file, level="DEBUG", format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {message}")
@@ -76,10 +85,12 @@ class RunLogger:
         logger.warning(message)
 
     def save_api_response(self, response_data: Dict[str, Any], index: int):
-        """Save raw API response."""
-        response_file = self.run_dir / "api_responses" / f"response_{index:03d}.json"
-        with open(response_file, 'w', encoding='utf-8') as f:
-            json.dump(response_data, f, indent=2, ensure_ascii=False)
+        """Save raw API response (buffered into the run's response archive)."""
+        self.response_archive.append(index, response_data)
+
+    def flush_api_responses(self):
+        """Write buffered API responses to the archive (e.g. before a checkpoint)."""
+        self.response_archive.flush()
 
     async def save_screenshot(self, page: Page, name: str):
         """Save a screenshot."""
@@ -89,6 +100,7 @@ class RunLogger:
 
     def finalize(self, status: str = "completed"):
         """Finalize the run and save metadata."""
+        self.response_archive.close()
         self.metadata.completed_at = datetime.now()
         self.metadata.status = status
 
@@ -156,27 +168,43 @@ class ChatListTracker:
 
         return new_count
 
-    def save_checkpoint(self, filepath: Path):
-        """Save current state to checkpoint file."""
+    def save_checkpoint(self, filepath: Path, **state: Any):
+        """
+        Save current state to checkpoint file.
+
+        Args:
+            filepath: Checkpoint file
+            **state: Extra resume state (e.g. the next page cursor)
+        """
         checkpoint_data = {
             "seen_ids": list(self.seen_ids),
             "chat_count": len(self.all_chats),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now().isoformat(),
+            **state
         }
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(checkpoint_data, f, indent=2)
+        # Write-then-rename so a crash never leaves a half-written checkpoint
+        temp_file = filepath.with_suffix('.tmp')
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint_data, f, indent=2, ensure_ascii=False, default=str)
+        os.replace(temp_file, filepath)
         logger.debug(f"Checkpoint saved: {len(self.all_chats)} chats")
 
-    def load_checkpoint(self, filepath: Path):
-        """Load state from checkpoint file."""
+    def load_checkpoint(self, filepath: Path) -> Dict[str, Any]:
+        """
+        Load state from checkpoint file.
+
+        Returns:
+            Checkpoint data (empty if there is no checkpoint)
+        """
         if not filepath.exists():
-            return
+            return {}
 
         with open(filepath, 'r', encoding='utf-8') as f:
             checkpoint_data = json.load(f)
 
         self.seen_ids = set(checkpoint_data.get("seen_ids", []))
         logger.info(f"Checkpoint loaded: {len(self.seen_ids)} previously seen chats")
+        return checkpoint_data
 
 
 def save_to_jsonl(data: List[Dict[str, Any]], filepath: Path):
@@ -195,6 +223,12 @@ def append_to_jsonl(item: Dict[str, Any], filepath: Path):
         f.write(json_line + '\n')
 
 
+def append_many_to_jsonl(items: List[Dict[str, Any]], filepath: Path):
+    """Append a batch of items to JSONL file with a single write."""
+    with open(filepath, 'a', encoding='utf-8') as f:
+        f.write(''.join(json.dumps(item, ensure_ascii=False) + '\n' for item in items))
+
+
 async def scroll_to_bottom(page: Page, wait_time: int = 2000):
     """Scroll to the bottom of the page."""
     await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
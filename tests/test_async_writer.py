@@ -0,0 +1,58 @@
+"""Test script for the off-event-loop message writer."""
+
+import asyncio
+import tempfile
+
+from src.scraper.message_central_db import MessageCentralDB
+from src.scraper.async_writer import AsyncMessageWriter
+from test_sqlite_store import create_mock_message
+
+
+class FailingMessageDB(MessageCentralDB):
+    """Message DB whose saves fail for one chat."""
+
+    def save_chat_messages(self, chat_id, messages, chat_state=None):
+        if chat_id == 13:
+            raise OSError("disk full")
+        super().save_chat_messages(chat_id, messages, chat_state=chat_state)
+
+
+def test_async_writer():
+    """Test per-chat ordering, back-pressure and failure reporting."""
+    print("🧪 Testing Async Message Writer\n")
+
+    async def run(messages_dir: str):
+        message_db = FailingMessageDB(messages_dir)
+        writer = AsyncMessageWriter(message_db, max_workers=3, max_pending=4)
+
+        # Five batches per chat, interleaved across chats
+        for batch in range(5):
+            for chat_id in (1, 2, 3, 13):
+                message_id = chat_id * 100 + batch
+                await writer.submit(
+                    chat_id,
+                    [create_mock_message(message_id, f"2025-01-2{batch}T10:00:00Z")],
+                    chat_state={"chat_updated_at": f"2025-01-2{batch}T10:00:00Z", "chat_last_message": str(batch)}
+                )
+                assert writer.pending_count <= 4, "Back-pressure should bound pending saves"
+        await writer.close()
+        return message_db, writer
+
+    with tempfile.TemporaryDirectory() as tmp:
+        message_db, writer = asyncio.run(run(tmp))
+
+        for chat_id in (1, 2, 3):
+            assert message_db.get_message_count(chat_id) == 5
+            # Last submitted batch is the last one written for the chat
+            assert message_db.get_manifest_entry(chat_id)["chat_last_message"] == "4"
+        print("  ✓ Writes for each chat applied in submission order")
+
+        assert 13 in writer.failed and "disk full" in writer.failed[13]
+        assert set(writer.saved) == {1, 2, 3}
+        print("  ✓ Failed saves reported per chat\n")
+
+    print("✅ Async writer tests passed!")
+
+
+if __name__ == "__main__":
+    test_async_writer()
@@ -170,5 +170,113 @@ def test_central_database():
     print("=" * 50)
 
 
+def test_write_ahead_log():
+    """Test append-only log, tombstones and compaction."""
+    print("🧪 Testing Central Database Write-Ahead Log\n")
+
+    test_db_path = "data/test_wal_chat_list_master.jsonl"
+    db = CentralChatDatabase(test_db_path, compaction_threshold=100)
+    for path in (db.db_path, db.wal_path):
+        path.unlink(missing_ok=True)
+
+    # Base file with 5 chats
+    db.save({i: create_mock_chat(i) for i in range(1, 6)})
+
+    # Incremental run: only changed chats are appended to the log
+    existing = db.load()
+    run_chats = [
+        create_mock_chat(1),  # Unchanged
+        create_mock_chat(2, "2025-01-31T12:00:00Z"),  # Updated
+        create_mock_chat(6),  # New
+    ]
+    changed = db.changed_chats(existing, run_chats)
+    assert [c.id for c in changed] == [2, 6], "Only updated and new chats should be written"
+
+    appended = db.append(changed)
+    assert appended == 2
+    with open(db.wal_path, 'r', encoding='utf-8') as f:
+        assert len(f.readlines()) == 2, "Log should hold exactly the changed chats"
+    with open(test_db_path, 'r', encoding='utf-8') as f:
+        assert len(f.readlines()) == 5, "Base file should be untouched by append"
+    print("  ✓ Append writes only changed chats")
+
+    # Latest record wins, tombstones remove
+    db.append([create_mock_chat(2, "2025-02-01T09:00:00Z")])
+    db.delete([3])
+
+    loaded = CentralChatDatabase(test_db_path).load()
+    assert len(loaded) == 5, "Should have 5 chats after upsert/delete"
+    assert loaded[2].updated_at == "2025-02-01T09:00:00Z", "Newest log record should win"
+    assert 3 not in loaded, "Tombstoned chat should be gone"
+    assert 6 in loaded, "Appended chat should be present"
+    print("  ✓ Replay applies latest upserts and tombstones")
+
+    # Compaction folds the log into the sorted base file
+    db.compact()
+    assert not db.wal_path.exists(), "Log should be removed after compaction"
+    with open(test_db_path, 'r', encoding='utf-8') as f:
+        ids = [json.loads(line)['id'] for line in f]
+    assert ids == [1, 2, 4, 5, 6], "Base file should be sorted and complete"
+    assert db.load() == loaded, "Compaction must not change contents"
+    print("  ✓ Compaction produces sorted base file\n")
+
+    Path(test_db_path).unlink()
+
+
+def test_offset_index():
+    """Test indexed get/get_many lookups and index invalidation."""
+    print("🧪 Testing Central Database Offset Index\n")
+
+    test_db_path = "data/test_idx_chat_list_master.jsonl"
+    db = CentralChatDatabase(test_db_path)
+    for path in (db.db_path, db.wal_path, db.index_path):
+        path.unlink(missing_ok=True)
+
+    chats = {i: create_mock_chat(i) for i in range(1, 6)}
+    chats[4].quote.is_hired = True
+    db.save(chats)
+
+    assert db.get(3) == chats[3], "get() should decode the stored record"
+    assert db.get(99) is None, "Unknown chat should return None"
+    assert db.index_path.exists(), "Index sidecar should be persisted"
+    assert db.hired_ids() == [4]
+    print("  ✓ Lookups served from base file index")
+
+    # Log records override base records; a fresh instance picks up the changes
+    updated = create_mock_chat(2, "2025-02-01T09:00:00Z")
+    updated.quote.is_hired = True
+    db.append([updated, create_mock_chat(7)])
+    db.delete([4])
+
+    fresh = CentralChatDatabase(test_db_path)
+    found = fresh.get_many([1, 2, 4, 7])
+    assert sorted(found) == [1, 2, 7], "Tombstoned chat should not be returned"
+    assert found[2].updated_at == "2025-02-01T09:00:00Z", "Log record should win"
+    assert fresh.hired_ids() == [2]
+    print("  ✓ Index follows log upserts and tombstones")
+
+    # Raw records (what load_hired_chats returns): stored order, every API field
+    with open(db.db_path, 'r', encoding='utf-8') as f:
+        base_order = [json.loads(line)["id"] for line in f if line.strip()]
+    raw = fresh.get_raw_many([7, 5, 2, 1, 4])
+    assert list(raw) == [chat_id for chat_id in base_order if chat_id in (1, 2, 5)] + [7]
+    assert raw[2]["updated_at"] == "2025-02-01T09:00:00Z" and isinstance(raw[2], dict)
+    with open(db.wal_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({"op": "upsert", "chat": {**raw[7], "unmodeled_field": "kept"}}) + '\n')
+    assert fresh.get_raw_many([7])[7]["unmodeled_field"] == "kept"
+    print("  ✓ Raw records keep stored order and unmodeled fields")
+
+    # Rewriting the base file invalidates the index
+    db.save({1: create_mock_chat(1, "2025-03-01T00:00:00Z")})
+    assert fresh.get(1).updated_at == "2025-03-01T00:00:00Z"
+    assert fresh.get(2) is None, "Index should be rebuilt after base rewrite"
+    print("  ✓ Index rebuilt when file size/mtime change\n")
+
+    for path in (db.db_path, db.wal_path, db.index_path):
+        path.unlink(missing_ok=True)
+
+
 if __name__ == "__main__":
     test_central_database()
+    test_write_ahead_log()
+    test_offset_index()
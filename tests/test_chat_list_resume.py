@@ -0,0 +1,95 @@
+"""Test script for chat list checkpoints and resume."""
+
+import asyncio
+import json
+import tempfile
+from pathlib import Path
+
+from src import config
+from src.scraper.chat_list_scraper import CHECKPOINT_FILE, ChatListScraper
+from src.scraper.response_archive import ARCHIVE_FILE, iter_archive
+from src.utils import RunLogger
+from test_central_db import create_mock_chat
+
+
+def page(number: int, last: int = 6):
+    """Chat list page `number` (10 chats); its `next` cursor is the following page."""
+    return {
+        "next": str(number + 1) if number < last else None,
+        "results": [create_mock_chat(number * 10 + i).model_dump(mode="json") for i in range(10)]
+    }
+
+
+class FakeRoute:
+    """Records how route_to_resume_cursor continues a request."""
+
+    def __init__(self, url: str):
+        self.request = type("Request", (), {"url": url})()
+        self.continued_with = "not called"
+
+    async def continue_(self, url=None):
+        self.continued_with = url
+
+
+def test_chat_list_resume():
+    """Test checkpoint intervals, restore from the archive and the resume route."""
+    print("🧪 Testing Chat List Resume\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        run_dir = Path(tmp) / "2025-01-01_00-00-00_chat_list_abcd1234"
+        run_logger = RunLogger("chat_list", run_dir=run_dir)
+        scraper = ChatListScraper(run_logger)
+        scraper.checkpoint_interval = 25
+        checkpoint_path = run_dir / CHECKPOINT_FILE
+
+        # Checkpoints when the chat count crosses a multiple of the interval
+        checkpoints = []
+        for number in range(1, 7):
+            asyncio.run(scraper.process_api_page(page(number, last=99)))
+            if checkpoint_path.exists():
+                state = json.loads(checkpoint_path.read_text(encoding='utf-8'))
+                if state["api_call_count"] not in checkpoints:
+                    checkpoints.append(state["api_call_count"])
+        assert checkpoints == [3, 5], checkpoints
+        assert scraper.last_checkpoint_count == 50
+        print("  ✓ Checkpoints at 30 and 50 chats (interval 25)")
+
+        # Crash after page 6 reached the archive but before the next checkpoint
+        run_logger.flush_api_responses()
+        assert [index for index, _ in iter_archive(run_dir / ARCHIVE_FILE)] == list(range(1, 7))
+
+        resumed = ChatListScraper(RunLogger("chat_list", run_dir=run_dir))
+        resumed.restore_checkpoint(resumed.tracker.load_checkpoint(checkpoint_path))
+        assert [chat["id"] for chat in resumed.tracker.all_chats] == [
+            number * 10 + i for number in range(1, 6) for i in range(10)
+        ]
+        assert resumed.api_call_count == 5 and resumed.last_checkpoint_count == 50
+        assert resumed.has_more_chats and resumed.next_cursor == "6" and resumed.resume_cursor == "6"
+        assert resumed.run_logger.metadata.resumes == 1
+        assert [index for index, _ in iter_archive(run_dir / ARCHIVE_FILE)] == list(range(1, 6))
+        print("  ✓ Chats rebuilt from the archive; pages past the checkpoint truncated")
+
+        # The page's first chat list request is sent to the saved cursor, once
+        first = FakeRoute(f"{config.SOOMGO_API_URL}/api/v2.4/chats")
+        asyncio.run(resumed.route_to_resume_cursor(first))
+        assert first.continued_with == f"{config.SOOMGO_API_URL}/api/v2.4/chats?cursor=6"
+        assert resumed.resume_cursor is None
+        later = FakeRoute(f"{config.SOOMGO_API_URL}/api/v2.4/chats?cursor=7")
+        asyncio.run(resumed.route_to_resume_cursor(later))
+        assert later.continued_with is None
+        print("  ✓ First request redirected to the resume cursor")
+
+        # The resumed run reaches the end of the list: final checkpoint, nothing to resume
+        asyncio.run(resumed.process_api_page(page(6)))
+        final = ChatListScraper(RunLogger("chat_list", run_dir=run_dir))
+        final.restore_checkpoint(final.tracker.load_checkpoint(checkpoint_path))
+        assert len(final.tracker.all_chats) == 60
+        assert not final.has_more_chats and final.next_cursor is None and final.resume_cursor is None
+        assert final.run_logger.metadata.resumes == 2
+        print("  ✓ End-of-list checkpoint leaves nothing to resume\n")
+
+    print("✅ Chat list resume tests passed!")
+
+
+if __name__ == "__main__":
+    test_chat_list_resume()
@@ -0,0 +1,69 @@
+"""Test script for the adaptive (AIMD) concurrency controller."""
+
+import asyncio
+import time
+
+from src.scraper.concurrency import AdaptiveConcurrency
+
+
+def test_adaptive_concurrency():
+    """Test additive increase, multiplicative decrease and worker parking."""
+    print("🧪 Testing Adaptive Concurrency\n")
+
+    async def run():
+        controller = AdaptiveConcurrency(
+            max_workers=4, min_workers=1, min_delay=1.0, max_delay=8.0,
+            latency_target=2.0, initial_delay=3.0, increase_after=2
+        )
+        assert controller.active_workers == 1 and controller.delay == 3.0
+
+        # Additive increase: +1 worker and -1s delay per 2 clean chats, up to the bounds
+        for _ in range(8):
+            await controller.record(started_at=time.time(), page_latency=0.5)
+        assert controller.active_workers == 4 and controller.delay == 1.0
+        assert controller.increases == 3
+        print("  ✓ Clean chats raise workers and lower the delay within bounds")
+
+        # Multiplicative decrease on a slow page, once per incident
+        started = time.time()
+        await controller.record(started_at=started, page_latency=3.5)
+        await controller.record(started_at=started, errors=2)
+        assert controller.active_workers == 2 and controller.delay == 2.0 and controller.decreases == 1
+        await controller.record(started_at=time.time(), empty=True)
+        await controller.record(started_at=time.time(), failed=True)
+        assert controller.active_workers == 1 and controller.delay == 8.0
+        assert controller.congestion_reason(backoffs=1) is not None
+        assert controller.congestion_reason(page_latency=1.0) is None
+        print("  ✓ Congestion halves workers and doubles the delay, once per incident")
+
+        # Worker 1 is parked until an increase lets it in
+        entered = asyncio.Event()
+
+        async def worker():
+            await controller.wait_turn(1)
+            entered.set()
+
+        task = asyncio.create_task(worker())
+        await asyncio.sleep(0.01)
+        assert not entered.is_set()
+        for _ in range(2):
+            await controller.record(started_at=time.time(), page_latency=0.5)
+        await asyncio.wait_for(task, 1)
+        print("  ✓ Parked workers resume when let in")
+
+        # Closing releases parked workers
+        parked = asyncio.create_task(controller.wait_turn(3))
+        await asyncio.sleep(0.01)
+        assert not parked.done()
+        await controller.close()
+        await asyncio.wait_for(parked, 1)
+        summary = controller.summary()
+        assert summary["peak_workers"] == 4 and len(summary["history"]) == summary["increases"] + summary["decreases"]
+        print("  ✓ close() releases parked workers\n")
+
+    asyncio.run(run())
+    print("✅ Adaptive concurrency tests passed!")
+
+
+if __name__ == "__main__":
+    test_adaptive_concurrency()
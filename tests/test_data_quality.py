@@ -0,0 +1,52 @@
+"""Test script for the chunked data quality accumulator."""
+
+from src.scraper.data_quality import QualityAccumulator, generate_quality_report
+from test_central_db import create_mock_chat
+from test_sqlite_store import create_mock_message
+
+
+def comparable(report) -> dict:
+    """Report contents without the generation timestamp."""
+    return report.model_dump(exclude={"generated_at"})
+
+
+def test_quality_accumulator():
+    """Test that a chunked report equals a report over all records at once."""
+    print("🧪 Testing Quality Accumulator\n")
+
+    # Messages as a run writes them, including messy ones
+    messages = [
+        create_mock_message(i, f"2025-01-{i % 28 + 1:02d}T10:00:00Z").model_dump(mode="json")
+        for i in range(1, 41)
+    ]
+    messages[3]["message"] = ""
+    messages[7]["created_at"] = None
+    messages.append(dict(messages[5]))  # duplicate id
+    del messages[10]["user"]
+
+    # Chat list records exercise the nested fields and last_message
+    chats = [create_mock_chat(i).model_dump(mode="json") for i in range(1, 16)]
+    chats[2]["quote"]["price"] = -5
+    chats[4]["last_message"] = None
+    chats[6]["updated_at"] = "2024-12-01T00:00:00Z"  # before created_at
+    chats[8]["user"]["name"] = ""
+    chats[9]["service"] = {}
+
+    for records in (messages, chats):
+        expected = comparable(generate_quality_report(records))
+        for chunk_size in (1, 7, len(records)):
+            accumulator = QualityAccumulator()
+            for start in range(0, len(records), chunk_size):
+                accumulator.add(records[start:start + chunk_size])
+            assert comparable(accumulator.report()) == expected, chunk_size
+    print("  ✓ Chunked reports match generate_quality_report over all records")
+
+    empty = QualityAccumulator()
+    assert comparable(empty.report()) == comparable(generate_quality_report([]))
+    print("  ✓ Empty run\n")
+
+    print("✅ Quality accumulator tests passed!")
+
+
+if __name__ == "__main__":
+    test_quality_accumulator()
@@ -0,0 +1,107 @@
+"""Test script for the direct API client against a local stand-in server."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from src.scraper.direct_api import DirectApiClient, DirectApiError, TokenBucket
+
+
+class RecordedApiHandler(BaseHTTPRequestHandler):
+    """Serves three chat list pages (bare cursors) and two message pages (URL cursors)."""
+
+    requests = []
+    fail_next = 0
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        RecordedApiHandler.requests.append(self.path)
+
+        if RecordedApiHandler.fail_next > 0:
+            RecordedApiHandler.fail_next -= 1
+            self._send(503, {"detail": "unavailable"})
+        elif url.path == "/api/v2.4/chats":
+            page = int(query.get("cursor", ["0"])[0])
+            self._send(200, {
+                "next": str(page + 1) if page < 2 else None,
+                "results": [{"id": page * 10 + i} for i in range(10)]
+            })
+        elif url.path == "/api/v2.2/chats/7/messages":
+            if "next" in query:
+                self._send(200, {"next": None, "results": [{"id": 1}]})
+            else:
+                origin = f"http://127.0.0.1:{self.server.server_port}"
+                self._send(200, {"next": f"{origin}{url.path}?next=abc", "results": [{"id": 2}]})
+        else:
+            self._send(404, {"detail": "not found"})
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_direct_api():
+    """Test cursor following, retries and rate limiting."""
+    print("🧪 Testing Direct API Client\n")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RecordedApiHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    async def run():
+        async with DirectApiClient(base_url=base_url, session_file="missing.json", rate=0, retry_base_delay=0.01) as client:
+            chat_pages = [page async for page in client.iter_chat_list_pages()]
+            assert [len(page["results"]) for page in chat_pages] == [10, 10, 10]
+            assert RecordedApiHandler.requests[-1] == "/api/v2.4/chats?cursor=2"
+            print("  ✓ Bare cursors sent back as query parameter")
+
+            resumed_pages = [page async for page in client.iter_chat_list_pages(start="1")]
+            assert [page["results"][0]["id"] for page in resumed_pages] == [10, 20]
+            assert RecordedApiHandler.requests[-2] == "/api/v2.4/chats?cursor=1"
+            print("  ✓ Iteration resumes from a saved cursor")
+
+            message_pages = [page async for page in client.iter_message_pages(7)]
+            assert [page["results"][0]["id"] for page in message_pages] == [2, 1]
+            print("  ✓ URL cursors requested as is")
+
+            RecordedApiHandler.fail_next = 2
+            data = await client.get_json("/api/v2.4/chats")
+            assert data["results"] and client.retry_count == 2
+            print("  ✓ 503 responses retried")
+
+            try:
+                await client.get_json("/unknown")
+                assert False, "404 should not be retried"
+            except DirectApiError:
+                pass
+            print("  ✓ Other errors raised without retry")
+
+        bucket = TokenBucket(rate=20, burst=2)
+        started = time.monotonic()
+        for _ in range(6):
+            await bucket.acquire()
+        elapsed = time.monotonic() - started
+        assert 0.15 <= elapsed < 0.5, f"6 requests at 20/s (burst 2) took {elapsed:.2f}s"
+        print("  ✓ Token bucket paces requests after the burst\n")
+
+    try:
+        asyncio.run(run())
+    finally:
+        server.shutdown()
+
+    print("✅ Direct API tests passed!")
+
+
+if __name__ == "__main__":
+    test_direct_api()
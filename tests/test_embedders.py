@@ -0,0 +1,110 @@
+"""Test script for the offline embedding backend of the knowledge retriever."""
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.knowledge import Embedder, HashedNgramEmbedder, KnowledgeRetriever, make_embedder
+
+FAQS = [
+    {"question": "자기소개서 첨삭 가격이 얼마인가요?", "answer": "100자당 6,000원입니다."},
+    {"question": "환불은 어떻게 받을 수 있나요?", "answer": "착수 전 100% 환불됩니다."},
+    {"question": "급하게 24시간 안에 받을 수 있나요?", "answer": "급행은 50,000원 추가입니다."},
+    {"question": "이력서도 같이 봐주시나요?", "answer": "이력서 첨삭도 가능합니다."},
+    {"question": "결제는 어떤 방법으로 하나요?", "answer": "카드와 계좌이체가 가능합니다."},
+]
+
+
+def write_knowledge_base(data_dir: Path) -> None:
+    """Minimal knowledge base for retrieval tests."""
+    (data_dir / "structured").mkdir(parents=True)
+    (data_dir / "semantic").mkdir()
+    for name in ("services", "policies"):
+        (data_dir / "structured" / f"{name}.json").write_text("{}", encoding="utf-8")
+    (data_dir / "semantic" / "faq.json").write_text(json.dumps({"faqs": FAQS}, ensure_ascii=False), encoding="utf-8")
+
+
+def test_hashed_ngram_embedder():
+    """Test vector shape, normalization and Korean similarity."""
+    print("🧪 Testing Hashed N-gram Embedder\n")
+
+    embedder = HashedNgramEmbedder(dim=1024)
+    embedder.fit([faq["question"] for faq in FAQS])
+    vectors = embedder.embed(["자소서 가격 얼마예요?", "자기소개서 첨삭 가격이 얼마인가요?", "결제 방법"])
+    assert vectors.shape == (3, 1024)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+    assert vectors[0] @ vectors[1] > vectors[0] @ vectors[2]
+    assert np.array_equal(embedder.embed(["환불"]), embedder.embed(["환불!"]))
+    assert not embedder.embed(["?!"]).any()
+    print("  ✓ Unit vectors; similar Korean phrasing scores higher")
+
+    class NoEmbed(Embedder):
+        name = "incomplete"
+
+    try:
+        NoEmbed()
+        assert False, "backend without embed() should not instantiate"
+    except TypeError:
+        pass
+    print("  ✓ Backends missing embed() fail at construction\n")
+
+    print("✅ Hashed n-gram embedder tests passed!")
+
+
+def test_offline_retrieval():
+    """Test retrieval without OPENAI_API_KEY and its latency."""
+    print("🧪 Testing Offline Retrieval\n")
+
+    saved_key = os.environ.pop("OPENAI_API_KEY", None)
+    try:
+        assert isinstance(make_embedder("auto"), HashedNgramEmbedder)
+        try:
+            make_embedder("openai")
+            assert False, "openai backend must require an API key"
+        except ValueError:
+            pass
+
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp) / "knowledge"
+            write_knowledge_base(data_dir)
+            retriever = KnowledgeRetriever(data_dir=str(data_dir), embedder=make_embedder("local"))
+            assert not (data_dir / "embeddings").exists()
+            print("  ✓ Local backend needs no API key and writes no cache")
+
+            cases = {
+                "환불 받을 수 있나요?": FAQS[1]["question"],
+                "24시간 안에 급하게 가능해요?": FAQS[2]["question"],
+                "결제 방법이 궁금해요": FAQS[4]["question"],
+            }
+            for query, expected in cases.items():
+                faqs = retriever.retrieve(query, top_k=1)["faqs"]
+                assert faqs and faqs[0]["question"] == expected, query
+            print("  ✓ Korean queries retrieve the matching FAQ")
+
+            # The backend's own threshold keeps small talk out
+            assert retriever.embedder.default_threshold < Embedder.default_threshold
+            for small_talk in ("안녕하세요", "네 감사합니다", "잠시만요"):
+                assert not retriever.retrieve(small_talk)["faqs"], small_talk
+            print("  ✓ Default threshold follows the embedding backend")
+
+            queries = [f"자소서 가격 문의 {i}번" for i in range(200)]
+            started = time.perf_counter()
+            for query in queries:
+                retriever._semantic_search(query, 3, 0.0)
+            per_query = (time.perf_counter() - started) / len(queries)
+            assert per_query < 0.005, per_query
+            print(f"  ✓ Uncached query search: {per_query * 1000:.3f} ms\n")
+    finally:
+        if saved_key is not None:
+            os.environ["OPENAI_API_KEY"] = saved_key
+
+    print("✅ Offline retrieval tests passed!")
+
+
+if __name__ == "__main__":
+    test_hashed_ngram_embedder()
+    test_offline_retrieval()
@@ -0,0 +1,140 @@
+"""Test script for the persistent FAQ embedding cache."""
+
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.knowledge.embedding_cache import EmbeddingCache, QueryEmbeddingCache
+
+
+def fake_embed(calls):
+    """Deterministic embedder that records which texts it was asked for."""
+    def embed(texts):
+        calls.append(list(texts))
+        return np.array([[len(text), sum(map(ord, text)) % 97, 1.0] for text in texts])
+    return embed
+
+
+def test_embedding_cache():
+    """Test incremental embedding, reloads, model separation and corruption."""
+    print("🧪 Testing Embedding Cache\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        calls = []
+        questions = ["자소서 가격이 얼마예요?", "환불 가능한가요?", "급하게 할 수 있나요?"]
+
+        cache = EmbeddingCache(Path(tmp), "text-embedding-3-small")
+        first = cache.get_many(questions, fake_embed(calls))
+        assert first.shape == (3, 3) and first.dtype == np.float32
+        assert calls == [questions] and cache.misses == 3
+        print("  ✓ Cold cache embeds every question once")
+
+        # New process: everything comes from the memory-mapped file
+        calls.clear()
+        reloaded = EmbeddingCache(Path(tmp), "text-embedding-3-small")
+        assert isinstance(reloaded.matrix, np.memmap)
+        assert np.array_equal(reloaded.get_many(questions, fake_embed(calls)), first)
+        assert calls == [] and reloaded.hits == 3
+        print("  ✓ Unchanged knowledge base loads without embedding calls")
+
+        # One edited and one added FAQ: only those two are embedded
+        edited = [questions[0], "환불은 언제까지 되나요?", questions[2], "수정은 몇 번 되나요?"]
+        matrix = reloaded.get_many(edited, fake_embed(calls))
+        assert calls == [["환불은 언제까지 되나요?", "수정은 몇 번 되나요?"]]
+        assert np.array_equal(matrix[0], first[0]) and np.array_equal(matrix[2], first[2])
+        print("  ✓ Only new or changed questions are embedded")
+
+        # The edited question's old row is pruned along with its matrix file
+        assert len(EmbeddingCache(Path(tmp), "text-embedding-3-small")) == 4
+        assert [path.name for path in Path(tmp).glob("*.npy")] == [reloaded.matrix_name]
+        print("  ✓ Rows of questions no longer requested are dropped")
+
+        # Two processes rewriting the same cache: the metadata always names the
+        # matrix written together with its keys
+        calls.clear()
+        writer_a = EmbeddingCache(Path(tmp), "text-embedding-3-small")
+        writer_b = EmbeddingCache(Path(tmp), "text-embedding-3-small")
+        writer_a.get_many(edited + ["추가 질문 A"], fake_embed(calls))
+        writer_b.get_many(questions, fake_embed(calls))
+        latest = EmbeddingCache(Path(tmp), "text-embedding-3-small")
+        assert latest.matrix_name == writer_b.matrix_name and len(latest) == 3
+        assert np.array_equal(latest.get_many(questions, fake_embed(calls)), first)
+        print("  ✓ Concurrent rewrites never pair keys with another writer's rows")
+
+        # Switching to a model with another dimension under the same cache
+        # name: the old vectors are discarded and everything is re-embedded
+        calls.clear()
+        switched = EmbeddingCache(Path(tmp), "text-embedding-3-small")
+
+        def wide_embed(texts):
+            calls.append(list(texts))
+            return np.ones((len(texts), 5))
+        wide = switched.get_many(questions[:2] + ["새 질문"], wide_embed)
+        assert wide.shape == (3, 5) and len(calls) == 2
+        assert sorted(sum(calls, [])) == sorted(questions[:2] + ["새 질문"])
+        assert EmbeddingCache(Path(tmp), "text-embedding-3-small").matrix.shape == (3, 5)
+        switched.get_many(questions, fake_embed(calls))
+        print("  ✓ Dimension change discards the cache and re-embeds")
+
+        # Other models have their own files
+        calls.clear()
+        EmbeddingCache(Path(tmp), "text-embedding-3-large").get_many(questions[:1], fake_embed(calls))
+        assert calls == [questions[:1]]
+        print("  ✓ Cache entries are keyed by model")
+
+        # Metadata out of sync with the matrix: cache is ignored and rebuilt
+        meta_path = Path(tmp) / "text-embedding-3-small.json"
+        meta = json.loads(meta_path.read_text())
+        meta["keys"] = meta["keys"][:2]
+        meta_path.write_text(json.dumps(meta))
+        calls.clear()
+        rebuilt = EmbeddingCache(Path(tmp), "text-embedding-3-small")
+        assert len(rebuilt) == 0
+        rebuilt.get_many(questions, fake_embed(calls))
+        assert calls == [questions] and len(EmbeddingCache(Path(tmp), "text-embedding-3-small")) == 3
+        print("  ✓ Inconsistent cache files are discarded\n")
+
+    print("✅ Embedding cache tests passed!")
+
+
+def test_query_embedding_cache():
+    """Test LRU eviction, TTL expiry and key normalization of query embeddings."""
+    print("🧪 Testing Query Embedding Cache\n")
+
+    calls = []
+
+    def embed(text):
+        calls.append(text)
+        return np.array([float(len(text))])
+
+    cache = QueryEmbeddingCache(max_size=2, ttl_seconds=0)
+    cache.get("얼마인가요?", embed)
+    cache.get("  얼마인가요? ", embed)
+    assert calls == ["얼마인가요?"] and cache.hits == 1
+    print("  ✓ Repeated queries (modulo whitespace) hit the cache")
+
+    cache.get("환불 되나요?", embed)
+    cache.get("얼마인가요?", embed)
+    cache.get("급행 가능한가요?", embed)
+    assert len(cache) == 2
+    cache.get("얼마인가요?", embed)
+    cache.get("환불 되나요?", embed)
+    assert calls == ["얼마인가요?", "환불 되나요?", "급행 가능한가요?", "환불 되나요?"]
+    print("  ✓ Least recently used query evicted at capacity")
+
+    expiring = QueryEmbeddingCache(max_size=8, ttl_seconds=0.05)
+    expiring.get("네 감사합니다", embed)
+    time.sleep(0.06)
+    expiring.get("네 감사합니다", embed)
+    assert expiring.misses == 2
+    print("  ✓ Entries expire after the TTL\n")
+
+    print("✅ Query embedding cache tests passed!")
+
+
+if __name__ == "__main__":
+    test_embedding_cache()
+    test_query_embedding_cache()
@@ -0,0 +1,98 @@
+"""Test script for the incremental chat list stop rule."""
+
+import asyncio
+import tempfile
+from pathlib import Path
+
+from src.scraper.central_db import CentralChatDatabase
+from src.scraper.chat_list_scraper import ChatListScraper, sync_chat_list
+from src.utils import RunLogger
+from test_central_db import create_mock_chat
+
+
+def make_scraper(tmp: Path, stored_ids) -> ChatListScraper:
+    """Incremental scraper whose central database holds `stored_ids`."""
+    chat_db = CentralChatDatabase(str(tmp / "chat_list_master.jsonl"))
+    chat_db.save({chat_id: create_mock_chat(chat_id) for chat_id in stored_ids})
+
+    scraper = ChatListScraper(RunLogger("chat_list", run_dir=tmp / "run"), dry_run=True)
+    scraper.incremental = True
+    scraper.chat_db = chat_db
+    return scraper
+
+
+def page(chats, next_cursor="next-page"):
+    """Chat list API page."""
+    return {"next": next_cursor, "results": [chat.model_dump(mode="json") for chat in chats]}
+
+
+def test_incremental_stop_rule():
+    """Test when a chat list page ends an incremental sync."""
+    print("🧪 Testing Incremental Chat List Stop\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        scraper = make_scraper(tmp, range(1, 6))
+
+        # Every chat matches the database: stop
+        unchanged = [create_mock_chat(chat_id) for chat_id in (3, 4, 5)]
+        assert scraper.is_page_unchanged(page(unchanged)["results"])
+        asyncio.run(scraper.process_api_page(page(unchanged)))
+        assert not scraper.has_more_chats
+        print("  ✓ Page of unchanged chats stops pagination")
+
+        # One chat with a new updated_at or last_message: continue
+        for field, value in (("updated_at", "2025-02-01T00:00:00Z"), ("last_message", "새 메시지")):
+            changed = [create_mock_chat(chat_id) for chat_id in (3, 4, 5)]
+            setattr(changed[1], field, value)
+            assert not scraper.is_page_unchanged(page(changed)["results"]), field
+
+        scraper = make_scraper(tmp / "changed", range(1, 6))
+        changed = [create_mock_chat(1, "2025-02-01T00:00:00Z"), create_mock_chat(2)]
+        asyncio.run(scraper.process_api_page(page(changed)))
+        assert scraper.has_more_chats
+        print("  ✓ Page with a changed updated_at or last_message continues")
+
+        # A chat the database has never seen: continue
+        unknown = [create_mock_chat(4), create_mock_chat(99)]
+        assert not scraper.is_page_unchanged(page(unknown)["results"])
+        asyncio.run(scraper.process_api_page(page(unknown)))
+        assert scraper.has_more_chats
+        print("  ✓ Page with an unknown chat continues")
+
+        # Empty page: the rule does not fire (the end of the list is handled by `next`)
+        assert not scraper.is_page_unchanged([])
+        print("  ✓ Empty page does not trigger the rule\n")
+
+    print("✅ Incremental chat list stop tests passed!")
+
+
+def test_sync_chat_list():
+    """Test that saving a run touches only the run's chats."""
+    print("🧪 Testing Chat List Sync\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        chat_db = CentralChatDatabase(str(Path(tmp) / "chat_list_master.jsonl"))
+        chat_db.save({chat_id: create_mock_chat(chat_id) for chat_id in range(1, 101)})
+
+        def full_load():
+            raise AssertionError("sync must not load the whole database")
+        chat_db.load = full_load
+
+        run = [create_mock_chat(5, "2025-02-01T00:00:00Z"), create_mock_chat(6), create_mock_chat(200)]
+        assert sync_chat_list(chat_db, run) == (1, 1)
+        assert chat_db.get(5).updated_at == "2025-02-01T00:00:00Z" and chat_db.get(200)
+        print("  ✓ New and changed chats counted from indexed lookups")
+
+        wal_records = chat_db.wal_path.read_text().splitlines()
+        assert len(wal_records) == 2, "Only the changed chats are appended"
+        assert sync_chat_list(chat_db, run) == (0, 0)
+        assert len(chat_db.wal_path.read_text().splitlines()) == 2
+        print("  ✓ Unchanged chats are not rewritten\n")
+
+    print("✅ Chat list sync tests passed!")
+
+
+if __name__ == "__main__":
+    test_incremental_stop_rule()
+    test_sync_chat_list()
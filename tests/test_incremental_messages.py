@@ -0,0 +1,64 @@
+"""Test script for the incremental (watermark) stop of message scraping."""
+
+import asyncio
+
+from src.scraper.chat_message_scraper import ChatMessageScraper
+from test_sqlite_store import create_mock_message
+
+
+def message_page(message_ids, next_cursor=1):
+    """API page with messages created on consecutive days (id n -> Jan n)."""
+    return {
+        "next": next_cursor,
+        "results": [
+            create_mock_message(message_id, f"2025-01-{message_id:02d}T10:00:00Z").model_dump(mode="json")
+            for message_id in message_ids
+        ]
+    }
+
+
+def test_incremental_messages():
+    """Test overlaps_stored and the early stop in process_api_page."""
+    print("🧪 Testing Incremental Message Stop\n")
+
+    watermark = {"last_message_id": 10, "last_created_at": "2025-01-10T10:00:00Z"}
+
+    # Page containing the stored last message id
+    scraper = ChatMessageScraper(7, watermark=watermark)
+    assert scraper.overlaps_stored(message_page([12, 11, 10]))
+    asyncio.run(scraper.process_api_page(message_page([12, 11, 10])))
+    assert scraper.reached_stored and not scraper.has_more_messages
+    assert len(scraper.tracker.all_messages) == 3, "Overlapping page is still saved"
+    print("  ✓ Page with the stored last message stops scrolling")
+
+    # Stored last message deleted remotely: an older created_at still overlaps
+    scraper = ChatMessageScraper(7, watermark=watermark)
+    assert scraper.overlaps_stored(message_page([13, 9]))
+    assert not scraper.overlaps_stored({"results": [{"id": 9}]}), "No created_at, no overlap"
+    print("  ✓ Page reaching the stored created_at stops scrolling")
+
+    # Only newer messages: keep going
+    scraper = ChatMessageScraper(7, watermark=watermark)
+    assert not scraper.overlaps_stored(message_page([15, 14, 13]))
+    asyncio.run(scraper.process_api_page(message_page([15, 14, 13])))
+    assert scraper.has_more_messages and not scraper.reached_stored
+    print("  ✓ Page without overlap continues")
+
+    # Full scrape (no watermark, or nothing stored yet)
+    for no_watermark in (None, {"last_message_id": None}):
+        scraper = ChatMessageScraper(7, watermark=no_watermark)
+        assert not scraper.overlaps_stored(message_page([12, 11, 10]))
+        asyncio.run(scraper.process_api_page(message_page([12, 11, 10])))
+        assert scraper.has_more_messages and not scraper.reached_stored
+
+    # Last page ends the chat without counting as reaching stored messages
+    scraper = ChatMessageScraper(7, watermark=watermark)
+    asyncio.run(scraper.process_api_page(message_page([11, 10], next_cursor=None)))
+    assert not scraper.has_more_messages and not scraper.reached_stored
+    print("  ✓ No watermark never stops early\n")
+
+    print("✅ Incremental message stop tests passed!")
+
+
+if __name__ == "__main__":
+    test_incremental_messages()
@@ -0,0 +1,71 @@
+"""Test script for the Aho–Corasick keyword matcher."""
+
+import random
+import time
+
+from src.knowledge.keyword_matcher import KeywordAutomaton
+
+
+def brute_force(entries, text):
+    """Reference: the old per-entry substring scan."""
+    return {entry for entry, keywords in entries.items() if any(kw in text for kw in keywords)}
+
+
+def test_keyword_matcher():
+    """Test overlapping keywords, Korean text and equivalence with substring scans."""
+    print("🧪 Testing Keyword Matcher\n")
+
+    automaton = KeywordAutomaton()
+    for entry, keywords in {"he": ["he"], "she": ["she"], "his": ["his"], "hers": ["hers"]}.items():
+        automaton.add_all(keywords, entry)
+    assert automaton.find("ushers") == {"he", "she", "hers"}
+    assert automaton.find("this") == {"his"} and automaton.find("xyz") == set()
+    print("  ✓ Overlapping and nested keywords found in one pass")
+
+    services = {
+        "자기소개서": ["자소서", "자기소개서", "첨삭"],
+        "이력서": ["이력서", "cv"],
+        "급행": ["급행", "급하게", "24시간"],
+        "환불": ["환불", "취소"],
+        "전체": [""],
+    }
+    automaton = KeywordAutomaton()
+    for entry, keywords in services.items():
+        automaton.add_all(keywords, entry)
+    assert automaton.find("자소서 급하게 첨삭 가능해요?") == {"자기소개서", "급행", "전체"}
+    assert automaton.find("환불 규정") == {"환불", "전체"}
+    print("  ✓ Korean keywords map back to their entries")
+
+    # Randomized equivalence with the substring scan it replaces
+    rng = random.Random(7)
+    alphabet = "가나다라ab"
+    entries = {
+        i: ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 3))]
+        for i in range(60)
+    }
+    automaton = KeywordAutomaton()
+    for entry, keywords in entries.items():
+        automaton.add_all(keywords, entry)
+    for _ in range(300):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert automaton.find(text) == brute_force(entries, text), text
+    print("  ✓ Same matches as the per-entry substring scan")
+
+    # Incremental adds rebuild lazily
+    automaton.add("zz", "late")
+    assert "late" in automaton.find("azzb")
+
+    large = KeywordAutomaton()
+    for i in range(5000):
+        large.add(f"서비스{i}번", i)
+    large.build()
+    started = time.perf_counter()
+    assert large.find("서비스42번 가격이 얼마예요?") == {42}
+    assert time.perf_counter() - started < 0.01
+    print("  ✓ Lookup cost independent of the number of keywords\n")
+
+    print("✅ Keyword matcher tests passed!")
+
+
+if __name__ == "__main__":
+    test_keyword_matcher()
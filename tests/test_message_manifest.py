@@ -0,0 +1,105 @@
+"""Test script for the MessageCentralDB stats manifest."""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from src.scraper.message_central_db import MessageCentralDB
+from test_sqlite_store import create_mock_message
+
+
+def test_message_manifest():
+    """Test manifest updates, stale-file repair and rebuild."""
+    print("🧪 Testing Message Manifest\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        messages_dir = Path(tmp) / "messages"
+        db = MessageCentralDB(str(messages_dir), manifest_compaction_threshold=5)
+
+        for chat_id in range(1, 4):
+            db.save_chat_messages(chat_id, {
+                chat_id * 10 + n: create_mock_message(chat_id * 10 + n, f"2025-01-2{n}T10:00:00Z")
+                for n in range(chat_id)
+            })
+
+        entry = db.get_manifest_entry(3)
+        assert entry["message_count"] == 3
+        assert entry["first_message_id"] == 30 and entry["last_message_id"] == 32
+        assert entry["first_created_at"] == "2025-01-20T10:00:00Z"
+        assert entry["last_created_at"] == "2025-01-22T10:00:00Z"
+        assert db.get_stats()["total_messages"] == 6
+        print("  ✓ save_chat_messages records counts and first/last message")
+
+        # Reopen reads the manifest instead of message files
+        reopened = MessageCentralDB(str(messages_dir))
+
+        def directory_scan():
+            raise AssertionError("stats must not list the messages directory")
+        reopened.list_chat_ids = directory_scan
+        assert reopened.get_message_count(2) == 2
+        assert reopened.get_stats()["total_chats_with_messages"] == 3
+        del reopened.list_chat_ids
+        print("  ✓ Counts served from manifest after reopen")
+
+        # File changed outside save_chat_messages is detected by size/mtime
+        chat_file = reopened.get_chat_file_path(1)
+        with open(chat_file, 'a', encoding='utf-8') as f:
+            f.write(create_mock_message(19, "2025-01-29T10:00:00Z").model_dump_json() + '\n')
+        assert reopened.get_message_count(1) == 2
+        assert reopened.get_manifest_entry(1)["last_message_id"] == 19
+        chat_file.unlink()
+        assert reopened.get_manifest_entry(1) is None
+        print("  ✓ Stale and deleted files are repaired on access")
+
+        # Repair after a touch keeps the scheduler watermark
+        state = {"chat_updated_at": "2025-01-30T00:00:00Z", "chat_last_message": "감사합니다"}
+        reopened.save_chat_messages(3, reopened.load_chat_messages(3), chat_state=state)
+        os.utime(reopened.get_chat_file_path(3), ns=(1, 1))
+        repaired = reopened.get_manifest_entry(3)
+        assert repaired["file_mtime_ns"] == 1 and repaired["message_count"] == 3
+        assert {key: repaired[key] for key in state} == state
+        print("  ✓ Repaired entries keep the recorded chat state")
+
+        # Stats come from the manifest alone; files copied in behind its back
+        # are picked up by a rebuild, removed ones on access
+        shutil.copy(reopened.get_chat_file_path(3), reopened.get_chat_file_path(7))
+        assert reopened.get_stats()["total_chats_with_messages"] == 2
+        assert reopened.rebuild_manifest() == 3
+        stats = reopened.get_stats()
+        assert stats["total_chats_with_messages"] == 3 and stats["total_messages"] == 8
+        reopened.get_chat_file_path(7).unlink()
+        assert not reopened.chat_exists(7) and reopened.get_manifest_entry(7) is None
+        assert reopened.get_stats()["total_chats_with_messages"] == 2
+        print("  ✓ Stats served from the manifest, repaired by rebuild or access")
+
+        # Repeated saves compact the append-only manifest
+        for _ in range(10):
+            reopened.save_chat_messages(2, reopened.load_chat_messages(2))
+        with open(reopened.manifest_path, 'r', encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        assert len(lines) <= 2 + 1 + reopened.manifest_compaction_threshold + 1
+        print(f"  ✓ Manifest compacted ({len(lines)} lines)")
+
+        # Lost manifest is rebuilt from disk
+        reopened.manifest_path.unlink()
+        rebuilt = MessageCentralDB(str(messages_dir))
+        stats = rebuilt.get_stats()
+        assert stats["total_chats_with_messages"] == 2
+        assert stats["total_messages"] == 5
+        assert rebuilt.manifest_path.exists()
+        assert rebuilt.get_manifest_entry(3).get("chat_updated_at") is None
+        print("  ✓ Manifest rebuilt from message files")
+
+        # Explicit rebuild over an existing manifest keeps chat states
+        rebuilt.save_chat_messages(3, rebuilt.load_chat_messages(3), chat_state=state)
+        assert MessageCentralDB(str(messages_dir)).rebuild_manifest() == 2
+        assert MessageCentralDB(str(messages_dir)).get_manifest_entry(3)["chat_last_message"] == "감사합니다"
+        print("  ✓ rebuild_manifest() keeps recorded chat states\n")
+
+    print("✅ Message manifest tests passed!")
+
+
+if __name__ == "__main__":
+    test_message_manifest()
@@ -0,0 +1,71 @@
+"""Test script for the local mock Soomgo server."""
+
+import json
+import urllib.error
+import urllib.request
+
+from src.models import ChatListResponse, MessageListResponse
+from src.scraper.mock_server import MockSoomgoServer, generate_corpus
+
+
+def fetch_json(url: str) -> dict:
+    """GET a JSON document from the mock server."""
+    with urllib.request.urlopen(url) as response:
+        return json.load(response)
+
+
+def test_mock_server():
+    """Test corpus shapes, cursor pagination and error injection."""
+    print("🧪 Testing Mock Soomgo Server\n")
+
+    corpus = generate_corpus(45, messages_per_chat=(0, 70), seed=3)
+    assert generate_corpus(45, messages_per_chat=(0, 70), seed=3).chats == corpus.chats, "Same seed, same corpus"
+    updated = [chat["updated_at"] for chat in corpus.chats]
+    assert updated == sorted(updated, reverse=True), "Chats should be newest first"
+    print("  ✓ Deterministic corpus, newest chats first")
+
+    with MockSoomgoServer(corpus, chat_page_size=20, message_page_size=30) as server:
+        # Chat list: follow `next` URLs until null
+        url, chat_ids, pages = f"{server.base_url}/api/v2.4/chats", [], 0
+        while url:
+            page = ChatListResponse(**fetch_json(url))
+            chat_ids.extend(chat.id for chat in page.results)
+            url, pages = page.next, pages + 1
+        assert chat_ids == [chat["id"] for chat in corpus.chats] and pages == 3
+        print("  ✓ Chat list pages validate and cover the corpus")
+
+        # Messages: integer cursors, newest first
+        chat = max(corpus.chats, key=lambda chat: len(corpus.messages[chat["id"]]))
+        messages_url = f"{server.base_url}/api/v2.2/chats/{chat['id']}/messages"
+        cursor, message_ids = None, []
+        while True:
+            page = MessageListResponse(**fetch_json(messages_url if cursor is None else f"{messages_url}?next={cursor}"))
+            message_ids.extend(message.id for message in page.results)
+            if page.next is None:
+                break
+            cursor = page.next
+        assert message_ids == [message["id"] for message in corpus.messages[chat["id"]]]
+        assert message_ids == sorted(message_ids, reverse=True)
+        print("  ✓ Message pages validate and cover the chat")
+
+        assert b"observer-container" in urllib.request.urlopen(f"{server.base_url}/pro/chats").read()
+        assert b"chat-messages" in urllib.request.urlopen(f"{server.base_url}/pro/chats/{chat['id']}").read()
+        print("  ✓ Chat pages served")
+
+    with MockSoomgoServer(corpus, error_rate=0.5, seed=1) as server:
+        statuses = []
+        for _ in range(40):
+            try:
+                fetch_json(f"{server.base_url}/api/v2.4/chats")
+                statuses.append(200)
+            except urllib.error.HTTPError as e:
+                statuses.append(e.code)
+        assert set(statuses) == {200, 503}
+        assert server.error_count == statuses.count(503) and server.request_count == 40
+        print("  ✓ Errors injected at the configured rate\n")
+
+    print("✅ Mock server tests passed!")
+
+
+if __name__ == "__main__":
+    test_mock_server()
@@ -0,0 +1,62 @@
+"""Test script for offline replay of saved chat list responses."""
+
+import json
+import tempfile
+from pathlib import Path
+
+from src.scraper.central_db import CentralChatDatabase
+from src.scraper.replay import find_replayable_runs, replay_chat_list_runs
+from test_central_db import create_mock_chat
+
+
+def write_run(runs_dir: Path, name: str, pages: list) -> Path:
+    """Write a fake chat list run with one response file per page."""
+    run_dir = runs_dir / name
+    (run_dir / "api_responses").mkdir(parents=True)
+    for index, chat_ids in enumerate(pages, 1):
+        response = {
+            "next": "cursor" if index < len(pages) else None,
+            "results": [create_mock_chat(chat_id).model_dump() for chat_id in chat_ids]
+        }
+        with open(run_dir / "api_responses" / f"response_{index:03d}.json", 'w', encoding='utf-8') as f:
+            json.dump(response, f, ensure_ascii=False)
+    return run_dir
+
+
+def test_replay():
+    """Test rebuilding the master list and benchmark mode from saved runs."""
+    print("🧪 Testing Offline Replay\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        runs_dir = Path(tmp) / "runs"
+        write_run(runs_dir, "2025-01-01_10-00-00_chat_list_aaaa", [[1, 2, 3], [3, 4]])
+        write_run(runs_dir, "2025-01-02_10-00-00_chat_list_bbbb", [[5]] * 9 + [[6]])
+        (runs_dir / "2025-01-03_10-00-00_messages_cccc").mkdir()
+
+        run_dirs = find_replayable_runs(str(runs_dir))
+        assert [run_dir.name[-4:] for run_dir in run_dirs] == ["aaaa", "bbbb"]
+
+        db = CentralChatDatabase(str(Path(tmp) / "chat_list_master.jsonl"))
+        result = replay_chat_list_runs(run_dirs, db)
+        assert result["totals"]["responses"] == 12
+        assert result["runs"][0]["duplicates"] == 1
+        assert sorted(db.load()) == [1, 2, 3, 4, 5, 6]
+        print(f"  ✓ Rebuilt master list ({result['total_chats_in_db']} chats)")
+
+        # Replaying again changes nothing
+        again = replay_chat_list_runs(run_dirs, db)
+        assert again["totals"]["written"] == 0
+        print("  ✓ Replay is idempotent")
+
+        # Benchmark mode: empty start, nothing written
+        size_before = db.wal_path.stat().st_size
+        bench = replay_chat_list_runs(run_dirs, db, write=False, start_empty=True, write_quality_reports=True)
+        assert bench["totals"]["new"] == 6 and db.wal_path.stat().st_size == size_before
+        assert (run_dirs[0] / "data_quality_report.json").exists()
+        print(f"  ✓ Benchmark: {bench['chats_per_second']} chats/s\n")
+
+    print("✅ Replay tests passed!")
+
+
+if __name__ == "__main__":
+    test_replay()
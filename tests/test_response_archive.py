@@ -0,0 +1,73 @@
+"""Test script for the compressed API response archive."""
+
+import json
+import tempfile
+from pathlib import Path
+
+from src.scraper.response_archive import (
+    ARCHIVE_FILE,
+    ResponseArchive,
+    has_saved_responses,
+    iter_archive,
+    iter_run_responses,
+    pack_run_responses
+)
+
+
+def make_response(page: int) -> dict:
+    """Fake chat list page."""
+    return {"next": f"cursor-{page + 1}", "results": [{"id": page * 10 + i, "title": "자소서 첨삭"} for i in range(10)]}
+
+
+def test_response_archive():
+    """Test batching, torn tails, truncation, legacy runs and packing."""
+    print("🧪 Testing Response Archive\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        run_dir = Path(tmp) / "run"
+        run_dir.mkdir()
+        archive = ResponseArchive(run_dir / ARCHIVE_FILE, batch_size=4)
+
+        for page in range(1, 7):
+            archive.append(page, make_response(page))
+        assert [index for index, _ in iter_archive(run_dir / ARCHIVE_FILE)] == [1, 2, 3, 4]
+        archive.close()
+        records = list(iter_run_responses(run_dir))
+        assert [index for index, _ in records] == list(range(1, 7))
+        assert records[2][1] == make_response(3)
+        assert [index for index, _ in iter_run_responses(run_dir, max_index=3)] == [1, 2, 3]
+        print("  ✓ Responses written in batches and read back in order")
+
+        # Crash mid-batch: the torn member is skipped, truncate() cleans it up
+        with open(run_dir / ARCHIVE_FILE, 'ab') as f:
+            f.write(b'\x1f\x8b\x08\x00partial')
+        assert len(list(iter_archive(run_dir / ARCHIVE_FILE))) == 6
+        assert ResponseArchive(run_dir / ARCHIVE_FILE).truncate(4) == 4
+        resumed = ResponseArchive(run_dir / ARCHIVE_FILE)
+        resumed.append(5, make_response(50))
+        resumed.close()
+        assert [response["results"][0]["id"] for _, response in iter_run_responses(run_dir)][-1] == 500
+        print("  ✓ Torn batches ignored; truncate() drops pages past a checkpoint")
+
+        # Older runs: one pretty-printed file per page
+        legacy_dir = Path(tmp) / "legacy"
+        (legacy_dir / "api_responses").mkdir(parents=True)
+        for page in range(1, 31):
+            with open(legacy_dir / "api_responses" / f"response_{page:03d}.json", 'w', encoding='utf-8') as f:
+                json.dump(make_response(page), f, indent=2, ensure_ascii=False)
+        legacy_size = sum(path.stat().st_size for path in (legacy_dir / "api_responses").iterdir())
+        legacy_records = list(iter_run_responses(legacy_dir))
+        assert has_saved_responses(legacy_dir) and len(legacy_records) == 30
+
+        assert pack_run_responses(legacy_dir) == 30
+        assert not (legacy_dir / "api_responses").exists()
+        assert list(iter_run_responses(legacy_dir)) == legacy_records
+        assert (legacy_dir / ARCHIVE_FILE).stat().st_size < legacy_size / 5
+        assert pack_run_responses(legacy_dir) == 0
+        print("  ✓ Legacy runs readable and packed without loss\n")
+
+    print("✅ Response archive tests passed!")
+
+
+if __name__ == "__main__":
+    test_response_archive()
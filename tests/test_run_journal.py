@@ -0,0 +1,67 @@
+"""Test script for the message run journal."""
+
+import tempfile
+from pathlib import Path
+
+from src.scraper.run_journal import JOURNAL_FILE, RunJournal, find_run_dir
+
+
+def test_run_journal():
+    """Test state replay, torn lines, resume events and run lookup."""
+    print("🧪 Testing Run Journal\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        run_dir = Path(tmp) / "runs" / "2025-01-01_09-00-00_messages_abcd1234"
+        run_dir.mkdir(parents=True)
+
+        journal = RunJournal(run_dir)
+        journal.start("abcd1234", {"workers": 2}, [1, 2, 3], scrapes_avoided=4)
+        journal.record(1, "in_flight")
+        journal.record(1, "scraped", output_range=[0, 100])
+        journal.record(1, "done", status={"chat_id": 1, "success": True}, watermark={"id": 1})
+        journal.record(2, "in_flight")
+        journal.record(2, "scraped", output_range=[100, 180])
+        journal.close()
+
+        state = RunJournal.load(run_dir)
+        assert state.header["run_id"] == "abcd1234" and state.header["scrapes_avoided"] == 4
+        assert state.unfinished == [2, 3]
+        assert state.done_statuses == [{"chat_id": 1, "success": True}]
+        assert state.stale_output_ranges == [(100, 180)] and state.output_size == 180
+        print("  ✓ Chat states replayed from the journal")
+
+        try:
+            RunJournal(run_dir).record(3, "lost")
+            assert False, "Unknown states should be rejected"
+        except ValueError:
+            pass
+        print("  ✓ Unknown states rejected")
+
+        # Crash mid-write: the torn line is skipped and the next event starts a fresh line
+        with open(run_dir / JOURNAL_FILE, 'a', encoding='utf-8') as f:
+            f.write('{"event": "chat", "chat_id": 3, "sta')
+        journal = RunJournal(run_dir)
+        journal.resumed(output_size=100)
+        journal.record(2, "done", status={"chat_id": 2, "success": True})
+        journal.finish("completed")
+        journal.close()
+
+        state = RunJournal.load(run_dir)
+        assert state.resumes == 1 and state.unfinished == [3]
+        assert state.output_ranges == {} and state.output_size == 100
+        print("  ✓ Torn line skipped, resume resets byte ranges")
+
+        assert find_run_dir("abcd1234", runs_dir=str(run_dir.parent)) == run_dir
+        assert find_run_dir(run_dir.name, runs_dir=str(run_dir.parent)) == run_dir
+        try:
+            find_run_dir("ffffffff", runs_dir=str(run_dir.parent))
+            assert False, "Unknown run IDs should raise"
+        except FileNotFoundError:
+            pass
+        print("  ✓ Runs found by ID or directory name\n")
+
+    print("✅ Run journal tests passed!")
+
+
+if __name__ == "__main__":
+    test_run_journal()
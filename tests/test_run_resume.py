@@ -0,0 +1,72 @@
+"""Test script for rebuilding a run's messages.jsonl when resuming it."""
+
+import json
+import tempfile
+from pathlib import Path
+
+from src.scraper.chat_message_scraper import RunMessageSink
+from src.scraper.data_quality import generate_quality_report
+from test_sqlite_store import create_mock_message
+
+
+def chat_messages(chat_index: int, count: int):
+    """Messages of one chat (ids chat_index * 100 + n)."""
+    return [
+        create_mock_message(chat_index * 100 + n, f"2025-01-{n + 1:02d}T10:00:00Z")
+        for n in range(count)
+    ]
+
+
+def test_run_sink_restore():
+    """Test that restore() splices out unfinished chats and torn tails."""
+    print("🧪 Testing Run Output Restore\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_file = Path(tmp) / "messages.jsonl"
+        sink = RunMessageSink(output_file)
+
+        chats = {index: chat_messages(index, index + 2) for index in range(1, 6)}
+        ranges = {index: sink.add_chat(messages) for index, messages in chats.items()}
+        assert sink.add_chat([]) is None
+        valid_size = output_file.stat().st_size
+
+        # Crash: half of a sixth chat was written after the last journal record
+        partial = "\n".join(m.model_dump_json() for m in chat_messages(6, 3))
+        with open(output_file, 'a', encoding='utf-8') as f:
+            f.write(partial[:len(partial) // 2])
+
+        # Chats 2 and 4 were unfinished (scraped but not saved) and are redone
+        resumed = RunMessageSink(output_file, truncate=False)
+        size = resumed.restore([ranges[2], ranges[4]], valid_size)
+
+        kept = [m.model_dump(mode="json") for index in (1, 3, 5) for m in chats[index]]
+        with open(output_file, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        assert records == kept, "Only finished chats remain, in order"
+        assert size == output_file.stat().st_size
+        assert not output_file.with_suffix('.tmp').exists()
+        print("  ✓ Stale middle ranges and the torn tail removed")
+
+        assert resumed.message_count == len(kept)
+        expected = generate_quality_report(kept).model_dump(exclude={"generated_at"})
+        assert resumed.quality.report().model_dump(exclude={"generated_at"}) == expected
+        print("  ✓ message_count and quality rebuilt from kept records")
+
+        # Redone chats append after the kept records
+        start, end = resumed.add_chat(chats[2])
+        assert start == size and end == output_file.stat().st_size
+        assert resumed.message_count == len(kept) + len(chats[2])
+        print("  ✓ Resumed chats append after the rebuilt file")
+
+        # Nothing journaled yet: resume starts from an empty file
+        first_run = RunMessageSink(output_file, truncate=False)
+        assert first_run.restore([], 0) == 0 and first_run.message_count == 0
+        missing = RunMessageSink(Path(tmp) / "missing.jsonl", truncate=False)
+        assert missing.restore([], 0) == 0 and (Path(tmp) / "missing.jsonl").exists()
+        print("  ✓ Empty and missing output files\n")
+
+    print("✅ Run output restore tests passed!")
+
+
+if __name__ == "__main__":
+    test_run_sink_restore()
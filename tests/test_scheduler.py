@@ -0,0 +1,63 @@
+"""Test script for the change-detection scrape scheduler."""
+
+import tempfile
+from pathlib import Path
+
+from src.scraper.message_central_db import MessageCentralDB
+from src.scraper.segment_store import SegmentMessageDB
+from src.scraper.sqlite_store import SQLiteMessageDB
+from src.scraper.scheduler import chat_state, schedule_chats
+from test_central_db import create_mock_chat
+from test_sqlite_store import create_mock_message
+
+
+def test_scheduler():
+    """Test change detection and work list ordering on every backend."""
+    print("🧪 Testing Change-Detection Scheduler\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        backends = {
+            "jsonl": MessageCentralDB(str(tmp_dir / "messages")),
+            "segments": SegmentMessageDB(str(tmp_dir / "segments")),
+            "sqlite": SQLiteMessageDB(str(tmp_dir / "chats.db")),
+        }
+
+        for name, message_db in backends.items():
+            scraped = [create_mock_chat(chat_id, f"2025-01-2{chat_id}T10:00:00Z") for chat_id in range(1, 5)]
+            for chat in scraped:
+                message_db.save_chat_messages(
+                    chat.id,
+                    {chat.id: create_mock_message(chat.id, "2025-01-20T09:00:00Z")},
+                    chat_state=chat_state(chat)
+                )
+
+            # Chat 2 got a new message, chat 3 was bumped, 5 and 6 are new
+            current = [chat.model_copy() for chat in scraped]
+            current[1].last_message = "New message"
+            current[2].updated_at = "2025-01-29T10:00:00Z"
+            current += [create_mock_chat(5, "2025-01-25T10:00:00Z"), create_mock_chat(6, "2025-01-26T10:00:00Z")]
+
+            schedule = schedule_chats(current, message_db)
+            assert [chat.id for chat in schedule.work_list] == [3, 2, 6, 5], name
+            assert schedule.scrapes_avoided == 2, name
+            print(f"  ✓ {name}: changed newest first, then never scraped; 2 avoided")
+
+        # Files saved before watermarks fall back to the newest stored message
+        legacy_db = MessageCentralDB(str(tmp_dir / "legacy"))
+        legacy_db.save_chat_messages(1, {1: create_mock_message(1, "2025-01-21T10:00:00Z")})
+        legacy_db.save_chat_messages(2, {2: create_mock_message(2, "2025-01-20T10:00:00Z")})
+        schedule = schedule_chats(
+            [create_mock_chat(1, "2025-01-21T10:00:00Z"), create_mock_chat(2, "2025-01-22T10:00:00Z")],
+            legacy_db
+        )
+        assert [chat.id for chat in schedule.work_list] == [2]
+        print("  ✓ Legacy files compared by newest stored message\n")
+
+        backends["segments"].close()
+
+    print("✅ Scheduler tests passed!")
+
+
+if __name__ == "__main__":
+    test_scheduler()
@@ -0,0 +1,83 @@
+"""Test script for the segment-based message store."""
+
+import tempfile
+from pathlib import Path
+
+from src.scraper.message_central_db import MessageCentralDB
+from src.scraper.segment_store import SegmentMessageDB
+from test_sqlite_store import create_mock_message
+
+
+def test_segment_store():
+    """Test packing, indexed reads, rollover and compaction."""
+    print("🧪 Testing Segment Message Store\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+
+        # Per-chat files to pack
+        files_db = MessageCentralDB(str(tmp_dir / "messages"))
+        for chat_id in range(1, 11):
+            files_db.save_chat_messages(chat_id, {
+                chat_id * 10 + n: create_mock_message(chat_id * 10 + n, f"2025-01-2{n}T10:00:00Z")
+                for n in range(3)
+            })
+
+        # Tiny segment limit forces rollover into several segments
+        segment_db = SegmentMessageDB(str(tmp_dir / "segments"), max_segment_bytes=2000)
+        assert segment_db.import_from_files(files_db) == 10
+        segments = list((tmp_dir / "segments").glob("segment_*.jsonl"))
+        assert len(segments) > 1, "Small segment limit should roll over"
+        assert segment_db.list_chat_ids() == list(range(1, 11))
+        assert segment_db.load_chat_messages(4) == files_db.load_chat_messages(4)
+        print(f"  ✓ Packed 10 chats into {len(segments)} segments")
+
+        # Rewrites append a new record; the latest record wins
+        updated = files_db.load_chat_messages(4)
+        updated[99] = create_mock_message(99, "2025-01-29T10:00:00Z")
+        segment_db.save_chat_messages(4, updated)
+        assert segment_db.get_message_count(4) == 4
+        assert segment_db.get_manifest_entry(4)["last_message_id"] == 99
+
+        reopened = SegmentMessageDB(str(tmp_dir / "segments"), max_segment_bytes=2000)
+        assert list(reopened.load_chat_messages(4))[-1] == 99, "Index replay should pick latest record"
+        stats = reopened.get_stats()
+        assert stats["total_chats_with_messages"] == 10
+        assert stats["total_messages"] == 31
+        print("  ✓ Latest record wins after reopen")
+
+        # Lost index is rebuilt from segments
+        reopened.close()
+        (tmp_dir / "segments" / "index.jsonl").unlink()
+        rebuilt = SegmentMessageDB(str(tmp_dir / "segments"), max_segment_bytes=2000)
+        assert rebuilt.get_message_count(4) == 4
+        print("  ✓ Index rebuilt from segments")
+
+        # Compaction drops superseded records
+        size_before = sum(p.stat().st_size for p in (tmp_dir / "segments").glob("segment_*.jsonl"))
+        assert rebuilt.compact() == 10
+        size_after = sum(p.stat().st_size for p in (tmp_dir / "segments").glob("segment_*.jsonl"))
+        assert size_after < size_before
+        assert [chat_id for chat_id, _ in rebuilt.iter_chats()] == list(range(1, 11))
+        assert rebuilt.get_stats()["total_messages"] == 31
+        print("  ✓ Compaction drops superseded records")
+
+        # Repeated saves of the same chat compact automatically
+        bounded = SegmentMessageDB(str(tmp_dir / "bounded"), compaction_threshold=5)
+        messages = {1: create_mock_message(1, "2025-01-20T10:00:00Z")}
+        for _ in range(50):
+            bounded.save_chat_messages(1, messages)
+            assert bounded.dead_records <= 5
+        index_lines = (tmp_dir / "bounded" / "index.jsonl").read_text().splitlines()
+        assert len(index_lines) <= 6 and bounded.get_message_count(1) == 1
+        print("  ✓ Superseded records stay bounded across repeated saves\n")
+
+        bounded.close()
+        rebuilt.close()
+        segment_db.close()
+
+    print("✅ Segment store tests passed!")
+
+
+if __name__ == "__main__":
+    test_segment_store()
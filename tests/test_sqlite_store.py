@@ -0,0 +1,127 @@
+"""Test script for the SQLite storage backend."""
+
+import tempfile
+from pathlib import Path
+
+from src import config
+
+from src.scraper.central_db import CentralChatDatabase
+from src.scraper.message_central_db import MessageCentralDB
+from src.scraper.sqlite_store import (
+    SQLiteChatDatabase,
+    SQLiteMessageDB,
+    import_from_jsonl,
+    export_to_jsonl
+)
+from src.scraper.storage import open_chat_database_file
+from src.models import MessageItem, MessageUser
+from test_central_db import create_mock_chat
+
+
+def create_mock_message(message_id: int, created_at: str) -> MessageItem:
+    """Create a mock MessageItem for testing."""
+    return MessageItem(
+        id=message_id,
+        user=MessageUser(id=message_id % 2 + 1, name="테스트유저"),
+        type="TEXT",
+        own_type="text",
+        message=f"Test message {message_id}",
+        is_receiver_read=True,
+        created_at=created_at
+    )
+
+
+def test_sqlite_backend():
+    """Test SQLite chat/message storage and the JSONL bridge."""
+    print("🧪 Testing SQLite Storage Backend\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        sqlite_path = str(tmp_dir / "chats.db")
+
+        # Chats: batched upserts and indexed lookups
+        chat_db = SQLiteChatDatabase(sqlite_path, batch_size=2)
+        chats = [create_mock_chat(i) for i in range(1, 6)]
+        chats[2].quote.is_hired = True
+        assert chat_db.append(chats) == 5
+        chat_db.append([create_mock_chat(1, "2025-02-01T00:00:00Z")])
+
+        loaded = chat_db.load()
+        assert len(loaded) == 5
+        assert loaded[1].updated_at == "2025-02-01T00:00:00Z", "Upsert should replace row"
+        assert chat_db.hired_ids() == [3]
+        assert sorted(chat_db.get_many([2, 4, 99])) == [2, 4]
+        assert chat_db.get_stats()["total_chats"] == 5
+
+        # Every ChatStore method works without JSONL internals
+        raw = chat_db.get_raw_many([4, 99, 1, 4])
+        assert list(raw) == [1, 4] and raw[1]["updated_at"] == "2025-02-01T00:00:00Z"
+        assert chat_db.get(3).quote.is_hired and chat_db.get(99) is None
+        assert chat_db.changed_chats(chat_db.get_many([1, 2]), [chats[0], chats[1]]) == [chats[0]]
+        assert chat_db.merge_and_update(chat_db.get_many([1]), [chats[1]])[1:] == (1, 0)
+        assert chat_db.compact() == 5
+
+        mode = chat_db.store.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal", "Database should run in WAL mode"
+        print("  ✓ Chat upserts, lookups and stats")
+
+        # Messages: replace per chat, chronological load
+        message_db = SQLiteMessageDB(sqlite_path)
+        message_db.save_chat_messages(1, {
+            2: create_mock_message(2, "2025-01-20T10:05:00Z"),
+            1: create_mock_message(1, "2025-01-20T10:00:00Z"),
+        })
+        assert list(message_db.load_chat_messages(1)) == [1, 2], "Messages should load in created_at order"
+        assert message_db.get_message_count(1) == 2
+        assert message_db.get_manifest_entry(1)["last_message_id"] == 2
+        assert message_db.get_manifest_entry(2) is None
+        assert message_db.chat_exists(1) and not message_db.chat_exists(2)
+        assert [chat_id for chat_id, _ in message_db.iter_chats()] == [1]
+        assert message_db.rebuild_manifest() == 1
+        assert message_db.get_stats()["total_messages"] == 2
+        print("  ✓ Message save/load and counts")
+
+        # Bridge: JSONL -> SQLite -> JSONL round trip
+        jsonl_chats = CentralChatDatabase(str(tmp_dir / "chat_list_master.jsonl"))
+        jsonl_messages = MessageCentralDB(str(tmp_dir / "messages"))
+        jsonl_chats.save({chat.id: chat for chat in chats})
+        jsonl_messages.save_chat_messages(7, {10: create_mock_message(10, "2025-01-21T00:00:00Z")})
+
+        bridge_path = str(tmp_dir / "bridge.db")
+        counts = import_from_jsonl(
+            jsonl_chats, jsonl_messages,
+            SQLiteChatDatabase(bridge_path), SQLiteMessageDB(bridge_path)
+        )
+        assert counts == {"chats": 5, "messages": 1, "chat_files": 1}
+
+        out_chats = CentralChatDatabase(str(tmp_dir / "out" / "chat_list_master.jsonl"))
+        out_messages = MessageCentralDB(str(tmp_dir / "out" / "messages"))
+        export_to_jsonl(SQLiteChatDatabase(bridge_path), SQLiteMessageDB(bridge_path), out_chats, out_messages)
+        assert out_chats.load() == jsonl_chats.load()
+        assert out_messages.load_chat_messages(7) == jsonl_messages.load_chat_messages(7)
+        print("  ✓ JSONL import/export round trip")
+
+        # Explicit files (replay --db-path) never fall through to the live database
+        saved = config.STORAGE_BACKEND, config.CHAT_DB_FILE
+        config.STORAGE_BACKEND, config.CHAT_DB_FILE = "sqlite", tmp_dir / "live.db"
+        try:
+            rebuilt_jsonl = open_chat_database_file(str(tmp_dir / "rebuilt.jsonl"))
+            assert isinstance(rebuilt_jsonl, CentralChatDatabase)
+            assert rebuilt_jsonl.db_path == tmp_dir / "rebuilt.jsonl"
+            rebuilt_db = open_chat_database_file(str(tmp_dir / "rebuilt.db"))
+            assert isinstance(rebuilt_db, SQLiteChatDatabase)
+            assert Path(rebuilt_db.db_path) == tmp_dir / "rebuilt.db"
+            rebuilt_db.store.close()
+            assert not (tmp_dir / "live.db").exists()
+        finally:
+            config.STORAGE_BACKEND, config.CHAT_DB_FILE = saved
+        print("  ✓ open_chat_database_file opens exactly the given file\n")
+
+        for db in (chat_db, message_db):
+            db.store.close()
+
+    print("✅ SQLite backend tests passed!")
+
+
+if __name__ == "__main__":
+    test_sqlite_backend()
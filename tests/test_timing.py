@@ -0,0 +1,47 @@
+"""Test script for per-phase timing instrumentation."""
+
+import time
+
+from src.scraper.timing import PhaseHistogram, PhaseTimer, percentile
+
+
+def test_timing():
+    """Test phase timers, percentiles and the timing report."""
+    print("🧪 Testing Phase Timing\n")
+
+    timer = PhaseTimer()
+    with timer.phase("scroll_wait"):
+        time.sleep(0.02)
+    timer.add("scroll_wait", 0.5)
+    timer.add("navigation", 1.0)
+    assert 0.52 <= timer.seconds["scroll_wait"] < 0.6 and timer.as_dict()["navigation"] == 1.0
+    print("  ✓ Timers accumulate per phase")
+
+    assert percentile([1.0], 95) == 1.0
+    assert percentile([0.0, 10.0], 50) == 5.0
+    assert abs(percentile([float(i) for i in range(1, 101)], 95) - 95.05) < 1e-9
+    print("  ✓ Interpolated percentiles")
+
+    histogram = PhaseHistogram()
+    for i in range(1, 21):
+        histogram.add({"navigation": i * 0.1, "persist": 0.05, "chat_total": i * 0.2})
+    histogram.add({"navigation": 400.0, "chat_total": 400.0})
+
+    stats = histogram.stats("navigation")
+    assert stats["count"] == 21 and stats["max"] == 400.0 and stats["p50"] == 1.1
+    assert histogram.stats("missing") is None
+    assert list(histogram.summary())[:2] == ["chat_total", "navigation"]
+
+    report = histogram.report(total_key="chat_total")
+    navigation = report["phases"]["navigation"]
+    assert sum(navigation["buckets"].values()) == 21 and navigation["buckets"][">300s"] == 1
+    assert "share" not in report["phases"]["chat_total"]
+    shares = sum(phase["share"] for name, phase in report["phases"].items() if name != "chat_total")
+    assert abs(shares - 1.0) < 0.01
+    print("  ✓ Histogram stats, buckets and shares\n")
+
+    print("✅ Phase timing tests passed!")
+
+
+if __name__ == "__main__":
+    test_timing()